@@ -1,11 +1,107 @@
+import time
+
+START_TIME = time.perf_counter()
+
+import argparse
 import sys
+from multiprocessing import freeze_support
 from PySide6.QtWidgets import QApplication
+from src.aina.Cassette import Cassette
 from src.aina.main_window import MainWindow, load_config, get_config_path
 
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="AIna")
+    parser.add_argument(
+        "--import-report",
+        action="store_true",
+        help="Print the import cost of each heavy module and exit",
+    )
+    parser.add_argument(
+        "--startup-budget",
+        type=float,
+        metavar="SECONDS",
+        help="Exit with an error if the window takes longer to show",
+    )
+    parser.add_argument(
+        "--soak",
+        type=int,
+        metavar="TURNS",
+        help="Run mocked turns headless and check for leaks, then exit",
+    )
+    parser.add_argument(
+        "--watch-stalls",
+        type=int,
+        metavar="MS",
+        help="Log the stacks of the main thread when the event loop is "
+        "blocked for longer than MS milliseconds",
+    )
+    parser.add_argument(
+        "--record-cassette",
+        metavar="PATH",
+        help="Record the LLM, STT and TTS traffic of the session to a cassette",
+    )
+    parser.add_argument(
+        "--replay-cassette",
+        metavar="PATH",
+        help="Answer the LLM, STT and TTS calls from a recorded cassette",
+    )
+    parser.add_argument(
+        "--realtime",
+        action="store_true",
+        help="Replay the cassette with the original timing",
+    )
+    # Leave anything else to Qt
+    args, _ = parser.parse_known_args()
+    return args
+
+
 if __name__ == "__main__":
+    # The audio worker process is spawned from the frozen executable too
+    freeze_support()
+
+    args = parse_args()
+
+    if args.import_report:
+        from src.aina.diagnostics import report_import_times
+
+        report_import_times()
+        sys.exit(0)
+
+    if args.soak:
+        from src.aina.diagnostics import run_soak
+
+        sys.exit(run_soak(args.soak))
+
+    if args.record_cassette:
+        Cassette.start(args.record_cassette, "record")
+    elif args.replay_cassette:
+        Cassette.start(args.replay_cassette, "replay", args.realtime)
+
     app = QApplication(sys.argv)
     config_path = get_config_path("AIna")
     config = load_config(config_path)
     window = MainWindow(config)
     window.show()
-    sys.exit(app.exec())
+
+    # Opt-in, from the command line or the config
+    watchdog = None
+    stall_threshold = args.watch_stalls or config["stall_threshold_ms"]
+    if stall_threshold:
+        from src.aina.StallWatchdog import StallWatchdog
+
+        watchdog = StallWatchdog(
+            stall_threshold, log_path=str(config_path.parent / "stalls.log")
+        )
+        watchdog.start()
+
+    if args.startup_budget is not None:
+        from src.aina.diagnostics import check_startup_budget
+
+        sys.exit(check_startup_budget(app, window, START_TIME, args.startup_budget))
+
+    exit_code = app.exec()
+    if watchdog is not None:
+        watchdog.stop()
+    Cassette.stop()
+    sys.exit(exit_code)
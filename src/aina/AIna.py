@@ -1,4 +1,4 @@
-from openai import OpenAI
+from .EndpointPool import EndpointPool
 
 
 class AIna:
@@ -15,6 +15,7 @@ class AIna:
         language: str = "en-US",
         language_level: str = "Basic",
         prompt_path: str = None,
+        pool: EndpointPool | None = None,
     ) -> None:
         """
         Initializes the GPT model by loading the prompt, setting up conversation history,
@@ -27,6 +28,9 @@ class AIna:
                                             (e.g., 'Basic', 'Advanced').
                                             Defaults to 'Basic'.
             prompt_path (str, optional): Path to a custom prompt file. If None, a default prompt is used.
+            pool (EndpointPool, optional): The OpenAI compatible servers to
+                                        use. Defaults to the LM Studio local
+                                        server.
         """
 
         self.language = language
@@ -51,7 +55,5 @@ class AIna:
             {"role": "user", "content": self.init_messages[language][1]},
         ]
 
-        # Point to the local server
-        self.client = OpenAI(
-            base_url="http://localhost:1234/v1", api_key="lm-studio"
-        )
+        # Point to the local server(s)
+        self.pool = pool or EndpointPool(["http://localhost:1234/v1"])
@@ -14,7 +14,7 @@ class AnimatedButton(QPushButton):
 
     def __init__(
         self,
-        icon_path: str,
+        icon: QIcon | str,
         parent: QWidget | None = None,
         icon_size: int = 32,
         size: int = 50,
@@ -24,8 +24,8 @@ class AnimatedButton(QPushButton):
         Initializes the custom button with styling and icon configuration.
 
         Args:
-            icon_path (str): Path to the initial icon to be displayed on the
-                          button.
+            icon (QIcon | str): The initial icon to be displayed on the button,
+                             or the path to it.
             parent (QWidget, optional): Parent widget for the button. Defaults
                                      to None.
             icon_size (int, optional): Size (in pixels) for the icon. Defaults
@@ -41,22 +41,26 @@ class AnimatedButton(QPushButton):
 
         self.icon_size = icon_size
 
-        self.setIcon(QIcon(icon_path))
-        self.setIconSize(QSize(self.icon_size, self.icon_size))
+        self.set_icon(icon, self.icon_size)
         self.setFixedSize(size, size)
         self.setProperty("theme", "light")  # Set default theme
 
         self.setObjectName("ColorlessButton" if colorless else "ColorButton")
 
-    def set_icon(self, icon_path: str, icon_size: int = 32) -> None:
+    def set_icon(self, icon: QIcon | str, icon_size: int = 32) -> None:
         """
         Sets or updates the button's icon.
 
+        Pass a cached QIcon to avoid decoding the image file again.
+
         Args:
-            icon_path (str): Path to the new icon image.
+            icon (QIcon | str): The new icon, or the path to the icon image.
             icon_size (int, optional): Size (in pixels) for the icon. Defaults
                                     to 32.
         """
 
-        self.setIcon(QIcon(icon_path))
+        if isinstance(icon, str):
+            icon = QIcon(icon)
+
+        self.setIcon(icon)
         self.setIconSize(QSize(icon_size, icon_size))
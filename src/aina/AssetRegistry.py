@@ -0,0 +1,125 @@
+import os
+import sys
+
+from PySide6.QtGui import QIcon, QPixmap
+
+
+class AssetRegistry:
+    """
+    Cache for the application assets.
+
+    Resolves the assets folder once (development or frozen mode) and keeps the
+    decoded icons, pixmaps and combined theme stylesheets in memory, so icon
+    swaps and theme switches do not touch the disk or re-parse anything.
+    """
+
+    def __init__(self, base_dir: str) -> None:
+        """
+        Initializes the registry.
+
+        Args:
+            base_dir (str): Root folder of the project, used when not running
+                         as a frozen executable.
+        """
+
+        if getattr(sys, "frozen", False):  # Running as .exe
+            self.root = os.path.join(sys._MEIPASS, "assets")
+        else:
+            self.root = os.path.join(base_dir, "assets")
+
+        self._paths = {}
+        self._icons = {}
+        self._pixmaps = {}
+        self._stylesheets = {}
+
+    def path(self, filename: str, type: str) -> str:
+        """
+        Returns the full path of an asset.
+
+        Args:
+            filename (str): Name of the file to be loaded.
+            type (str): The type of the file, it varies between "icons",
+                     "images", "prompts", "styles" and "dictionaries".
+
+        Returns:
+            str: The path for the file.
+        """
+
+        key = (filename, type)
+
+        if key not in self._paths:
+            self._paths[key] = os.path.join(self.root, type, filename)
+
+        return self._paths[key]
+
+    def icon(self, filename: str) -> QIcon:
+        """
+        Returns the decoded icon, loading it on first use.
+
+        Args:
+            filename (str): Name of the file in the "icons" folder.
+
+        Returns:
+            QIcon: The cached icon.
+        """
+
+        if filename not in self._icons:
+            self._icons[filename] = QIcon(self.path(filename, "icons"))
+
+        return self._icons[filename]
+
+    def pixmap(self, filename: str, type: str = "images") -> QPixmap:
+        """
+        Returns the decoded pixmap, loading it on first use.
+
+        Args:
+            filename (str): Name of the image file.
+            type (str, optional): Assets folder of the file. Defaults to
+                               "images".
+
+        Returns:
+            QPixmap: The cached pixmap.
+        """
+
+        key = (filename, type)
+
+        if key not in self._pixmaps:
+            self._pixmaps[key] = QPixmap(self.path(filename, type))
+
+        return self._pixmaps[key]
+
+    def stylesheet(self, theme_name: str) -> str:
+        """
+        Returns the combined stylesheet (qdarktheme base plus the custom `.qss`
+        file) of a theme, building it on first use.
+
+        Args:
+            theme_name (str): The name of the theme ('light' or 'dark').
+
+        Returns:
+            str: The full stylesheet.
+        """
+
+        if theme_name not in self._stylesheets:
+            import qdarktheme
+
+            base_stylesheet = qdarktheme.load_stylesheet(theme_name)
+
+            qss_path = self.path(f"{theme_name}.qss", "styles")
+            with open(qss_path, "r") as file:
+                custom_stylesheet = file.read()
+
+            self._stylesheets[theme_name] = base_stylesheet + custom_stylesheet
+
+        return self._stylesheets[theme_name]
+
+    def preload_stylesheets(self, themes: tuple = ("light", "dark")) -> None:
+        """
+        Builds the stylesheets of all themes ahead of time.
+
+        Args:
+            themes (tuple, optional): Themes to build. Defaults to both.
+        """
+
+        for theme_name in themes:
+            self.stylesheet(theme_name)
@@ -0,0 +1,324 @@
+import sys
+import threading
+from collections import OrderedDict
+
+# Output device and buffer (in frames) used by `init_mixer`
+_mixer_settings = {"buffer": 512, "devicename": None}
+
+# Held while the mixer is opened or closed, or by a thread that needs it to
+# stay in the same format (e.g. the calibration)
+mixer_lock = threading.RLock()
+
+
+def configure_mixer(buffer: int = 512, devicename: str | None = None) -> dict:
+    """
+    Sets the output buffer and device of the mixer. If it is already
+    initialized, it is closed, and the next `init_mixer` opens it again with
+    them. Must not be called while playing.
+
+    Args:
+        buffer (int, optional): Size of the output buffer, in frames. Smaller
+                             buffers play sooner but may crackle. Defaults
+                             to 512.
+        devicename (str, optional): Name of the output device. Defaults to
+                                 the system default.
+
+    Returns:
+        dict: The previous "buffer" and "devicename".
+    """
+
+    with mixer_lock:
+        previous = dict(_mixer_settings)
+        _mixer_settings.update(buffer=buffer, devicename=devicename)
+
+        if previous != _mixer_settings:
+            release_mixer()
+
+    return previous
+
+
+def init_mixer() -> tuple:
+    """
+    Initializes the pygame mixer once for the whole application, with the
+    settings of `configure_mixer`.
+
+    Returns:
+        tuple: The mixer settings (frequency, format, channels).
+    """
+
+    import pygame
+
+    with mixer_lock:
+        if not pygame.mixer.get_init():
+            try:
+                pygame.mixer.init(**_mixer_settings)
+            except pygame.error:
+                # The configured device is unplugged
+                if _mixer_settings["devicename"] is None:
+                    raise
+                pygame.mixer.init(buffer=_mixer_settings["buffer"])
+
+        return pygame.mixer.get_init()
+
+
+def release_mixer() -> None:
+    """
+    Closes the audio device opened by `init_mixer`, if pygame was loaded.
+    """
+
+    pygame = sys.modules.get("pygame")
+
+    with mixer_lock:
+        if pygame is not None and pygame.mixer.get_init():
+            pygame.mixer.quit()
+
+
+def decode_audio_file(filename: str):
+    """
+    Decodes an audio file (e.g. the TTS MP3) into PCM in the mixer format.
+
+    Args:
+        filename (str): Path to the audio file.
+
+    Returns:
+        numpy.ndarray: The samples, with shape (frames, channels) and dtype
+                       int16.
+    """
+
+    import pygame
+    import pygame.sndarray
+
+    init_mixer()
+
+    return pygame.sndarray.array(pygame.mixer.Sound(filename))
+
+
+# Frame length of the lip-sync envelopes, also used to follow them
+ENVELOPE_FRAME_MS = 20.0
+
+
+def amplitude_envelope(pcm, samplerate: int, frame_ms: float = ENVELOPE_FRAME_MS):
+    """
+    Computes the loudness of the audio per frame, used for lip-sync.
+
+    Args:
+        pcm (numpy.ndarray): Samples with shape (frames, channels).
+        samplerate (int): Sample rate of the samples.
+        frame_ms (float, optional): Frame length. Defaults to
+                                 `ENVELOPE_FRAME_MS`.
+
+    Returns:
+        numpy.ndarray: RMS per frame, scaled so loud speech is close to 1.
+    """
+
+    import numpy as np
+
+    signal = pcm.astype(np.float32)
+    if signal.ndim == 2:
+        signal = signal.mean(axis=1)
+
+    frame_length = max(int(samplerate * frame_ms / 1000), 1)
+    count = len(signal) // frame_length
+    frames = signal[: count * frame_length].reshape(count, frame_length)
+    rms = np.sqrt(np.mean(frames**2, axis=1))
+
+    if count == 0:
+        return rms
+
+    # A loud frame rather than the loudest, so one peak does not flatten all
+    reference = np.percentile(rms, 95)
+    if reference > 0:
+        rms = np.clip(rms / reference, 0.0, 1.0)
+
+    return rms
+
+
+def time_stretch(pcm, rate: float, n_fft: int = 2048):
+    """
+    Changes the speed of the audio without changing its pitch, with a phase
+    vocoder vectorized over all the frames and channels.
+
+    The spectrum is sampled every `rate` frames, interpolating the magnitude
+    between frames and accumulating the phase advance of each bin, and then
+    resynthesized by overlap-add.
+
+    Args:
+        pcm (numpy.ndarray): Samples with shape (frames, channels).
+        rate (float): Playback rate, e.g. 0.5 for half speed.
+        n_fft (int, optional): Frame length. Defaults to 2048 (46 ms at
+                            44.1 kHz).
+
+    Returns:
+        numpy.ndarray: The stretched samples, with the dtype and channels of
+                       `pcm` and about len(pcm) / rate frames.
+    """
+
+    import numpy as np
+
+    if abs(rate - 1.0) < 1e-3 or len(pcm) < n_fft:
+        return pcm
+
+    hop = n_fft // 4
+    signal = pcm.astype(np.float32).reshape(len(pcm), -1).T
+
+    # Mono speech played on a stereo mixer is only stretched once
+    duplicated = signal.shape[0] > 1 and (signal == signal[:1]).all()
+    if duplicated:
+        channels = signal.shape[0]
+        signal = signal[:1]
+
+    window = np.hanning(n_fft + 1)[:-1].astype(np.float32)
+
+    # Analysis frames, centered on multiples of the hop
+    padded = np.pad(signal, ((0, 0), (n_fft // 2, n_fft // 2 + hop)))
+    frames = np.lib.stride_tricks.sliding_window_view(padded, n_fft, axis=1)
+    spectrum = np.fft.rfft(frames[:, ::hop] * window, axis=-1)
+    magnitude = np.abs(spectrum)
+    phase = np.angle(spectrum)
+
+    # Fractional frames to synthesize, and the blend of their neighbors
+    steps = np.arange(0, spectrum.shape[1] - 1, rate)
+    index = steps.astype(np.int64)
+    alpha = (steps - index)[None, :, None]
+    magnitude = (1 - alpha) * magnitude[:, index] + alpha * magnitude[:, index + 1]
+
+    # Phase advance per hop, around the expected one of each bin
+    expected = (2 * np.pi * hop / n_fft) * np.arange(
+        spectrum.shape[2], dtype=np.float32
+    )
+    advance = phase[:, index + 1] - phase[:, index] - expected
+    advance -= np.float32(2 * np.pi) * np.round(advance / np.float32(2 * np.pi))
+    advance += expected
+
+    phase = phase[:, :1] + np.cumsum(advance, axis=1) - advance
+
+    # magnitude * exp(i * phase), without complex128 temporaries
+    spectrum = np.empty(magnitude.shape, dtype=np.complex64)
+    spectrum.real = magnitude * np.cos(phase)
+    spectrum.imag = magnitude * np.sin(phase)
+
+    frames = np.fft.irfft(spectrum, n=n_fft, axis=-1).astype(np.float32)
+    frames *= window
+
+    # Overlap-add, one quarter of the frames at a time
+    count = frames.shape[1]
+    output = np.zeros((len(frames), count + 3, hop), dtype=np.float32)
+    quarters = frames.reshape(len(frames), count, 4, hop)
+    for quarter in range(4):
+        output[:, quarter : quarter + count] += quarters[:, :, quarter]
+
+    # The squared Hann windows overlapping 4 times add up to 1.5
+    output = output.reshape(len(output), -1) / (np.sum(window**2) / hop)
+    length = int(round(len(pcm) / rate))
+    output = output[:, n_fft // 2 : n_fft // 2 + length]
+
+    if duplicated:
+        output = np.repeat(output, channels, axis=0)
+
+    if np.issubdtype(pcm.dtype, np.integer):
+        limits = np.iinfo(pcm.dtype)
+        output = np.clip(np.round(output), limits.min, limits.max)
+
+    return np.ascontiguousarray(output.T.reshape(-1, *pcm.shape[1:]).astype(pcm.dtype))
+
+
+class AudioCache:
+    """
+    Memory-bounded buffer with the decoded audio of AIna's last utterances.
+
+    Entries are kept in insertion order and the oldest ones are evicted when
+    the total size of the PCM data goes over the limit, or when there are more
+    entries than allowed. All methods are thread safe.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, max_entries: int = 20) -> None:
+        """
+        Initializes the AudioCache.
+
+        Args:
+            max_bytes (int, optional): Maximum size of the PCM data kept, in
+                                    bytes. Defaults to 32 MB.
+            max_entries (int, optional): Maximum number of utterances kept.
+                                      Defaults to 20.
+        """
+
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+
+        self._entries = OrderedDict()
+        self._size = 0
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def add(self, pcm, samplerate: int, text: str = "", envelope=None) -> int:
+        """
+        Stores the PCM of an utterance, evicting old entries if needed.
+
+        Args:
+            pcm (numpy.ndarray): The decoded samples.
+            samplerate (int): Sample rate of the samples.
+            text (str, optional): What was said. Defaults to "".
+            envelope (numpy.ndarray, optional): Loudness per 20 ms frame, for
+                                             lip-sync. Defaults to None.
+
+        Returns:
+            int: The id of the new entry.
+        """
+
+        with self._lock:
+            audio_id = self._next_id
+            self._next_id += 1
+
+            self._entries[audio_id] = {
+                "id": audio_id,
+                "pcm": pcm,
+                "samplerate": samplerate,
+                "text": text,
+                "envelope": envelope,
+            }
+            self._size += pcm.nbytes
+
+            while len(self._entries) > 1 and (
+                self._size > self.max_bytes
+                or len(self._entries) > self.max_entries
+            ):
+                _, entry = self._entries.popitem(last=False)
+                self._size -= entry["pcm"].nbytes
+
+        return audio_id
+
+    def get(self, audio_id: int | None = None) -> dict | None:
+        """
+        Returns an entry of the buffer.
+
+        Args:
+            audio_id (int, optional): The id returned by `add`. Defaults to the
+                                   latest entry.
+
+        Returns:
+            dict | None: The entry with its "id", "pcm", "samplerate", "text"
+                         and "envelope", or None if it was evicted (or the
+                         buffer is empty).
+        """
+
+        with self._lock:
+            if audio_id is None:
+                if not self._entries:
+                    return None
+                audio_id = next(reversed(self._entries))
+
+            return self._entries.get(audio_id)
+
+    def __contains__(self, audio_id: int) -> bool:
+        with self._lock:
+            return audio_id in self._entries
+
+    def clear(self) -> None:
+        """
+        Drops all the entries, e.g. when they no longer match the mixer
+        format.
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
@@ -0,0 +1,446 @@
+import os
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+
+
+def share_array(array) -> tuple:
+    """
+    Copies an array into a new shared memory block.
+
+    Args:
+        array (numpy.ndarray): The samples.
+
+    Returns:
+        tuple: The SharedMemory block and its descriptor (name, shape and
+               dtype), which is what crosses the process boundary.
+    """
+
+    import numpy as np
+
+    shm = SharedMemory(create=True, size=max(array.nbytes, 1))
+    view = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+    view[...] = array
+    del view
+
+    return shm, {"name": shm.name, "shape": array.shape, "dtype": array.dtype.str}
+
+
+def attach_array(descriptor: dict) -> tuple:
+    """
+    Maps an array shared by `share_array` or `RecordingBuffer`.
+
+    The view must be deleted before closing the block.
+
+    Args:
+        descriptor (dict): The descriptor of the shared array.
+
+    Returns:
+        tuple: The SharedMemory block and a NumPy view of the samples.
+    """
+
+    import numpy as np
+
+    shm = SharedMemory(name=descriptor["name"])
+    view = np.ndarray(
+        descriptor["shape"], dtype=np.dtype(descriptor["dtype"]), buffer=shm.buf
+    )
+
+    return shm, view
+
+
+def _initialize_worker() -> None:
+    """
+    Runs once in the worker process. It only decodes, never plays, so pygame
+    must not open the audio device there.
+    """
+
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+
+def _warm_up() -> None:
+    """
+    Imports the audio libraries in the worker ahead of the first job.
+    """
+
+    import numpy  # noqa: F401
+    import pygame.sndarray  # noqa: F401
+    import wavio  # noqa: F401
+
+
+def _decode_job(filename: str, mixer: tuple) -> dict:
+    """
+    Decodes an audio file in the worker, in the mixer format of the GUI
+    process, and leaves the samples in shared memory.
+    """
+
+    import pygame
+    import pygame.sndarray
+
+    if pygame.mixer.get_init() != mixer:
+        pygame.mixer.quit()
+        pygame.mixer.init(*mixer)
+
+    pcm = pygame.sndarray.array(pygame.mixer.Sound(filename))
+
+    # The GUI process unlinks the block once it has the samples
+    shm, descriptor = share_array(pcm)
+    shm.close()
+
+    return descriptor
+
+
+def _write_wav_job(descriptor: dict, filename: str, samplerate: int) -> None:
+    """
+    Writes shared samples to a WAV file in the worker.
+    """
+
+    import wavio
+
+    shm, view = attach_array(descriptor)
+    try:
+        wavio.write(filename, view, samplerate, sampwidth=2)
+    finally:
+        del view
+        shm.close()
+
+
+class AudioProcess:
+    """
+    Worker process for the CPU-heavy audio work: decoding, WAV writing,
+    speech recognition and synthesis.
+
+    Running it in another process keeps it from competing for the GIL with
+    Qt rendering and playback. Samples cross the process boundary through
+    shared memory, only small descriptors are pickled. The process is spawned
+    once and reused, so the libraries (and local STT models) stay loaded.
+    """
+
+    _executor = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def executor(cls) -> ProcessPoolExecutor:
+        """
+        Returns the worker pool, spawning it on first use.
+
+        Returns:
+            ProcessPoolExecutor: The pool with the audio worker.
+        """
+
+        with cls._lock:
+            if cls._executor is None:
+                cls._executor = ProcessPoolExecutor(
+                    max_workers=1,
+                    mp_context=get_context("spawn"),
+                    initializer=_initialize_worker,
+                )
+
+            return cls._executor
+
+    @classmethod
+    def start(cls) -> None:
+        """
+        Spawns the worker and loads its libraries in the background.
+        """
+
+        cls.executor().submit(_warm_up)
+
+    @classmethod
+    def run(cls, function, *args):
+        """
+        Runs a function in the worker and waits for its result. Called from
+        worker threads, never from the GUI thread.
+
+        Args:
+            function (Callable): A module level function (it is pickled by
+                              name).
+            *args: Its arguments.
+
+        Returns:
+            Any: The result of the function.
+        """
+
+        try:
+            return cls.executor().submit(function, *args).result()
+        except BrokenProcessPool:
+            # The worker died (e.g. a crash in a native library), the next
+            # call spawns a new one
+            with cls._lock:
+                cls._executor = None
+            raise
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """
+        Stops the worker process.
+        """
+
+        with cls._lock:
+            if cls._executor is not None:
+                cls._executor.shutdown(wait=True, cancel_futures=True)
+                cls._executor = None
+
+    @classmethod
+    def decode_audio_file(cls, filename: str, mixer: tuple | None = None):
+        """
+        Decodes an audio file in the worker into PCM in the mixer format.
+
+        Args:
+            filename (str): Path to the audio file.
+            mixer (tuple, optional): The mixer settings (frequency, format,
+                                  channels) to decode for, if the caller
+                                  keeps them with the samples. Defaults to the
+                                  current ones.
+
+        Returns:
+            numpy.ndarray: The samples, with shape (frames, channels) and dtype
+                           int16.
+        """
+
+        if mixer is None:
+            from .AudioCache import init_mixer
+
+            mixer = init_mixer()
+
+        shm, view = attach_array(cls.run(_decode_job, filename, mixer))
+        try:
+            pcm = view.copy()
+        finally:
+            del view
+            shm.close()
+            shm.unlink()
+
+        return pcm
+
+    @classmethod
+    def write_wav(cls, descriptor: dict, filename: str, samplerate: int) -> None:
+        """
+        Writes shared samples to a WAV file in the worker.
+
+        Args:
+            descriptor (dict): The descriptor of the shared samples.
+            filename (str): Path of the WAV file.
+            samplerate (int): Sample rate of the samples.
+        """
+
+        cls.run(_write_wav_job, descriptor, filename, samplerate)
+
+
+class RecordingBuffer:
+    """
+    Growable buffer in shared memory for the microphone samples.
+
+    The audio callback writes each block straight into it, so stopping a
+    recording needs no concatenation and the worker process reads the
+    samples without a copy.
+
+    The callback never allocates: `reserve` grows the block ahead of time,
+    from the GUI thread, and the blocks that arrive while it is full wait in
+    a list until the next `reserve`. The new block is swapped in under a
+    lock. A block given to a worker with `lease` is only freed once the
+    worker is done with it.
+    """
+
+    def __init__(
+        self, samplerate: int, channels: int, dtype: str = "float32", seconds: int = 30
+    ) -> None:
+        """
+        Initializes the RecordingBuffer.
+
+        Args:
+            samplerate (int): Sample rate of the recording.
+            channels (int): Number of channels.
+            dtype (str, optional): Sample type. Defaults to "float32".
+            seconds (int, optional): Initial capacity, doubled when it runs
+                                  low. Defaults to 30.
+        """
+
+        import numpy as np
+
+        self.samplerate = samplerate
+        self.channels = channels
+        self.dtype = np.dtype(dtype)
+        self.length = 0
+
+        self._lock = threading.Lock()
+        self._grow_lock = threading.Lock()
+        self._pending = []
+        self._pending_frames = 0
+        self._retired = []
+        self._leases = {}
+        self._closed = False
+
+        self._shm, self._array = self._allocate(samplerate * seconds)
+
+    def _allocate(self, capacity: int) -> tuple:
+        """
+        Creates a block with the given capacity.
+
+        Returns:
+            tuple: The SharedMemory block and a NumPy view of it.
+        """
+
+        import numpy as np
+
+        shm = SharedMemory(
+            create=True, size=capacity * self.channels * self.dtype.itemsize
+        )
+        array = np.ndarray((capacity, self.channels), dtype=self.dtype, buffer=shm.buf)
+
+        return shm, array
+
+    def _free_unused(self) -> None:
+        """
+        Frees the replaced blocks, and the current one once closed, unless a
+        worker still has them. Must be called with the lock held.
+        """
+
+        blocks = list(self._retired)
+        if self._closed and self._shm is not None:
+            blocks.append(self._shm)
+        kept = []
+
+        for shm in blocks:
+            if self._leases.get(shm.name, 0) > 0:
+                kept.append(shm)
+                continue
+
+            if shm is self._shm:
+                self._array = None
+                self._shm = None
+            shm.close()
+            shm.unlink()
+
+        self._retired = [shm for shm in kept if shm is not self._shm]
+
+    def append(self, block) -> None:
+        """
+        Appends a block of samples. Called from the audio callback.
+
+        Args:
+            block (numpy.ndarray): Samples with shape (frames, channels).
+        """
+
+        with self._lock:
+            if self._closed:
+                return
+
+            end = self.length + len(block)
+
+            if self._pending or end > len(self._array):
+                # Kept aside until `reserve` makes room
+                self._pending.append(block.copy())
+                self._pending_frames += len(block)
+                return
+
+            self._array[self.length : end] = block
+            self.length = end
+
+    def reserve(self, seconds: float = 10) -> None:
+        """
+        Grows the block if less than `seconds` of room are left, and moves in
+        the blocks kept aside. Called regularly while recording, out of the
+        audio callback.
+
+        Args:
+            seconds (float, optional): Room to keep ahead. Defaults to 10.
+        """
+
+        with self._grow_lock:
+            with self._lock:
+                if self._closed:
+                    return
+
+                needed = self.length + self._pending_frames
+                needed += int(seconds * self.samplerate)
+                if needed <= len(self._array):
+                    return
+
+                old = self._array
+                length = self.length
+
+            shm, array = self._allocate(max(needed, 2 * len(old)))
+
+            # The recorded part does not change, it is copied without blocking
+            # the audio callback
+            array[:length] = old[:length]
+
+            with self._lock:
+                array[length : self.length] = old[length : self.length]
+
+                for block in self._pending:
+                    array[self.length : self.length + len(block)] = block
+                    self.length += len(block)
+                self._pending = []
+                self._pending_frames = 0
+
+                self._retired.append(self._shm)
+                self._shm = shm
+                self._array = array
+                del old
+                self._free_unused()
+
+    @contextmanager
+    def lease(self):
+        """
+        Gives the recorded samples to a worker, keeping their block alive
+        until the `with` block ends.
+
+        Yields:
+            dict: The descriptor of the samples, for `attach_array`.
+        """
+
+        self.reserve(0)
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The recording was already closed")
+
+            name = self._shm.name
+            descriptor = {
+                "name": name,
+                "shape": (self.length, self.channels),
+                "dtype": self.dtype.str,
+            }
+            self._leases[name] = self._leases.get(name, 0) + 1
+
+        try:
+            yield descriptor
+        finally:
+            with self._lock:
+                self._leases[name] -= 1
+                if self._leases[name] == 0:
+                    del self._leases[name]
+                self._free_unused()
+
+    def array(self):
+        """
+        Returns a copy of the recorded samples.
+
+        Returns:
+            numpy.ndarray: The samples, with shape (frames, channels).
+        """
+
+        self.reserve(0)
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The recording was already closed")
+
+            return self._array[: self.length].copy()
+
+    def close(self) -> None:
+        """
+        Frees the shared memory, or lets the workers still using it free it.
+        The buffer can't be used afterwards.
+        """
+
+        with self._grow_lock, self._lock:
+            if not self._closed:
+                self._closed = True
+                self._free_unused()
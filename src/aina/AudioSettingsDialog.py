@@ -0,0 +1,286 @@
+from PySide6.QtWidgets import (
+    QComboBox,
+    QDialog,
+    QDialogButtonBox,
+    QFormLayout,
+    QLabel,
+    QPushButton,
+    QVBoxLayout,
+)
+
+from .CalibrationThread import CalibrationThread
+
+
+def input_devices() -> list:
+    """
+    Lists the microphones.
+
+    Returns:
+        list: Their names, with the host API (e.g. "Microphone, MME") so they
+              are unique, as accepted by `sounddevice`.
+    """
+
+    import sounddevice as sd
+
+    host_apis = sd.query_hostapis()
+
+    return [
+        f"{device['name']}, {host_apis[device['hostapi']]['name']}"
+        for device in sd.query_devices()
+        if device["max_input_channels"] > 0
+    ]
+
+
+def output_devices() -> list:
+    """
+    Lists the speakers.
+
+    Returns:
+        list: Their names, as accepted by the pygame mixer.
+    """
+
+    from pygame._sdl2 import audio
+
+    from .AudioCache import init_mixer
+
+    # The audio subsystem must be initialized to list the devices
+    init_mixer()
+
+    return list(audio.get_audio_device_names(False))
+
+
+class AudioSettingsDialog(QDialog):
+    """
+    Dialog to pick the audio devices and the buffers of the recording and
+    playback streams, or have the CalibrationThread pick the buffers with the
+    lowest stable latency.
+    """
+
+    SAMPLERATES = (16000, 22050, 44100, 48000)
+    BLOCKSIZES = (0, 128, 256, 512, 1024, 2048)
+    LATENCIES = ("low", "high")
+    OUTPUT_BUFFERS = (256, 512, 1024, 2048, 4096)
+
+    def __init__(self, config: dict, parent=None) -> None:
+        """
+        Initializes the AudioSettingsDialog.
+
+        Args:
+            config (dict): The configuration, with the current audio settings.
+            parent (QWidget, optional): The parent widget. Defaults to None.
+        """
+
+        super().__init__(parent)
+        self.setWindowTitle("Audio Settings")
+        self.calibration_thread = None
+
+        self.input_combo_box = self.combo_box(
+            [None, *input_devices()], config["input_device"], "System default"
+        )
+        self.output_combo_box = self.combo_box(
+            [None, *output_devices()], config["output_device"], "System default"
+        )
+        self.samplerate_combo_box = self.combo_box(
+            self.SAMPLERATES, config["samplerate"], suffix=" Hz"
+        )
+        self.blocksize_combo_box = self.combo_box(
+            self.BLOCKSIZES, config["blocksize"], "Automatic", " frames"
+        )
+        self.latency_combo_box = self.combo_box(self.LATENCIES, config["latency"])
+        self.output_buffer_combo_box = self.combo_box(
+            self.OUTPUT_BUFFERS, config["output_buffer"], suffix=" frames"
+        )
+
+        form = QFormLayout()
+        form.addRow("Microphone:", self.input_combo_box)
+        form.addRow("Sample rate:", self.samplerate_combo_box)
+        form.addRow("Block size:", self.blocksize_combo_box)
+        form.addRow("Latency:", self.latency_combo_box)
+        form.addRow("Speakers:", self.output_combo_box)
+        form.addRow("Output buffer:", self.output_buffer_combo_box)
+
+        self.calibrate_button = QPushButton("Calibrate")
+        self.calibrate_button.clicked.connect(self.calibrate)
+
+        self.calibration_label = QLabel(
+            "Calibration plays short chirps and records them to find the "
+            "lowest stable latency. Turn the volume up and keep the "
+            "microphone near the speakers (no headphones)."
+        )
+        self.calibration_label.setWordWrap(True)
+
+        self.button_box = QDialogButtonBox(
+            QDialogButtonBox.Ok | QDialogButtonBox.Cancel
+        )
+        self.button_box.accepted.connect(self.accept)
+        self.button_box.rejected.connect(self.reject)
+
+        layout = QVBoxLayout()
+        layout.addLayout(form)
+        layout.addWidget(self.calibrate_button)
+        layout.addWidget(self.calibration_label)
+        layout.addWidget(self.button_box)
+        self.setLayout(layout)
+
+    @staticmethod
+    def combo_box(
+        values, current, none_text: str = "", suffix: str = ""
+    ) -> QComboBox:
+        """
+        Creates a combo box with values as item data.
+
+        Args:
+            values (Iterable): The values.
+            current: The value selected. Added if it is not in the values, e.g.
+                  an unplugged device.
+            none_text (str, optional): Text of the value None or 0.
+            suffix (str, optional): Unit shown after the values.
+
+        Returns:
+            QComboBox: The combo box.
+        """
+
+        combo_box = QComboBox()
+        values = list(values)
+
+        if current not in values:
+            values.append(current)
+
+        for value in values:
+            text = none_text if not value and none_text else f"{value}{suffix}"
+            combo_box.addItem(text, value)
+
+        combo_box.setCurrentIndex(values.index(current))
+
+        return combo_box
+
+    def settings(self) -> dict:
+        """
+        Returns the audio settings selected.
+
+        Returns:
+            dict: The "input_device", "output_device", "samplerate",
+                  "blocksize", "latency" and "output_buffer".
+        """
+
+        return {
+            "input_device": self.input_combo_box.currentData(),
+            "output_device": self.output_combo_box.currentData(),
+            "samplerate": self.samplerate_combo_box.currentData(),
+            "blocksize": self.blocksize_combo_box.currentData(),
+            "latency": self.latency_combo_box.currentData(),
+            "output_buffer": self.output_buffer_combo_box.currentData(),
+        }
+
+    def set_enabled(self, enabled: bool) -> None:
+        """
+        Enables or disables the settings, while calibrating.
+        """
+
+        for widget in (
+            self.input_combo_box,
+            self.output_combo_box,
+            self.samplerate_combo_box,
+            self.blocksize_combo_box,
+            self.latency_combo_box,
+            self.output_buffer_combo_box,
+            self.calibrate_button,
+            self.button_box.button(QDialogButtonBox.Ok),
+        ):
+            widget.setEnabled(enabled)
+
+    def calibrate(self) -> None:
+        """
+        Starts the loopback calibration with the selected devices.
+        """
+
+        settings = self.settings()
+
+        self.set_enabled(False)
+        self.calibration_label.setText("Calibrating...")
+
+        self.calibration_thread = CalibrationThread(
+            settings["input_device"],
+            settings["output_device"],
+            settings["samplerate"],
+        )
+        self.calibration_thread.progress_signal.connect(self.calibration_progress)
+        self.calibration_thread.finished_signal.connect(self.calibration_finished)
+        self.calibration_thread.start()
+
+    def calibration_progress(self, done: int, total: int) -> None:
+        """
+        Callback function executed before each configuration is measured.
+
+        Args:
+            done (int): Configurations measured.
+            total (int): Configurations to measure.
+        """
+
+        self.calibration_label.setText(f"Calibrating... ({done + 1}/{total})")
+
+    def calibration_finished(self, result: dict, error: int) -> None:
+        """
+        Callback function executed when the CalibrationThread finishes. The
+        best configuration is selected, to be saved with OK.
+
+        Args:
+            result (dict): The "results" of every configuration and the "best"
+                        one, or the "error".
+            error (int): Error code, 0 if the calibration ran.
+        """
+
+        self.set_enabled(True)
+
+        if error:
+            self.calibration_label.setText(
+                f"Could not open the audio devices: {result['error']}"
+            )
+            return
+
+        best = result["best"]
+
+        if best is None:
+            self.calibration_label.setText(
+                "The chirps could not be heard reliably. Turn the volume up, "
+                "move the microphone near the speakers and try again."
+            )
+            return
+
+        self.latency_combo_box.setCurrentIndex(
+            self.latency_combo_box.findData(best["latency"])
+        )
+        self.blocksize_combo_box.setCurrentIndex(
+            self.blocksize_combo_box.findData(best["blocksize"])
+        )
+        self.output_buffer_combo_box.setCurrentIndex(
+            self.output_buffer_combo_box.findData(best["output_buffer"])
+        )
+
+        stable = sum(entry["stable"] for entry in result["results"])
+        self.calibration_label.setText(
+            f"Round-trip latency: <b>{best['latency_ms']:.0f} ms</b> "
+            f"({stable} of {len(result['results'])} configurations were "
+            "stable). Press OK to keep it."
+        )
+
+    def done(self, result: int) -> None:
+        """
+        Closes the dialog. While calibrating, it is closed when the
+        calibration stops instead, so the GUI is not blocked meanwhile.
+        """
+
+        if (
+            self.calibration_thread is not None
+            and self.calibration_thread.isRunning()
+        ):
+            if self.button_box.isEnabled():
+                self.button_box.setEnabled(False)
+                self.calibration_label.setText("Stopping the calibration...")
+                self.calibration_thread.stop()
+                self.calibration_thread.finished.connect(
+                    lambda: QDialog.done(self, result)
+                )
+            return
+
+        super().done(result)
@@ -0,0 +1,304 @@
+import time
+
+from PySide6.QtCore import QThread, Signal, Slot
+
+from .AudioCache import configure_mixer, init_mixer, mixer_lock
+
+
+class CalibrationThread(QThread):
+    """
+    Threaded class measuring the real round-trip latency of the audio devices
+    with a loopback test.
+
+    Short chirps are played through the mixer, as AIna's voice is, and
+    recorded from the microphone, as the user is. For each candidate
+    configuration (output buffer, input latency class and blocksize), the
+    delay from starting a chirp until the block with it reaches the input
+    callback is measured `CHIRPS` times by cross-correlation. A configuration
+    is stable if every chirp was heard, the input never overflowed and the
+    delays only vary by the size of the buffers. The stable configuration with
+    the lowest median delay is picked.
+
+    The microphone must hear the speakers, so headphones do not work. The
+    mixer is held with `mixer_lock` meanwhile, so other threads do not decode
+    audio for the formats being tried.
+    """
+
+    # Candidates, from the lowest expected latency
+    OUTPUT_BUFFERS = (256, 512, 1024, 2048)
+    INPUT_SETTINGS = (("low", 256), ("low", 512), ("high", 0))
+
+    CHIRPS = 3
+    PERIOD = 0.4  # Seconds between chirps, the longest delay measured
+    CHIRP_SECONDS = 0.02
+    MIN_PEAK_RATIO = 10.0  # Correlation peak over the median, to hear a chirp
+
+    progress_signal = Signal(int, int)
+    finished_signal = Signal(dict, int)
+
+    def __init__(
+        self,
+        input_device: str | None = None,
+        output_device: str | None = None,
+        samplerate: int = 44100,
+    ) -> None:
+        """
+        Initializes the CalibrationThread.
+
+        Args:
+            input_device (str, optional): The microphone. Defaults to the
+                                       system default.
+            output_device (str, optional): The speakers, as named by the
+                                        mixer. Defaults to the system default.
+            samplerate (int, optional): Sample rate of the recordings.
+                                     Defaults to 44100.
+        """
+
+        super().__init__()
+        self.input_device = input_device
+        self.output_device = output_device
+        self.samplerate = samplerate
+
+        self._blocks = []
+        self._overflows = 0
+        self._stream = None
+        self._should_stop = False
+
+    @staticmethod
+    def chirp(samplerate: int, seconds: float):
+        """
+        Returns a windowed linear chirp from 1 to 4 kHz, easy to find in a
+        noisy recording.
+
+        Args:
+            samplerate (int): Sample rate of the chirp.
+            seconds (float): Length of the chirp.
+
+        Returns:
+            numpy.ndarray: The samples, float32 from -1 to 1.
+        """
+
+        import numpy as np
+
+        t = np.arange(int(samplerate * seconds)) / samplerate
+        sweep = 3000 / seconds
+
+        return (
+            np.sin(2 * np.pi * (1000 * t + sweep / 2 * t**2))
+            * np.hanning(len(t))
+        ).astype(np.float32)
+
+    @staticmethod
+    def stable(delays: list, tolerance: float) -> bool:
+        """
+        Checks if the delays of a configuration are consistent.
+
+        Args:
+            delays (list): The delay of each chirp, None if it was not heard.
+            tolerance (float): Spread allowed, in seconds.
+
+        Returns:
+            bool: True if every chirp was heard within the tolerance.
+        """
+
+        if not delays or None in delays:
+            return False
+
+        return max(delays) - min(delays) <= tolerance
+
+    def run(self) -> None:
+        """
+        Measures every candidate configuration and sends the results back to
+        the main thread.
+        """
+
+        results = []
+
+        with mixer_lock:
+            previous = configure_mixer(self.OUTPUT_BUFFERS[0], self.output_device)
+
+            try:
+                total = len(self.OUTPUT_BUFFERS) * len(self.INPUT_SETTINGS)
+
+                for buffer in self.OUTPUT_BUFFERS:
+                    for latency, blocksize in self.INPUT_SETTINGS:
+                        if self._should_stop:
+                            break
+
+                        self.progress_signal.emit(len(results), total)
+                        results.append(self.measure(buffer, latency, blocksize))
+            except Exception as e:
+                self.finished_signal.emit({"error": e}, 3)
+                return
+            finally:
+                configure_mixer(**previous)
+
+        stable = [result for result in results if result["stable"]]
+
+        self.finished_signal.emit(
+            {
+                "results": results,
+                "best": min(stable, key=lambda result: result["latency_ms"])
+                if stable
+                else None,
+                "cancelled": self._should_stop,
+            },
+            0,
+        )
+
+    def measure(self, buffer: int, latency: str, blocksize: int) -> dict:
+        """
+        Measures the round-trip delay of one configuration.
+
+        Args:
+            buffer (int): Output buffer of the mixer, in frames.
+            latency (str): Input latency class, "low" or "high".
+            blocksize (int): Input blocksize, 0 to let the driver choose.
+
+        Returns:
+            dict: The "output_buffer", "latency", "blocksize", median
+                  "latency_ms" (None if no chirp was heard) and "stable".
+        """
+
+        import numpy as np
+        import pygame
+        import pygame.sndarray
+        import sounddevice as sd
+
+        result = {
+            "output_buffer": buffer,
+            "latency": latency,
+            "blocksize": blocksize,
+            "latency_ms": None,
+            "stable": False,
+        }
+
+        configure_mixer(buffer, self.output_device)
+        frequency, _, channels = init_mixer()
+
+        chirp = self.chirp(frequency, self.CHIRP_SECONDS)
+        pcm = np.repeat((chirp * 16383).astype(np.int16)[:, None], channels, 1)
+        sound = pygame.sndarray.make_sound(np.ascontiguousarray(pcm))
+
+        self._blocks = []
+        self._overflows = 0
+
+        try:
+            self._stream = sd.InputStream(
+                device=self.input_device,
+                samplerate=self.samplerate,
+                blocksize=blocksize,
+                latency=latency,
+                channels=1,
+                dtype="float32",
+                callback=self._callback,
+            )
+        except (ValueError, sd.PortAudioError):
+            # Not supported by this device
+            return result
+
+        played_at = []
+
+        with self._stream:
+            # Let the stream settle before the first chirp
+            time.sleep(0.1)
+
+            for _ in range(self.CHIRPS):
+                if self._should_stop:
+                    break
+
+                played_at.append(self._stream.time)
+                sound.play()
+                time.sleep(self.PERIOD)
+
+        if len(played_at) < self.CHIRPS:
+            # Stopped, the configuration is not measured
+            return result
+
+        delays = self.delays(
+            played_at, self.chirp(self.samplerate, self.CHIRP_SECONDS)
+        )
+        heard = [delay for delay in delays if delay is not None]
+
+        if heard:
+            result["latency_ms"] = round(float(np.median(heard)) * 1000, 1)
+
+        largest_block = max((len(block) for _, block in self._blocks), default=0)
+        tolerance = buffer / frequency + largest_block / self.samplerate + 0.005
+        result["stable"] = self._overflows == 0 and self.stable(delays, tolerance)
+
+        return result
+
+    def delays(self, played_at: list, chirp) -> list:
+        """
+        Finds the chirps in the recording.
+
+        Args:
+            played_at (list): Stream time at which each chirp was played.
+            chirp (numpy.ndarray): The chirp at the recording sample rate.
+
+        Returns:
+            list: Seconds from playing each chirp until the input callback got
+                  it, None for the chirps not heard.
+        """
+
+        import numpy as np
+
+        if not self._blocks:
+            return [None] * len(played_at)
+
+        recording = np.concatenate([block for _, block in self._blocks])
+        delivered = np.concatenate(
+            [np.full(len(block), at) for at, block in self._blocks]
+        )
+
+        # Cross-correlation with the chirp, through the FFT
+        size = 1 << (len(recording) + len(chirp) - 1).bit_length()
+        correlation = np.abs(
+            np.fft.irfft(
+                np.fft.rfft(recording, size) * np.conj(np.fft.rfft(chirp, size)),
+                size,
+            )[: len(recording)]
+        )
+        noise = float(np.median(correlation)) or 1e-12
+
+        delays = []
+
+        for at in played_at:
+            window = np.flatnonzero(
+                (delivered >= at) & (delivered < at + self.PERIOD)
+            )
+
+            if len(window) == 0:
+                delays.append(None)
+                continue
+
+            onset = window[np.argmax(correlation[window])]
+
+            if correlation[onset] < noise * self.MIN_PEAK_RATIO:
+                delays.append(None)
+            else:
+                delays.append(float(delivered[onset] - at))
+
+        return delays
+
+    def _callback(self, indata, frames, time, status):
+        """
+        Collects the recorded blocks with the stream time they arrived at.
+        """
+
+        if status.input_overflow:
+            self._overflows += 1
+
+        self._blocks.append((self._stream.time, indata[:, 0].copy()))
+
+    @Slot()
+    def stop(self) -> None:
+        """
+        Stops after the chirp being recorded.
+
+        This Slot can be connected to external signals, like the closing of a
+        dialog.
+        """
+
+        self._should_stop = True
@@ -0,0 +1,244 @@
+import base64
+import gzip
+import itertools
+import json
+import threading
+import time
+
+
+class Cassette:
+    """
+    Recorder and player of the external I/O of a session.
+
+    In "record" mode every LLM request and streamed chunk, speech recognition
+    result and synthesized audio is appended, with its timestamp, to a gzipped
+    JSON lines file. In "replay" mode the same calls are answered from the file
+    instead, in the recorded order and optionally with the recorded timing, so
+    sessions can be reproduced offline.
+
+    Only one cassette is active at a time, see `Cassette.start`.
+    """
+
+    # The cassette in use, if any
+    active: "Cassette | None" = None
+
+    def __init__(self, path: str, mode: str, realtime: bool = False) -> None:
+        """
+        Initializes the Cassette.
+
+        Args:
+            path (str): Path to the cassette file.
+            mode (str): "record" or "replay".
+            realtime (bool, optional): When replaying, wait as long as the
+                                    original calls took. Defaults to False.
+        """
+
+        self.path = path
+        self.mode = mode
+        self.realtime = realtime
+
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+        self._request_ids = itertools.count()
+
+        if mode == "record":
+            self._file = gzip.open(path, "wt", encoding="utf-8")
+        else:
+            with gzip.open(path, "rt", encoding="utf-8") as file:
+                self._events = [json.loads(line) for line in file]
+
+            # Next event to replay for each kind of call
+            self._cursors = {"llm_request": 0, "stt": 0, "tts": 0}
+            self._file = None
+
+    @classmethod
+    def start(cls, path: str, mode: str, realtime: bool = False) -> "Cassette":
+        """
+        Creates the cassette and makes it the active one.
+
+        Args:
+            path (str): Path to the cassette file.
+            mode (str): "record" or "replay".
+            realtime (bool, optional): Replay with the original timing.
+                                    Defaults to False.
+
+        Returns:
+            Cassette: The active cassette.
+        """
+
+        cls.active = cls(path, mode, realtime)
+        return cls.active
+
+    @classmethod
+    def stop(cls) -> None:
+        """
+        Closes the active cassette, if any.
+        """
+
+        if cls.active is not None:
+            cls.active.close()
+            cls.active = None
+
+    @classmethod
+    def recording(cls) -> "Cassette | None":
+        """
+        Returns the active cassette if it is recording.
+        """
+
+        if cls.active is not None and cls.active.mode == "record":
+            return cls.active
+        return None
+
+    @classmethod
+    def replaying(cls) -> "Cassette | None":
+        """
+        Returns the active cassette if it is replaying.
+        """
+
+        if cls.active is not None and cls.active.mode == "replay":
+            return cls.active
+        return None
+
+    def close(self) -> None:
+        """
+        Flushes and closes the cassette file.
+        """
+
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def new_request_id(self) -> int:
+        """
+        Returns a new id to group the events of one LLM request, since several
+        requests can stream at the same time.
+        """
+
+        return next(self._request_ids)
+
+    def record(self, kind: str, **payload) -> None:
+        """
+        Appends an event to the cassette.
+
+        Args:
+            kind (str): "llm_request", "llm_chunk", "llm_end", "llm_error",
+                     "llm_failed" (a turn gave up), "stt" or "tts".
+            **payload: The data of the event.
+        """
+
+        event = {"t": round(time.monotonic() - self._start, 4), "kind": kind}
+        event.update(payload)
+
+        with self._lock:
+            if self._file is not None:
+                self._file.write(json.dumps(event, ensure_ascii=False) + "\n")
+                self._file.flush()
+
+    def _next(self, kind: str) -> dict:
+        """
+        Returns the next recorded event of a kind.
+
+        Raises:
+            LookupError: If all events of that kind were already replayed.
+        """
+
+        with self._lock:
+            index = self._cursors[kind]
+            while index < len(self._events) and self._events[index]["kind"] != kind:
+                index += 1
+
+            if index >= len(self._events):
+                raise LookupError(f"No more '{kind}' events in {self.path}")
+
+            self._cursors[kind] = index + 1
+            return self._events[index]
+
+    def replay_stream(self):
+        """
+        Replays the next LLM request, yielding the content of its chunks.
+
+        Yields:
+            str: The content of each streamed chunk.
+
+        Raises:
+            RuntimeError: If the recorded request failed.
+        """
+
+        request = self._next("llm_request")
+        request_id = request["request_id"]
+        previous = request["t"]
+
+        for event in self._events:
+            if event.get("request_id") != request_id or event is request:
+                continue
+
+            if self.realtime:
+                time.sleep(max(event["t"] - previous, 0))
+            previous = event["t"]
+
+            if event["kind"] == "llm_chunk":
+                yield event["content"]
+            elif event["kind"] == "llm_error":
+                raise RuntimeError(event["error"])
+            elif event["kind"] == "llm_end":
+                return
+
+    def replay_failed(self) -> bool:
+        """
+        Checks if the recorded turn gave up after the LLM request just
+        replayed failed, instead of re-issuing it to another server.
+
+        Returns:
+            bool: True if the turn was recorded as failed.
+        """
+
+        with self._lock:
+            index = self._cursors["llm_request"]
+
+            while index < len(self._events):
+                kind = self._events[index]["kind"]
+                if kind == "llm_failed":
+                    return True
+                if kind == "llm_request":
+                    return False
+                index += 1
+
+        # Nothing left to re-issue the request with
+        return True
+
+    def replay_call(self, kind: str) -> dict:
+        """
+        Replays the next speech recognition ("stt") or synthesis ("tts") call.
+
+        Args:
+            kind (str): "stt" or "tts".
+
+        Returns:
+            dict: The recorded event. For "tts" the "audio" is decoded back to
+                  bytes.
+
+        Raises:
+            RuntimeError: If the recorded call failed.
+        """
+
+        event = dict(self._next(kind))
+
+        if self.realtime:
+            time.sleep(event.get("duration", 0))
+
+        if "error" in event:
+            raise RuntimeError(event["error"])
+
+        if "audio" in event:
+            event["audio"] = base64.b64decode(event["audio"])
+
+        return event
+
+    @staticmethod
+    def encode_audio(data: bytes) -> str:
+        """
+        Encodes audio bytes to be stored in the cassette.
+        """
+
+        return base64.b64encode(data).decode("ascii")
@@ -0,0 +1,355 @@
+import html
+
+from PySide6.QtWidgets import QTextBrowser, QToolTip, QWidget
+from PySide6.QtGui import (
+    QColor,
+    QContextMenuEvent,
+    QHelpEvent,
+    QMouseEvent,
+    QTextBlockFormat,
+    QTextCharFormat,
+    QTextCursor,
+    QTextDocument,
+)
+from PySide6.QtCore import QEvent, QObject, Qt, Signal
+
+from .Dictionary import Dictionary
+
+
+class ChatLog(QTextBrowser):
+    """
+    Read-only conversation log where AIna's messages can be clicked to be heard
+    again.
+
+    The id of the cached audio is stored as the user state of the text blocks
+    of each AIna message, so the plain text of the log is not changed.
+
+    When a dictionary is set, hovering a word shows its entry as a tooltip.
+
+    Notes (e.g. grammar corrections) can be inserted under a message after it
+    was appended, through a cursor taken with `message_end`. AIna's messages
+    can be translated from their context menu, into a note too.
+    """
+
+    # Lines kept in the log
+    MAX_BLOCKS = 2000
+
+    # User state of the blocks of the notes
+    NOTE_STATE = -2
+
+    # Emitted with the audio id of the clicked message
+    replay_requested = Signal(int)
+
+    # Emitted with the text of a message and a cursor at its end
+    translation_requested = Signal(str, QTextCursor)
+
+    def __init__(self, parent: QWidget | None = None) -> None:
+        """
+        Initializes the ChatLog.
+
+        Args:
+            parent (QWidget, optional): The parent widget. Defaults to None.
+        """
+
+        super().__init__(parent)
+        self.setOpenLinks(False)
+
+        self.configure_document(self.document())
+        self.setMouseTracking(True)
+
+        self.dictionary = None
+
+    def create_document(self, parent: QObject) -> QTextDocument:
+        """
+        Creates an empty log document, e.g. for a new conversation session.
+
+        Args:
+            parent (QObject): The owner of the document. It must not be the
+                           log itself, which deletes its own documents when
+                           another one is shown.
+
+        Returns:
+            QTextDocument: The document.
+        """
+
+        document = QTextDocument(parent)
+        document.setDefaultFont(self.font())
+        self.configure_document(document)
+
+        return document
+
+    def configure_document(self, document: QTextDocument) -> None:
+        """
+        Keeps the memory of a log document bounded in long sessions: no undo
+        steps, and the oldest messages are dropped past the limit.
+
+        Args:
+            document (QTextDocument): The document.
+        """
+
+        document.setUndoRedoEnabled(False)
+        document.setMaximumBlockCount(self.MAX_BLOCKS)
+
+    def set_dictionary(self, dictionary: Dictionary | None) -> None:
+        """
+        Sets the dictionary used to look up the hovered words.
+
+        Args:
+            dictionary (Dictionary | None): The dictionary of the conversation
+                                         language, or None to disable lookup.
+        """
+
+        self.dictionary = dictionary
+
+    def append_message(self, text: str, audio_id: int | None = None) -> None:
+        """
+        Appends a message to the log, linking it to its audio if given.
+
+        Args:
+            text (str): The message text.
+            audio_id (int, optional): Id of the message audio in the
+                                   AudioCache. Defaults to None.
+        """
+
+        # An empty log reuses its first block
+        if self.document().isEmpty():
+            start = 0
+        else:
+            start = self.document().blockCount()
+
+        self.append(text)
+
+        state = audio_id if audio_id is not None else -1
+        block = self.document().findBlockByNumber(start)
+        while block.isValid():
+            block.setUserState(state)
+            block = block.next()
+
+    def message_end(self) -> QTextCursor:
+        """
+        Returns a cursor at the end of the last message text, before its
+        trailing empty lines.
+
+        The cursor follows the edits of the document, so it stays under the
+        message while other messages are appended, even if another document
+        is shown in the meantime.
+
+        Returns:
+            QTextCursor: The cursor.
+        """
+
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.End)
+
+        while cursor.block().length() == 1 and cursor.block().previous().isValid():
+            cursor.movePosition(QTextCursor.PreviousBlock)
+            cursor.movePosition(QTextCursor.EndOfBlock)
+
+        return cursor
+
+    def insert_note(self, cursor: QTextCursor, text: str, color: str) -> QTextCursor:
+        """
+        Inserts a note in smaller text in a new line after a cursor.
+
+        Args:
+            cursor (QTextCursor): Where the note goes, from `message_end`.
+            text (str): The note.
+            color (str): The color of the note.
+
+        Returns:
+            QTextCursor: A cursor selecting the note, to remove it. It is null
+                         if the document of the message was deleted.
+        """
+
+        if cursor.isNull():
+            return cursor
+
+        char_format = QTextCharFormat()
+        char_format.setFontItalic(True)
+        char_format.setFontPointSize(12)
+        char_format.setForeground(QColor(color))
+
+        note = QTextCursor(cursor)
+        note.clearSelection()
+        start = note.position()
+        note.insertBlock(QTextBlockFormat(), char_format)
+        note.insertText(text, char_format)
+
+        # Not part of the message above, e.g. when it is replayed
+        block = note.block()
+        while block.isValid() and block.position() > start:
+            block.setUserState(self.NOTE_STATE)
+            block = block.previous()
+
+        note.setPosition(start, QTextCursor.KeepAnchor)
+
+        return note
+
+    def audio_id_at(self, position) -> int | None:
+        """
+        Returns the audio id of the message under a viewport position.
+
+        Args:
+            position (QPoint): Position in viewport coordinates.
+
+        Returns:
+            int | None: The audio id, or None if there is no linked message.
+        """
+
+        cursor = self.cursorForPosition(position)
+
+        # Past the end of a line the cursor still lands in the block
+        if cursor.atBlockEnd() and self.cursorRect(cursor).right() < position.x():
+            return None
+
+        state = cursor.block().userState()
+        return state if state >= 0 else None
+
+    def message_at(self, position) -> tuple:
+        """
+        Returns the AIna message under a viewport position.
+
+        Args:
+            position (QPoint): Position in viewport coordinates.
+
+        Returns:
+            tuple: The text of the message and a cursor at its end, or
+                   (None, None) if there is no AIna message there or it
+                   already has a note.
+        """
+
+        block = self.cursorForPosition(position).block()
+        state = block.userState()
+
+        if state < 0:
+            return None, None
+
+        first = block
+        while first.previous().isValid() and first.previous().userState() == state:
+            first = first.previous()
+
+        lines = []
+        last = first
+        block = first
+        while block.isValid() and block.userState() == state:
+            if block.text():
+                lines.append(block.text())
+                last = block
+            block = block.next()
+
+        if last.next().userState() == self.NOTE_STATE:
+            return None, None
+
+        cursor = QTextCursor(last)
+        cursor.movePosition(QTextCursor.EndOfBlock)
+
+        return "\n".join(lines), cursor
+
+    def word_at(self, position) -> tuple:
+        """
+        Looks up the word under a viewport position.
+
+        Args:
+            position (QPoint): Position in viewport coordinates.
+
+        Returns:
+            tuple: The dictionary entry and the rect of the word in viewport
+                   coordinates, or (None, None) if there is no known word.
+        """
+
+        if self.dictionary is None:
+            return None, None
+
+        cursor = self.cursorForPosition(position)
+        block = cursor.block()
+
+        # The cursor lands on the nearest character edge, the hovered
+        # character is the one before it when the edge is on the right
+        index = cursor.positionInBlock()
+        if self.cursorRect(cursor).x() > position.x():
+            index -= 1
+
+        entry = self.dictionary.lookup_at(block.text(), index)
+        if entry is None:
+            return None, None
+
+        start = QTextCursor(block)
+        start.setPosition(block.position() + entry["start"])
+        end = QTextCursor(block)
+        end.setPosition(block.position() + entry["end"])
+        rect = self.cursorRect(start).united(self.cursorRect(end))
+
+        if not rect.contains(position):
+            return None, None
+
+        return entry, rect
+
+    def viewportEvent(self, event: QEvent | QHelpEvent) -> bool:
+        """
+        Shows the dictionary entry of the hovered word as a tooltip.
+        """
+
+        if event.type() == QEvent.Type.ToolTip and self.dictionary is not None:
+            entry, rect = self.word_at(event.pos())
+
+            if entry is not None:
+                reading = (
+                    f" 【{html.escape(entry['reading'])}】"
+                    if entry["reading"] and entry["reading"] != entry["word"]
+                    else ""
+                )
+                QToolTip.showText(
+                    event.globalPos(),
+                    f"<b>{html.escape(entry['word'])}</b>{reading}"
+                    f"<br>{html.escape(entry['definition'])}",
+                    self.viewport(),
+                    rect,
+                )
+                return True
+
+        return super().viewportEvent(event)
+
+    def contextMenuEvent(self, event: QContextMenuEvent) -> None:
+        """
+        Adds a "Translate" action to the context menu of AIna's messages.
+        """
+
+        menu = self.createStandardContextMenu()
+        text, cursor = self.message_at(event.pos())
+
+        if text is not None:
+            menu.addSeparator()
+            action = menu.addAction("Translate")
+            action.triggered.connect(
+                lambda: self.translation_requested.emit(text, cursor)
+            )
+
+        menu.exec(event.globalPos())
+        menu.deleteLater()
+
+    def mouseMoveEvent(self, event: QMouseEvent) -> None:
+        """
+        Shows a pointing hand over messages that can be replayed.
+        """
+
+        super().mouseMoveEvent(event)
+
+        if self.audio_id_at(event.position().toPoint()) is not None:
+            self.viewport().setCursor(Qt.CursorShape.PointingHandCursor)
+        else:
+            self.viewport().setCursor(Qt.CursorShape.IBeamCursor)
+
+    def mouseReleaseEvent(self, event: QMouseEvent) -> None:
+        """
+        Requests the replay of the clicked message, unless text was selected.
+        """
+
+        super().mouseReleaseEvent(event)
+
+        if (
+            event.button() == Qt.MouseButton.LeftButton
+            and not self.textCursor().hasSelection()
+        ):
+            audio_id = self.audio_id_at(event.position().toPoint())
+            if audio_id is not None:
+                self.replay_requested.emit(audio_id)
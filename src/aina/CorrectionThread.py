@@ -0,0 +1,130 @@
+import json
+
+from PySide6.QtCore import QThread, Signal, Slot
+
+from .EndpointPool import EndpointPool
+from .GPTClient import GPTClient
+
+
+class CorrectionThread(QThread):
+    """
+    Threaded class to check the grammar of a message of the user.
+
+    This class runs in a separate thread, in parallel with the GPTClient of
+    AIna's answer, so the correction never delays it. The model is asked for a
+    JSON object, which is sent back to the main thread as a dict.
+    """
+
+    finished_signal = Signal(dict, int)
+
+    def __init__(
+        self,
+        pool: EndpointPool,
+        prompt_path: str,
+        language: str,
+        message: str,
+        profile: dict,
+    ) -> None:
+        """
+        Initializes the CorrectionThread.
+
+        Args:
+            pool (EndpointPool): The LLM servers, shared with the GPTClient.
+            prompt_path (str): Path of the system prompt of the correction.
+            language (str): The language code of the conversation.
+            message (str): The message of the user.
+            profile (dict): Latency profile with the model id.
+        """
+
+        super().__init__()
+        self.pool = pool
+        self.prompt_path = prompt_path
+        self.language = language
+        self.message = message
+        self.profile = profile
+
+        self._should_stop = False
+
+    @staticmethod
+    def parse(content: str) -> dict:
+        """
+        Reads the correction out of the model answer.
+
+        Args:
+            content (str): The answer, a JSON object possibly surrounded by
+                        other text.
+
+        Returns:
+            dict: The "correct", "corrected" and "explanation" of the message.
+
+        Raises:
+            ValueError: If the answer has no valid correction.
+        """
+
+        start = content.find("{")
+        end = content.rfind("}")
+
+        if start == -1 or end < start:
+            raise ValueError("The model answer has no JSON object")
+
+        data = json.loads(content[start : end + 1])
+
+        return {
+            "correct": bool(data.get("correct", False)),
+            "corrected": str(data.get("corrected") or "").strip(),
+            "explanation": str(data.get("explanation") or "").strip(),
+        }
+
+    def run(self) -> None:
+        """
+        Requests the correction and send it back to the main thread.
+        """
+
+        try:
+            with open(self.prompt_path, "r", encoding="utf-8") as file:
+                prompt = file.read()
+        except Exception as e:
+            self.finished_signal.emit({"error": e}, 5)
+            return
+
+        request = {
+            "model": self.profile.get("model", "model-identifier"),
+            "messages": [
+                {"role": "system", "content": prompt},
+                {
+                    "role": "user",
+                    "content": f"Language: {self.language}\n"
+                    f"Sentence: {self.message}",
+                },
+            ],
+            "temperature": 0.2,
+            "max_tokens": 200,
+        }
+
+        try:
+            content = GPTClient.complete(
+                self.pool, request, should_stop=lambda: self._should_stop
+            )
+            if content is None:
+                # Stopped
+                self.finished_signal.emit({}, -1)
+                return
+
+            correction = self.parse(content)
+        except Exception as e:
+            self.finished_signal.emit({"error": e}, 1)
+            return
+
+        # Emit the finished signal
+        self.finished_signal.emit(correction, 0)
+
+    @Slot()
+    def stop(self) -> None:
+        """
+        Stops waiting for the correction, e.g. when the window closes.
+
+        This Slot can be connected to external signals to safely interrupt and stop
+        the thread's execution.
+        """
+
+        self._should_stop = True
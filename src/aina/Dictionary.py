@@ -0,0 +1,440 @@
+import hashlib
+import mmap
+import os
+import re
+import struct
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+
+
+class Dictionary:
+    """
+    Offline word lookup over a compiled, memory-mapped index.
+
+    The bundled dictionary is a TSV file with one entry per line:
+    "headword<TAB>reading<TAB>definition" (the reading may be empty). It is
+    compiled once into a binary index sorted by headword, which is then
+    memory-mapped, so opening a dictionary does not parse it and each lookup
+    is a binary search touching a handful of pages.
+
+    Index layout (native byte order):
+        header   magic, version, entry count, longest headword (characters),
+                 size and SHA-256 of the source file
+        offsets  count + 1 uint32 offsets of the records in the data section
+        data     the UTF-8 records "headword\\treading\\tdefinition", sorted
+    """
+
+    MAGIC = b"AIDX"
+    VERSION = 2
+    HEADER = struct.Struct("=4sIIIQ32s")
+
+    # Languages written without spaces, split by longest match
+    SEGMENTED_LANGUAGES = {"ja"}
+
+    # Segmented lines kept for hovering, most recent last
+    SEGMENTATION_CACHE_SIZE = 64
+
+    # Words of languages written with spaces
+    WORD_PATTERN = re.compile(r"[^\W\d_]+(?:['’-][^\W\d_]+)*")
+
+    # Inflection suffixes tried when a spaced-language word is not found
+    SUFFIXES = (
+        ("ies", "y"),
+        ("es", ""),
+        ("s", ""),
+        ("ied", "y"),
+        ("ed", "e"),
+        ("ed", ""),
+        ("ing", "e"),
+        ("ing", ""),
+    )
+
+    def __init__(self, index_path: str, language: str) -> None:
+        """
+        Opens a compiled index.
+
+        Args:
+            index_path (str): Path of the index made by `compile`.
+            language (str): Language code of the dictionary (e.g. "ja").
+        """
+
+        self.language = language
+        self.segmented = language in self.SEGMENTED_LANGUAGES
+
+        # Line text: (segment starts, segments)
+        self._segmentations = OrderedDict()
+
+        with open(index_path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.count, self.max_length, _, _ = (
+            self.HEADER.unpack_from(self._map)
+        )
+        if magic != self.MAGIC or version != self.VERSION:
+            self._map.close()
+            raise ValueError(f"Not a dictionary index: {index_path}")
+
+        offsets_end = self.HEADER.size + 4 * (self.count + 1)
+        self._offsets = memoryview(self._map)[self.HEADER.size : offsets_end].cast(
+            "I"
+        )
+        self._data = offsets_end
+
+    @classmethod
+    def open(cls, source_path: str, index_path: str, language: str) -> "Dictionary":
+        """
+        Opens the index of a dictionary, compiling it first if it is missing
+        or was compiled from another source file.
+
+        Args:
+            source_path (str): Path of the TSV dictionary.
+            index_path (str): Where the compiled index is kept.
+            language (str): Language code of the dictionary.
+
+        Returns:
+            Dictionary: The opened dictionary.
+        """
+
+        if not cls.is_current(source_path, index_path):
+            cls.compile(source_path, index_path)
+
+        return cls(index_path, language)
+
+    @staticmethod
+    def source_stamp(source_path: str) -> tuple:
+        """
+        Returns the size and SHA-256 of a source file.
+
+        Args:
+            source_path (str): Path of the TSV dictionary.
+
+        Returns:
+            tuple: The size in bytes and the digest.
+        """
+
+        digest = hashlib.sha256()
+        size = 0
+
+        with open(source_path, "rb") as file:
+            while chunk := file.read(1 << 20):
+                digest.update(chunk)
+                size += len(chunk)
+
+        return size, digest.digest()
+
+    @classmethod
+    def is_current(cls, source_path: str, index_path: str) -> bool:
+        """
+        Checks if an index was compiled from the source file as it is now.
+
+        The size and hash of the source are compared instead of modification
+        times, which change whenever the files are copied or extracted (e.g.
+        on every launch of a frozen build). The source is only hashed if the
+        size matches.
+
+        Args:
+            source_path (str): Path of the TSV dictionary.
+            index_path (str): Path of the compiled index.
+
+        Returns:
+            bool: True if the index can be used as it is.
+        """
+
+        try:
+            with open(index_path, "rb") as file:
+                header = file.read(cls.HEADER.size)
+        except FileNotFoundError:
+            return False
+
+        if len(header) < cls.HEADER.size:
+            return False
+
+        magic, version, _, _, size, digest = cls.HEADER.unpack(header)
+
+        if magic != cls.MAGIC or version != cls.VERSION:
+            return False
+
+        if os.path.getsize(source_path) != size:
+            return False
+
+        return cls.source_stamp(source_path) == (size, digest)
+
+    @classmethod
+    def compile(cls, source_path: str, index_path: str) -> None:
+        """
+        Compiles a TSV dictionary into a sorted binary index.
+
+        Repeated headwords are merged, joining their definitions.
+
+        Args:
+            source_path (str): Path of the TSV dictionary.
+            index_path (str): Path of the index to be written.
+        """
+
+        # Stamped before reading, so a source changed meanwhile is compiled
+        # again on the next open
+        size, digest = cls.source_stamp(source_path)
+
+        entries = {}
+        with open(source_path, "r", encoding="utf-8") as file:
+            for line in file:
+                line = line.rstrip("\n")
+                if not line or line.startswith("#"):
+                    continue
+
+                headword, reading, definition = (line.split("\t") + ["", ""])[:3]
+                headword = headword.strip()
+                if not headword:
+                    continue
+
+                if headword in entries:
+                    known_reading, known_definition = entries[headword]
+                    entries[headword] = (
+                        known_reading or reading.strip(),
+                        f"{known_definition}; {definition.strip()}",
+                    )
+                else:
+                    entries[headword] = (reading.strip(), definition.strip())
+
+        records = sorted(
+            (
+                f"{headword}\t{reading}\t{definition}".encode("utf-8")
+                for headword, (reading, definition) in entries.items()
+            ),
+            key=lambda record: record.split(b"\t", 1)[0],
+        )
+
+        offsets = array("I", [0])
+        for record in records:
+            offsets.append(offsets[-1] + len(record))
+
+        max_length = max((len(headword) for headword in entries), default=0)
+
+        os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+
+        # Written aside and renamed, so a reader never maps a partial index
+        temp_path = f"{index_path}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(
+                cls.HEADER.pack(
+                    cls.MAGIC,
+                    cls.VERSION,
+                    len(records),
+                    max_length,
+                    size,
+                    digest,
+                )
+            )
+            file.write(offsets.tobytes())
+            for record in records:
+                file.write(record)
+        os.replace(temp_path, index_path)
+
+    def close(self) -> None:
+        """
+        Releases the memory map.
+        """
+
+        self._offsets.release()
+        self._map.close()
+
+    def _record(self, index: int) -> bytes:
+        """
+        Returns the raw record of an entry.
+        """
+
+        return self._map[
+            self._data + self._offsets[index] : self._data + self._offsets[index + 1]
+        ]
+
+    def _headword(self, index: int) -> bytes:
+        """
+        Returns the raw headword of an entry, without reading the rest.
+        """
+
+        start = self._data + self._offsets[index]
+        end = self._map.find(b"\t", start, self._data + self._offsets[index + 1])
+        return self._map[start:end]
+
+    def lookup(self, word: str) -> dict | None:
+        """
+        Looks up a headword.
+
+        Args:
+            word (str): The exact headword.
+
+        Returns:
+            dict | None: The entry ("word", "reading", "definition"), or None
+                         if the word is not in the dictionary.
+        """
+
+        key = word.encode("utf-8")
+        index = self._lower_bound(key)
+
+        if index == self.count or self._headword(index) != key:
+            return None
+
+        headword, reading, definition = self._record(index).decode("utf-8").split("\t")
+        return {"word": headword, "reading": reading, "definition": definition}
+
+    def _lower_bound(self, key: bytes, low: int = 0) -> int:
+        """
+        Returns the index of the first headword not less than the key.
+        """
+
+        high = self.count
+
+        while low < high:
+            middle = (low + high) // 2
+            if self._headword(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+    def longest_match(self, text: str, start: int) -> dict | None:
+        """
+        Finds the longest headword that starts at a position of the text.
+
+        The candidates are grown one character at a time, narrowing the search
+        to the headwords sharing the prefix, and stop as soon as none does.
+
+        Args:
+            text (str): The text.
+            start (int): Index of the first character.
+
+        Returns:
+            dict | None: The entry, with its "start" and "end" in the text, or
+                         None if no headword starts there.
+        """
+
+        best = None
+        low = 0
+
+        for end in range(start + 1, min(len(text), start + self.max_length) + 1):
+            prefix = text[start:end].encode("utf-8")
+            low = self._lower_bound(prefix, low)
+
+            if low == self.count:
+                break
+
+            headword = self._headword(low)
+            if not headword.startswith(prefix):
+                break
+            if headword == prefix:
+                best = (low, end)
+
+        if best is None:
+            return None
+
+        index, end = best
+        headword, reading, definition = self._record(index).decode("utf-8").split("\t")
+        return {
+            "word": headword,
+            "reading": reading,
+            "definition": definition,
+            "start": start,
+            "end": end,
+        }
+
+    def segment(self, text: str) -> list:
+        """
+        Splits text without spaces into words by greedy longest match.
+
+        Characters that start no headword are grouped into unknown segments.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            list: (start, end, entry) tuples covering the whole text, where
+                  entry is None for unknown segments.
+        """
+
+        segments = []
+        position = 0
+
+        while position < len(text):
+            entry = self.longest_match(text, position)
+
+            if entry is not None:
+                segments.append((position, entry["end"], entry))
+                position = entry["end"]
+            elif segments and segments[-1][2] is None:
+                segments[-1] = (segments[-1][0], position + 1, None)
+                position += 1
+            else:
+                segments.append((position, position + 1, None))
+                position += 1
+
+        return segments
+
+    def _segmentation(self, text: str) -> tuple:
+        """
+        Returns the segments of a line and their starts, segmenting it only
+        the first time, so hovering along a line is a binary search.
+        """
+
+        segmentation = self._segmentations.get(text)
+
+        if segmentation is None:
+            # Segmented from the line start, so boundaries match a reading in
+            # order
+            segments = self.segment(text)
+            segmentation = ([start for start, _, _ in segments], segments)
+            self._segmentations[text] = segmentation
+
+            if len(self._segmentations) > self.SEGMENTATION_CACHE_SIZE:
+                self._segmentations.popitem(last=False)
+        else:
+            self._segmentations.move_to_end(text)
+
+        return segmentation
+
+    def _base_forms(self, word: str) -> list:
+        """
+        Returns the forms of a spaced-language word to look up, in order: as
+        written, lowercase, then with common inflection suffixes removed.
+        """
+
+        lower = word.lower()
+        forms = [word, lower]
+
+        for suffix, replacement in self.SUFFIXES:
+            if lower.endswith(suffix) and len(lower) > len(suffix) + 1:
+                forms.append(lower[: -len(suffix)] + replacement)
+
+        return forms
+
+    def lookup_at(self, text: str, index: int) -> dict | None:
+        """
+        Looks up the word of a text that covers a character position.
+
+        Args:
+            text (str): The text, usually one line of the chat log.
+            index (int): Index of the character.
+
+        Returns:
+            dict | None: The entry, with its "start" and "end" in the text, or
+                         None if there is no known word at the position.
+        """
+
+        if not 0 <= index < len(text):
+            return None
+
+        if self.segmented:
+            starts, segments = self._segmentation(text)
+            start, end, entry = segments[bisect_right(starts, index) - 1]
+            return {**entry, "start": start, "end": end} if entry else None
+
+        for match in self.WORD_PATTERN.finditer(text):
+            if match.start() <= index < match.end():
+                for candidate in self._base_forms(match.group()):
+                    entry = self.lookup(candidate)
+                    if entry is not None:
+                        return {**entry, "start": match.start(), "end": match.end()}
+                return None
+
+        return None
@@ -0,0 +1,237 @@
+import threading
+import time
+
+
+class Endpoint:
+    """
+    An OpenAI compatible server and its request statistics.
+    """
+
+    def __init__(self, url: str, timeout: float = 30.0) -> None:
+        """
+        Initializes the endpoint.
+
+        Args:
+            url (str): Base URL of the server, e.g. "http://localhost:1234/v1".
+            timeout (float, optional): Request timeout in seconds, so a stalled
+                                    server fails over. Defaults to 30.
+        """
+
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+        self.outstanding = 0
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_errors = 0
+        self.latency = None  # Moving average of the time to first token
+        self.online = True
+        self.models = []
+        self.ejected_until = 0.0
+
+        self._client = None
+
+    @property
+    def client(self):
+        """
+        The OpenAI client pointing to this endpoint, created on first use.
+        """
+
+        if self._client is None:
+            from openai import OpenAI
+
+            self._client = OpenAI(
+                base_url=self.url, api_key="lm-studio", timeout=self.timeout
+            )
+
+        return self._client
+
+    def is_available(self, now: float) -> bool:
+        """
+        Checks if the endpoint can receive requests.
+
+        Args:
+            now (float): The current `time.monotonic()` value.
+
+        Returns:
+            bool: False if the endpoint is down or ejected.
+        """
+
+        return self.online and now >= self.ejected_until
+
+
+class EndpointPool:
+    """
+    Load balancer for several OpenAI compatible servers.
+
+    Each request goes to the available endpoint with the fewest requests in
+    flight ("least_outstanding") or with the lowest expected wait, i.e. its
+    average latency times the requests in flight ("latency"). An endpoint that
+    fails several requests in a row, or that the HealthMonitor can't reach, is
+    ejected for a while. All methods are thread safe.
+    """
+
+    def __init__(
+        self,
+        urls: list[str],
+        routing: str = "least_outstanding",
+        eject_after: int = 2,
+        eject_seconds: float = 30.0,
+        timeout: float = 30.0,
+    ) -> None:
+        """
+        Initializes the pool.
+
+        Args:
+            urls (list[str]): Base URLs of the servers.
+            routing (str, optional): "least_outstanding" or "latency". Defaults
+                                  to "least_outstanding".
+            eject_after (int, optional): Consecutive errors before an endpoint
+                                      is ejected. Defaults to 2.
+            eject_seconds (float, optional): How long an ejected endpoint is
+                                          left out. Defaults to 30.
+            timeout (float, optional): Request timeout of each endpoint, in
+                                    seconds. Defaults to 30.
+        """
+
+        self.endpoints = [Endpoint(url, timeout) for url in urls]
+        self.routing = routing
+        self.eject_after = eject_after
+        self.eject_seconds = eject_seconds
+
+        self._lock = threading.Lock()
+
+    def _score(self, endpoint: Endpoint) -> tuple:
+        """
+        Returns the routing score of an endpoint, the lowest wins.
+        """
+
+        latency = endpoint.latency or 0.0
+
+        if self.routing == "latency":
+            return (latency * (endpoint.outstanding + 1), endpoint.outstanding)
+
+        return (endpoint.outstanding, latency)
+
+    def acquire(
+        self, exclude: set | None = None, fallback: bool = False
+    ) -> Endpoint | None:
+        """
+        Picks the endpoint for a new request and counts it as in flight.
+
+        Args:
+            exclude (set, optional): URLs to skip, e.g. endpoints that already
+                                  failed this request.
+            fallback (bool, optional): When no endpoint is available, use the
+                                    down or ejected one that would be back
+                                    first, e.g. to retry a request after every
+                                    server failed. Defaults to False.
+
+        Returns:
+            Endpoint | None: The chosen endpoint, or None if none is available.
+        """
+
+        exclude = exclude or set()
+        now = time.monotonic()
+
+        with self._lock:
+            candidates = [
+                endpoint
+                for endpoint in self.endpoints
+                if endpoint.url not in exclude and endpoint.is_available(now)
+            ]
+
+            if not candidates and fallback:
+                # The one that would be back first
+                candidates = sorted(
+                    (
+                        endpoint
+                        for endpoint in self.endpoints
+                        if endpoint.url not in exclude
+                    ),
+                    key=lambda endpoint: (not endpoint.online, endpoint.ejected_until),
+                )[:1]
+
+            if not candidates:
+                return None
+
+            endpoint = min(candidates, key=self._score)
+            endpoint.outstanding += 1
+            endpoint.requests += 1
+
+        return endpoint
+
+    def release(
+        self, endpoint: Endpoint, latency: float | None = None, error: bool = False
+    ) -> None:
+        """
+        Marks a request as finished and updates the endpoint statistics.
+
+        Args:
+            endpoint (Endpoint): The endpoint returned by `acquire`.
+            latency (float, optional): Time to first token, in seconds.
+            error (bool, optional): Whether the request failed. Defaults to
+                                 False.
+        """
+
+        with self._lock:
+            endpoint.outstanding -= 1
+
+            if error:
+                endpoint.errors += 1
+                endpoint.consecutive_errors += 1
+
+                if endpoint.consecutive_errors >= self.eject_after:
+                    endpoint.ejected_until = time.monotonic() + self.eject_seconds
+            else:
+                endpoint.consecutive_errors = 0
+
+                if latency is not None:
+                    if endpoint.latency is None:
+                        endpoint.latency = latency
+                    else:
+                        endpoint.latency = 0.8 * endpoint.latency + 0.2 * latency
+
+    def mark_health(self, url: str, online: bool, models: list | None = None) -> None:
+        """
+        Updates the reachability of an endpoint, as seen by the HealthMonitor.
+
+        Args:
+            url (str): Base URL of the endpoint.
+            online (bool): Whether the last probe succeeded.
+            models (list, optional): Ids of the models loaded in the server.
+        """
+
+        with self._lock:
+            for endpoint in self.endpoints:
+                if endpoint.url == url.rstrip("/"):
+                    endpoint.online = online
+
+                    # A server answering probes may still fail completions, so
+                    # an ejection runs its course
+                    if online:
+                        endpoint.models = models or []
+
+    def stats(self) -> list[dict]:
+        """
+        Returns the statistics of every endpoint.
+
+        Returns:
+            list[dict]: One dict per endpoint with its URL, state, requests in
+                        flight, total requests, errors and average latency.
+        """
+
+        now = time.monotonic()
+
+        with self._lock:
+            return [
+                {
+                    "url": endpoint.url,
+                    "available": endpoint.is_available(now),
+                    "outstanding": endpoint.outstanding,
+                    "requests": endpoint.requests,
+                    "errors": endpoint.errors,
+                    "latency": endpoint.latency,
+                }
+                for endpoint in self.endpoints
+            ]
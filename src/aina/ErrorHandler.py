@@ -1,4 +1,5 @@
-from PySide6.QtWidgets import QMessageBox
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QMessageBox, QStatusBar
 
 
 class ErrorHandler:
@@ -7,13 +8,57 @@ class ErrorHandler:
 
     Uses QMessageBox to show predefined user-friendly error messages based
     on the error code, followed by any additional exception information.
+    Failed attempts that are being retried are only shown in the status bar.
     """
 
+    # Short descriptions of the errors, for the status bar
+    SHORT_MESSAGES = {
+        1: "Could not reach the LLM server",
+        2: "Could not generate AIna's voice",
+        3: "Could not play the audio",
+        4: "Could not transcribe the audio",
+        5: "Could not initialize the model",
+        6: "Could not score the pronunciation",
+    }
+
+    # Open dialogs, kept alive until closed
+    _dialogs = []
+
+    @staticmethod
+    def notify_retry(
+        status_bar: QStatusBar,
+        error_status: int,
+        attempt: int,
+        attempts: int,
+        error: str,
+    ) -> None:
+        """
+        Shows a failed attempt that is going to be retried in the status bar,
+        without interrupting the user.
+
+        Args:
+            status_bar (QStatusBar): Where the notification is shown.
+            error_status (int): The numeric code identifying the type of error.
+            attempt (int): The attempt that failed, starting from 1.
+            attempts (int): The number of attempts.
+            error (str): The exception details.
+        """
+
+        status_bar.showMessage(
+            f"{ErrorHandler.SHORT_MESSAGES[error_status]} ({error}). "
+            f"Trying again ({attempt + 1}/{attempts})...",
+            5000,
+        )
+
     @staticmethod
     def handle_exception(message: dict, error_status: int) -> None:
         """
         Displays an error message using QMessageBox based on the given status
-        code and exception details.
+        code and exception details. Called once the retries, if any, are
+        exhausted.
+
+        The dialog is modal, but it does not block the caller or the event
+        loop while it is open.
 
         Args:
             message (dict): The original exception data or message payload.
@@ -46,6 +91,10 @@ class ErrorHandler:
                 "dependencies incorrect API credentials, or a configuration "
                 'issue. Please check the settings and try again.\n\nDetails: "'
             ),
+            6: (
+                "Could not score the pronunciation. Listen to AIna's sentence "
+                'again and record yourself repeating it.\n\nDetails: "'
+            ),
         }
 
         message = error_message[error_status] + str(message["error"]) + '"'
@@ -55,4 +104,7 @@ class ErrorHandler:
         msg_box.setIcon(QMessageBox.Icon.Critical)
         msg_box.setWindowTitle("Error code " + str(hex(error_status)))
         msg_box.setText(message)
-        msg_box.exec()
+        msg_box.setWindowModality(Qt.WindowModality.ApplicationModal)
+        msg_box.finished.connect(lambda _: ErrorHandler._dialogs.remove(msg_box))
+        ErrorHandler._dialogs.append(msg_box)
+        msg_box.show()
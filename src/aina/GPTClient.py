@@ -1,8 +1,17 @@
+import os
+import time
+from typing import TYPE_CHECKING
+
 from PySide6.QtCore import QThread, Signal, Slot
 
+from .AudioCache import AudioCache, amplitude_envelope, init_mixer
+from .AudioProcess import AudioProcess
+from .Cassette import Cassette
+from .RetryPolicy import RetryPolicy
 from .SpeechProcessor import SpeechProcessor
 
-from .AIna import AIna
+if TYPE_CHECKING:
+    from .AIna import AIna
 
 
 class GPTClient(QThread):
@@ -17,16 +26,43 @@ class GPTClient(QThread):
 
     finished_signal = Signal(dict, int)
 
-    def __init__(self, AIna: AIna | None = None):
+    # Emitted before a failed step is tried again, with its error code, the
+    # attempt that failed, the number of attempts and the error
+    retry_signal = Signal(int, int, int, str)
+
+    def __init__(
+        self,
+        AIna: "AIna | None" = None,
+        profile: dict | None = None,
+        audio_cache: AudioCache | None = None,
+        messages: list | None = None,
+        filename: str | None = None,
+    ):
         """
         Initializes the GPTClient thread.
 
         Args:
             AIna (AIna, optional): The GPT model to be used for generating responses.
+            profile (dict, optional): Latency profile with the model id,
+                generation limits and TTS backend. Defaults to the model's
+                original settings.
+            audio_cache (AudioCache, optional): Where the decoded answer audio
+                is stored for playback. The id of the entry is sent back as
+                "audio_id" in the message.
+            messages (list, optional): The messages to send instead of the
+                model history, e.g. with a user message not committed yet.
+            filename (str, optional): Path of the answer MP3 file. Defaults to
+                "temp/output.mp3".
         """
         super().__init__()
 
         self.AIna = AIna
+        self.profile = profile or {}
+        self.audio_cache = audio_cache
+        self.messages = messages
+        self.filename = filename or os.path.join(
+            os.environ.get("AINA_BASE_DIR"), "temp", "output.mp3"
+        )
         self._should_stop = False
 
     def run(self):
@@ -39,36 +75,114 @@ class GPTClient(QThread):
 
         new_message = {"role": "assistant", "content": ""}
 
-        try:
-            completion = self.AIna.client.chat.completions.create(
-                model="model-identifier",
-                messages=self.AIna.history,
-                temperature=1.2,
-                stream=True,
+        messages = self.messages if self.messages is not None else self.AIna.history
+        request = {
+            "model": self.profile.get("model", "model-identifier"),
+            "messages": messages,
+            "temperature": self.profile.get("temperature", 1.2),
+            "max_tokens": self.profile.get("max_tokens"),
+            "stop": self.profile.get("stop") or None,
+        }
+
+        # A replayed session does not touch the servers
+        replaying = Cassette.replaying() is not None
+
+        # Endpoints that already failed this attempt
+        tried = set()
+        error = None
+        attempt = 1
+
+        while True:
+            endpoint = (
+                None
+                if replaying
+                else self.AIna.pool.acquire(exclude=tried, fallback=attempt > 1)
             )
 
-            for chunk in completion:
-                if self._should_stop:
-                    # Stream stopped by user.
-                    self.finished_signal.emit({}, -1)
-                    return
+            if endpoint is None and not replaying:
+                # Can't make a connection or lost the connection with every
+                # model, the whole request is tried again after a while
+                error = error or ConnectionError("No LLM server is available")
+                if self.wait_retry(1, error, attempt):
+                    attempt += 1
+                    tried.clear()
+                    continue
 
-                if chunk.choices[0].delta.content:
-                    new_message["content"] += chunk.choices[0].delta.content
-        except Exception as e:
-            # Can't make a connection or lost the connectio with the GPT model
-            self.finished_signal.emit({"error": e}, 1)
-            return
+                # Replays give up on the same request
+                cassette = Cassette.recording()
+                if cassette is not None:
+                    cassette.record("llm_failed")
+
+                self.emit_error(error, 1)
+                return
+
+            start = time.monotonic()
+            latency = None
+            new_message["content"] = ""
+
+            try:
+                for content in self.stream_completion(endpoint, request):
+                    if latency is None:
+                        latency = time.monotonic() - start
+
+                    if self._should_stop:
+                        # Stream stopped by user.
+                        if endpoint is not None:
+                            self.AIna.pool.release(endpoint, latency)
+                        self.finished_signal.emit({}, -1)
+                        return
+
+                    new_message["content"] += content
+            except Exception as e:
+                if endpoint is None:
+                    # The replayed request failed as it did when recorded, and
+                    # the turn went on with the next recorded request, without
+                    # waiting, unless it gave up there
+                    if Cassette.replaying().replay_failed():
+                        self.emit_error(e, 1)
+                        return
+
+                    continue
+
+                # Re-issue the request to another endpoint
+                self.AIna.pool.release(endpoint, error=True)
+                tried.add(endpoint.url)
+                error = e
+                continue
+
+            if endpoint is not None:
+                self.AIna.pool.release(endpoint, latency)
+            break
 
         # Turning AIna's answer into speech
         if not self._should_stop:
             try:
-                SpeechProcessor.text_to_speech(
-                    new_message["content"], self.AIna.language
+                RetryPolicy.run(
+                    2,
+                    SpeechProcessor.text_to_speech,
+                    new_message["content"],
+                    self.AIna.language,
+                    self.profile.get("tts_backend", "gtts"),
+                    self.filename,
+                    on_retry=self.report_retry(2),
+                    should_stop=lambda: self._should_stop,
                 )
+
+                # Decoding here keeps it out of playback and replays
+                if self.audio_cache is not None:
+                    # Read once, in case the audio settings change meanwhile
+                    mixer = init_mixer()
+                    pcm = AudioProcess.decode_audio_file(self.filename, mixer)
+                    samplerate = mixer[0]
+                    new_message["audio_id"] = self.audio_cache.add(
+                        pcm,
+                        samplerate,
+                        new_message["content"],
+                        amplitude_envelope(pcm, samplerate),
+                    )
             except Exception as e:
                 # Handles some error during text to speech process.
-                self.finished_signal.emit({"error": e}, 2)
+                self.emit_error(e, 2)
                 return
         else:
             # Stream stopped by user.
@@ -78,6 +192,174 @@ class GPTClient(QThread):
         # If no error occur, send the message back to the main thread.
         self.finished_signal.emit(new_message, 0)
 
+    def report_retry(self, error_status: int):
+        """
+        Returns the `on_retry` callback of `RetryPolicy.run` for a step, which
+        tells the main thread about the failed attempt.
+
+        Args:
+            error_status (int): The error code of the step.
+        """
+
+        def on_retry(error, attempt: int, attempts: int) -> None:
+            self.retry_signal.emit(error_status, attempt, attempts, str(error))
+
+        return on_retry
+
+    def wait_retry(self, error_status: int, error, attempt: int) -> bool:
+        """
+        Reports a failed attempt and waits before the next one, if the retry
+        policy allows it.
+
+        Args:
+            error_status (int): The error code of the step.
+            error (Exception): The error of the attempt.
+            attempt (int): The attempt that failed, starting from 1.
+
+        Returns:
+            bool: True if the step should be tried again.
+        """
+
+        attempts = RetryPolicy.attempts(error_status)
+
+        if attempt >= attempts or not RetryPolicy.is_transient(error):
+            return False
+
+        self.report_retry(error_status)(error, attempt, attempts)
+
+        return RetryPolicy.sleep(
+            RetryPolicy.delay(error_status, attempt), lambda: self._should_stop
+        )
+
+    def emit_error(self, error, error_status: int) -> None:
+        """
+        Sends the error of a step back to the main thread, or the cancellation
+        if the user stopped the thread while it was waiting to retry.
+
+        Args:
+            error (Exception): The last error.
+            error_status (int): The error code of the step.
+        """
+
+        if self._should_stop:
+            self.finished_signal.emit({}, -1)
+        else:
+            self.finished_signal.emit({"error": error}, error_status)
+
+    @staticmethod
+    def stream_completion(endpoint, request: dict):
+        """
+        Streams a chat completion, yielding the content of each chunk.
+
+        When a cassette is recording, the request and every chunk are written
+        to it; when one is replaying, the chunks come from it and the endpoint
+        is not used.
+
+        Args:
+            endpoint (Endpoint | None): The server to send the request to.
+            request (dict): The arguments of `chat.completions.create`.
+
+        Yields:
+            str: The content of each streamed chunk.
+        """
+
+        cassette = Cassette.replaying()
+        if cassette is not None:
+            yield from cassette.replay_stream()
+            return
+
+        cassette = Cassette.recording()
+        if cassette is not None:
+            request_id = cassette.new_request_id()
+            cassette.record(
+                "llm_request",
+                request_id=request_id,
+                endpoint=endpoint.url,
+                **request,
+            )
+
+        try:
+            # Limits a profile leaves unset are not sent, so the server
+            # defaults apply
+            completion = endpoint.client.chat.completions.create(
+                **{key: value for key, value in request.items() if value is not None},
+                stream=True,
+            )
+
+            for chunk in completion:
+                content = chunk.choices[0].delta.content if chunk.choices else None
+
+                if cassette is not None:
+                    cassette.record(
+                        "llm_chunk", request_id=request_id, content=content or ""
+                    )
+
+                if content:
+                    yield content
+        except Exception as e:
+            if cassette is not None:
+                cassette.record("llm_error", request_id=request_id, error=str(e))
+            raise
+
+        if cassette is not None:
+            cassette.record("llm_end", request_id=request_id)
+
+    @staticmethod
+    def complete(pool, request: dict, should_stop=None) -> str | None:
+        """
+        Runs a whole chat completion, re-issuing it to the next server when
+        one fails. Used by the background workers.
+
+        Args:
+            pool (EndpointPool): The servers to use.
+            request (dict): The arguments of `chat.completions.create`.
+            should_stop (Callable, optional): Checked before each server and
+                                           between chunks; the answer is
+                                           dropped once it returns True.
+                                           Defaults to None.
+
+        Returns:
+            str | None: The content of the answer, or None if it was stopped.
+
+        Raises:
+            ConnectionError: If every server failed.
+        """
+
+        tried = set()
+        error = None
+
+        while True:
+            if should_stop is not None and should_stop():
+                return None
+
+            endpoint = pool.acquire(exclude=tried)
+
+            if endpoint is None:
+                raise ConnectionError(error or "No LLM server is available")
+
+            start = time.monotonic()
+            latency = None
+            content = ""
+
+            try:
+                for chunk in GPTClient.stream_completion(endpoint, request):
+                    if latency is None:
+                        latency = time.monotonic() - start
+
+                    if should_stop is not None and should_stop():
+                        pool.release(endpoint, latency)
+                        return None
+
+                    content += chunk
+            except Exception as e:
+                pool.release(endpoint, error=True)
+                tried.add(endpoint.url)
+                error = e
+                continue
+
+            pool.release(endpoint, latency)
+            return content
+
     @Slot()
     def stop(self):
         """
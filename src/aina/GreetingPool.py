@@ -0,0 +1,152 @@
+import json
+import os
+import uuid
+
+
+class GreetingPool:
+    """
+    Greetings generated ahead of time for each language and level.
+
+    Each greeting is AIna's text and its decoded audio, saved as a NumPy file
+    in the mixer format, so it can be played as soon as the conversation
+    starts. The pool lives in the config folder and survives restarts; it is
+    refilled in the background by `GreetingThread` after each use.
+    """
+
+    def __init__(self, folder: str, size: int = 2) -> None:
+        """
+        Initializes the GreetingPool.
+
+        Args:
+            folder (str): Where the greetings and their index are kept.
+            size (int, optional): Greetings kept per language and level.
+                               Defaults to 2.
+        """
+
+        self.folder = str(folder)
+        self.size = size
+        self.index_path = os.path.join(self.folder, "greetings.json")
+
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as file:
+                self.index = json.load(file)
+        except (OSError, json.JSONDecodeError):
+            self.index = {}
+
+    @staticmethod
+    def key(language: str, language_level: str) -> str:
+        """
+        Returns the index key of a language and level.
+        """
+
+        return f"{language}-{language_level}"
+
+    def new_path(self) -> str:
+        """
+        Returns a new file path for the audio of a greeting (without the
+        ".npy" extension, which NumPy adds).
+
+        Returns:
+            str: The path.
+        """
+
+        os.makedirs(self.folder, exist_ok=True)
+
+        return os.path.join(self.folder, uuid.uuid4().hex)
+
+    def missing(self, language: str, language_level: str) -> int:
+        """
+        Returns how many greetings are needed to fill the pool.
+
+        Args:
+            language (str): The language code.
+            language_level (str): The language level.
+
+        Returns:
+            int: The number of greetings to be generated.
+        """
+
+        return max(
+            self.size - len(self.index.get(self.key(language, language_level), [])),
+            0,
+        )
+
+    def add(self, greeting: dict) -> None:
+        """
+        Adds a greeting made by `GreetingThread`.
+
+        Args:
+            greeting (dict): The "language", "language_level", "content",
+                          "file", "samplerate" and "channels" of the greeting.
+        """
+
+        key = self.key(greeting["language"], greeting["language_level"])
+        self.index.setdefault(key, []).append(
+            {
+                "content": greeting["content"],
+                "file": os.path.basename(greeting["file"]),
+                "samplerate": greeting["samplerate"],
+                "channels": greeting["channels"],
+            }
+        )
+        self._save()
+
+    def take(self, language: str, language_level: str, mixer: tuple) -> dict | None:
+        """
+        Removes a greeting from the pool and returns it with its audio.
+
+        Greetings decoded for another mixer format, or whose audio is
+        missing, are dropped.
+
+        Args:
+            language (str): The language code.
+            language_level (str): The language level.
+            mixer (tuple): The current mixer settings (frequency, format,
+                        channels).
+
+        Returns:
+            dict | None: The "content", "pcm" and "samplerate" of the
+                         greeting, or None if the pool is empty.
+        """
+
+        import numpy as np
+
+        entries = self.index.get(self.key(language, language_level), [])
+
+        while entries:
+            entry = entries.pop(0)
+            path = os.path.join(self.folder, entry["file"])
+
+            try:
+                if (entry["samplerate"], entry["channels"]) == (mixer[0], mixer[2]):
+                    pcm = np.load(path)
+                else:
+                    pcm = None
+            except (OSError, ValueError):
+                pcm = None
+
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+            if pcm is not None:
+                self._save()
+                return {
+                    "content": entry["content"],
+                    "pcm": pcm,
+                    "samplerate": entry["samplerate"],
+                }
+
+        self._save()
+        return None
+
+    def _save(self) -> None:
+        """
+        Writes the index to the disk.
+        """
+
+        os.makedirs(self.folder, exist_ok=True)
+
+        with open(self.index_path, "w", encoding="utf-8") as file:
+            json.dump(self.index, file, indent=4, ensure_ascii=False)
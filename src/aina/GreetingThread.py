@@ -0,0 +1,121 @@
+import os
+
+from PySide6.QtCore import QThread, Signal, Slot
+
+from .AIna import AIna
+from .AudioCache import init_mixer
+from .AudioProcess import AudioProcess
+from .GPTClient import GPTClient
+from .SpeechProcessor import SpeechProcessor
+
+
+class GreetingThread(QThread):
+    """
+    Threaded class to generate a greeting for the `GreetingPool`.
+
+    This class runs in a separate thread to ask the model for a greeting,
+    synthesize it and save its decoded audio, so the pool can be refilled
+    while the user is talking with AIna.
+    """
+
+    finished_signal = Signal(dict, int)
+
+    def __init__(
+        self,
+        AIna: AIna,
+        profile: dict,
+        path: str,
+    ) -> None:
+        """
+        Initializes the GreetingThread.
+
+        Args:
+            AIna (AIna): A fresh model of the language and level, whose history
+                      only has the prompt and the greeting request.
+            profile (dict): Latency profile with the model id, generation limits
+                         and TTS backend.
+            path (str): Where the audio is saved, without extension.
+        """
+
+        super().__init__()
+        self.AIna = AIna
+        self.profile = profile
+        self.path = path
+
+        self._should_stop = False
+
+    def run(self) -> None:
+        """
+        Generates the greeting and send back to the main thread its text and
+        where its audio was saved.
+        """
+
+        import numpy as np
+
+        request = {
+            "model": self.profile.get("model", "model-identifier"),
+            "messages": self.AIna.history,
+            "temperature": self.profile.get("temperature", 1.2),
+            "max_tokens": self.profile.get("max_tokens"),
+            "stop": self.profile.get("stop") or None,
+        }
+
+        try:
+            content = GPTClient.complete(
+                self.AIna.pool, request, should_stop=lambda: self._should_stop
+            )
+        except Exception as e:
+            self.finished_signal.emit({"error": e}, 1)
+            return
+
+        if content is None:
+            # Stopped
+            self.finished_signal.emit({}, -1)
+            return
+
+        if content == "":
+            self.finished_signal.emit({"error": "The model gave an empty greeting"}, 1)
+            return
+
+        try:
+            filename = f"{self.path}.mp3"
+            SpeechProcessor.text_to_speech(
+                content,
+                self.AIna.language,
+                self.profile.get("tts_backend", "gtts"),
+                filename,
+            )
+            # Read once, in case the audio settings change meanwhile
+            mixer = init_mixer()
+            pcm = AudioProcess.decode_audio_file(filename, mixer)
+            os.remove(filename)
+
+            np.save(f"{self.path}.npy", pcm)
+            samplerate, _, channels = mixer
+        except Exception as e:
+            self.finished_signal.emit({"error": e}, 2)
+            return
+
+        # Emit the finished signal
+        self.finished_signal.emit(
+            {
+                "language": self.AIna.language,
+                "language_level": self.AIna.language_level,
+                "content": content,
+                "file": f"{self.path}.npy",
+                "samplerate": samplerate,
+                "channels": channels,
+            },
+            0,
+        )
+
+    @Slot()
+    def stop(self) -> None:
+        """
+        Stops waiting for the greeting, e.g. when the window closes.
+
+        This Slot can be connected to external signals to safely interrupt and stop
+        the thread's execution.
+        """
+
+        self._should_stop = True
@@ -0,0 +1,134 @@
+import json
+import threading
+import urllib.request
+
+from PySide6.QtCore import QThread, Signal, Slot
+
+from .EndpointPool import EndpointPool
+
+
+class HealthMonitor(QThread):
+    """
+    Threaded class that keeps probing the LLM servers in the background.
+
+    It requests the `/models` endpoint of every OpenAI compatible server in the
+    pool, updates their reachability and reports whether any of them is up and
+    which models are loaded. While all servers are down, the probe interval
+    grows exponentially up to a limit, and goes back to normal as soon as one
+    of them answers again.
+    """
+
+    status_signal = Signal(bool, list)
+
+    def __init__(
+        self,
+        pool: EndpointPool,
+        interval: float = 5.0,
+        max_interval: float = 60.0,
+        timeout: float = 2.0,
+    ) -> None:
+        """
+        Initializes the HealthMonitor.
+
+        Args:
+            pool (EndpointPool): The endpoints to probe.
+            interval (float, optional): Seconds between probes while a server
+                                     is reachable. Defaults to 5.
+            max_interval (float, optional): Upper limit of the backoff, in
+                                         seconds. Defaults to 60.
+            timeout (float, optional): Timeout of each probe, in seconds.
+                                    Defaults to 2.
+        """
+
+        super().__init__()
+
+        self.pool = pool
+        self.interval = interval
+        self.max_interval = max_interval
+        self.timeout = timeout
+
+        # Result of the last round of probes
+        self.online = None
+        self.models = []
+
+        self._wake = threading.Event()
+        self._should_stop = False
+
+    def probe(self, url: str) -> list[str]:
+        """
+        Requests the list of models loaded in a server.
+
+        Args:
+            url (str): Base URL of the server.
+
+        Returns:
+            list[str]: The ids of the available models.
+
+        Raises:
+            Exception: If the server can't be reached or answers with an error.
+        """
+
+        with urllib.request.urlopen(
+            f"{url}/models", timeout=self.timeout
+        ) as response:
+            data = json.load(response)
+
+        return [model["id"] for model in data.get("data", [])]
+
+    def run(self) -> None:
+        """
+        Probes the servers until the thread is stopped, emitting the result of
+        every round through `status_signal`.
+        """
+
+        delay = self.interval
+
+        while not self._should_stop:
+            online = False
+            models = []
+
+            for endpoint in self.pool.endpoints:
+                try:
+                    endpoint_models = self.probe(endpoint.url)
+                except Exception:
+                    self.pool.mark_health(endpoint.url, False)
+                    continue
+
+                self.pool.mark_health(endpoint.url, True, endpoint_models)
+
+                if not online:
+                    online = True
+                    models = endpoint_models
+
+            self.online = online
+            self.models = models
+
+            if online:
+                delay = self.interval
+            else:
+                delay = min(delay * 2, self.max_interval)
+
+            self.status_signal.emit(self.online, self.models)
+
+            self._wake.wait(delay)
+            self._wake.clear()
+
+    @Slot()
+    def probe_now(self) -> None:
+        """
+        Skips the current wait and probes the servers right away.
+        """
+
+        self._wake.set()
+
+    @Slot()
+    def stop(self) -> None:
+        """
+        Stops the HealthMonitor thread.
+
+        This Slot can be connected to external signals to safely interrupt and stop
+        the thread's execution.
+        """
+
+        self._should_stop = True
+        self._wake.set()
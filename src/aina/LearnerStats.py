@@ -0,0 +1,311 @@
+import os
+import re
+
+from .Dictionary import Dictionary
+
+
+class LearnerStats:
+    """
+    Word frequency and mistake statistics of the learner in one language.
+
+    The counters are updated after each turn and never recomputed from the
+    transcripts. Each word seen gets an index in `words`, and its counts are
+    kept in numpy arrays grown by doubling: how many times the user used it,
+    heard it from AIna, and had it corrected. Running totals are kept too, so
+    the summary does not depend on how long the statistics have been
+    collected.
+
+    The counters are saved in a .npz snapshot, written every `SAVE_EVERY`
+    updates and when the application closes.
+    """
+
+    # Running totals, by position in the `totals` array
+    TOTALS = (
+        "turns",  # Messages of the user
+        "words",  # Words used by the user
+        "distinct",  # Different words used by the user
+        "answers",  # Messages of AIna
+        "corrections",  # Messages of the user checked for grammar
+        "mistakes",  # Messages of the user with some mistake
+    )
+
+    SAVE_EVERY = 10
+
+    WORD_PATTERN = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)*")
+
+    def __init__(self, path: str, dictionary: Dictionary | None = None) -> None:
+        """
+        Initializes the LearnerStats, loading the snapshot if there is one.
+
+        Args:
+            path (str): Path of the .npz snapshot.
+            dictionary (Dictionary, optional): The dictionary of the language,
+                                            used to split and normalize the
+                                            words of languages written
+                                            without spaces.
+        """
+
+        import numpy as np
+
+        self.path = path
+        self.dictionary = dictionary
+        self.words = {}
+        self.used = np.zeros(1024, dtype=np.uint32)
+        self.heard = np.zeros(1024, dtype=np.uint32)
+        self.mistaken = np.zeros(1024, dtype=np.uint32)
+        self.totals = np.zeros(len(self.TOTALS), dtype=np.int64)
+        self.pending = 0
+
+        if os.path.exists(path):
+            self.load()
+
+    def load(self) -> None:
+        """
+        Reads the counters from the snapshot.
+        """
+
+        import numpy as np
+
+        with np.load(self.path) as snapshot:
+            words = snapshot["words"].tolist()
+            capacity = max(1024, 1 << max(len(words) - 1, 0).bit_length())
+
+            self.words = {word: index for index, word in enumerate(words)}
+            for name in ("used", "heard", "mistaken"):
+                counts = np.zeros(capacity, dtype=np.uint32)
+                counts[: len(words)] = snapshot[name]
+                setattr(self, name, counts)
+            self.totals[: len(snapshot["totals"])] = snapshot["totals"]
+
+    def save(self) -> None:
+        """
+        Writes the counters to the snapshot, if they changed.
+        """
+
+        import numpy as np
+
+        if self.pending == 0 and os.path.exists(self.path):
+            return
+
+        count = len(self.words)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+        # Written aside and renamed, so a crash never leaves a partial snapshot
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "wb") as file:
+            np.savez(
+                file,
+                words=np.array(list(self.words), dtype=str),
+                used=self.used[:count],
+                heard=self.heard[:count],
+                mistaken=self.mistaken[:count],
+                totals=self.totals,
+            )
+        os.replace(temp_path, self.path)
+
+        self.pending = 0
+
+    def tokenize(self, text: str) -> list:
+        """
+        Splits a message into normalized words.
+
+        Args:
+            text (str): The message.
+
+        Returns:
+            list: The words, lowercased, or as dictionary headwords for
+                  languages written without spaces. Words missing from the
+                  dictionary are kept as written.
+        """
+
+        if self.dictionary is not None and self.dictionary.segmented:
+            words = []
+
+            for start, end, entry in self.dictionary.segment(text):
+                if entry is not None:
+                    words.append(entry["word"])
+                else:
+                    # Unknown segments may also hold spaces and punctuation
+                    words.extend(
+                        word.casefold()
+                        for word in self.WORD_PATTERN.findall(text[start:end])
+                    )
+
+            return words
+
+        return [word.casefold() for word in self.WORD_PATTERN.findall(text)]
+
+    def _indices(self, words: list):
+        """
+        Returns the indices of words, adding the new ones and growing the
+        counters if needed.
+        """
+
+        import numpy as np
+
+        for word in words:
+            if word not in self.words:
+                self.words[word] = len(self.words)
+
+        if len(self.words) > len(self.used):
+            capacity = 1 << (len(self.words) - 1).bit_length()
+            for name in ("used", "heard", "mistaken"):
+                counts = np.zeros(capacity, dtype=np.uint32)
+                counts[: len(getattr(self, name))] = getattr(self, name)
+                setattr(self, name, counts)
+
+        return np.fromiter(
+            (self.words[word] for word in words), dtype=np.int64, count=len(words)
+        )
+
+    def _updated(self) -> None:
+        """
+        Counts an update, saving the snapshot every `SAVE_EVERY` of them.
+        """
+
+        self.pending += 1
+
+        if self.pending >= self.SAVE_EVERY:
+            self.save()
+
+    def _add(self, name: str, value: int = 1) -> None:
+        self.totals[self.TOTALS.index(name)] += value
+
+    def add_message(self, text: str) -> None:
+        """
+        Counts the words of a message of the user.
+
+        Args:
+            text (str): The message.
+        """
+
+        import numpy as np
+
+        indices = self._indices(self.tokenize(text))
+
+        new = np.unique(indices[self.used[indices] == 0])
+        np.add.at(self.used, indices, 1)
+
+        self._add("turns")
+        self._add("words", len(indices))
+        self._add("distinct", len(new))
+        self._updated()
+
+    def add_answer(self, text: str) -> None:
+        """
+        Counts the words of a message of AIna.
+
+        Args:
+            text (str): The message.
+        """
+
+        import numpy as np
+
+        np.add.at(self.heard, self._indices(self.tokenize(text)), 1)
+
+        self._add("answers")
+        self._updated()
+
+    def add_correction(self, text: str, correction: dict) -> None:
+        """
+        Counts the result of a grammar check. The words of the message that
+        are not in the corrected one count as mistaken.
+
+        Args:
+            text (str): The message of the user.
+            correction (dict): The "correct" and "corrected" of the check.
+        """
+
+        import numpy as np
+
+        self._add("corrections")
+
+        if not correction["correct"]:
+            corrected = set(self.tokenize(correction["corrected"]))
+            mistaken = [word for word in self.tokenize(text) if word not in corrected]
+
+            np.add.at(self.mistaken, self._indices(mistaken), 1)
+            self._add("mistakes")
+
+        self._updated()
+
+    def top(self, name: str, count: int = 10) -> list:
+        """
+        Returns the words with the highest count.
+
+        Args:
+            name (str): The counter, "used", "heard" or "mistaken".
+            count (int, optional): How many words. Defaults to 10.
+
+        Returns:
+            list: (word, count) tuples, from the highest count.
+        """
+
+        import numpy as np
+
+        counts = getattr(self, name)[: len(self.words)]
+        count = min(count, int(np.count_nonzero(counts)))
+
+        if count == 0:
+            return []
+
+        indices = np.argpartition(counts, -count)[-count:]
+        indices = indices[np.argsort(counts[indices])[::-1]]
+        words = list(self.words)
+
+        return [(words[index], int(counts[index])) for index in indices]
+
+    def summary(self) -> dict:
+        """
+        Returns the totals and the most frequent words.
+
+        Returns:
+            dict: The `TOTALS`, plus "mistake_rate", "top_used" and
+                  "top_mistaken".
+        """
+
+        summary = {name: int(value) for name, value in zip(self.TOTALS, self.totals)}
+        summary["mistake_rate"] = (
+            summary["mistakes"] / summary["corrections"]
+            if summary["corrections"]
+            else None
+        )
+        summary["top_used"] = self.top("used")
+        summary["top_mistaken"] = self.top("mistaken")
+
+        return summary
+
+    def prompt_summary(self) -> str:
+        """
+        Describes the learner for the system prompt.
+
+        Returns:
+            str: The description, or an empty string if there are no stats yet.
+        """
+
+        summary = self.summary()
+
+        if summary["turns"] == 0:
+            return ""
+
+        lines = [
+            "About your speaker, from your past conversations:",
+            f"- They sent {summary['turns']} messages and used "
+            f"{summary['distinct']} different words.",
+        ]
+
+        if summary["mistake_rate"] is not None:
+            lines.append(
+                f"- {summary['mistake_rate']:.0%} of their messages had mistakes."
+            )
+
+        if summary["top_mistaken"]:
+            words = ", ".join(word for word, _ in summary["top_mistaken"])
+            lines.append(f"- Words they often get wrong: {words}.")
+
+        lines.append(
+            "Adapt the difficulty of your messages to them, and use the words "
+            "they get wrong in your messages now and then."
+        )
+
+        return "\n".join(lines)
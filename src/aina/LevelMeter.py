@@ -0,0 +1,160 @@
+from typing import TYPE_CHECKING
+
+from PySide6.QtWidgets import QWidget
+from PySide6.QtGui import QColor, QPainter, QPaintEvent
+from PySide6.QtCore import QLineF, QRectF, QTimer
+
+# numpy is imported on the first recording, the meter is built at startup
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class LevelMeter(QWidget):
+    """
+    Live input level meter with a scrolling waveform.
+
+    The audio callback pushes its blocks into a ring buffer with `push` and
+    nothing else happens on the audio thread. A timer repaints the widget at a
+    fixed rate, decimating the buffer to one min/max pair per pixel column with
+    NumPy, so no signal is emitted per block and no Python loop runs per sample.
+    """
+
+    def __init__(
+        self,
+        parent: QWidget | None = None,
+        seconds: float = 2.0,
+        fps: int = 30,
+    ) -> None:
+        """
+        Initializes the LevelMeter.
+
+        Args:
+            parent (QWidget, optional): The parent widget. Defaults to None.
+            seconds (float, optional): Length of the waveform shown. Defaults
+                                    to 2 seconds.
+            fps (int, optional): Repaints per second while recording. Defaults
+                              to 30.
+        """
+
+        super().__init__(parent)
+
+        self.seconds = seconds
+        self.setFixedSize(120, 50)
+        self.setToolTip("Microphone level")
+
+        self._buffer = None
+        self._write = 0
+        self._samplerate = 1
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(1000 // fps)
+        self._timer.timeout.connect(self.update)
+
+    def start(self, samplerate: int) -> None:
+        """
+        Clears the meter and starts repainting it.
+
+        Args:
+            samplerate (int): Sample rate of the pushed audio.
+        """
+
+        import numpy as np
+
+        self._samplerate = samplerate
+        self._buffer = np.zeros(int(samplerate * self.seconds), dtype=np.float32)
+        self._write = 0
+        self._timer.start()
+
+    def stop(self) -> None:
+        """
+        Stops repainting and clears the meter.
+        """
+
+        self._timer.stop()
+        if self._buffer is not None:
+            self._buffer[:] = 0
+        self.update()
+
+    def push(self, samples: "np.ndarray") -> None:
+        """
+        Writes a block of samples into the ring buffer. Called from the audio
+        callback, so it only copies memory.
+
+        Args:
+            samples (np.ndarray): Mono float samples in [-1, 1].
+        """
+
+        buffer = self._buffer
+        size = len(buffer)
+        samples = samples[-size:]
+        count = len(samples)
+        start = self._write
+
+        first = min(count, size - start)
+        buffer[start : start + first] = samples[:first]
+        buffer[: count - first] = samples[first:]
+
+        self._write = (start + count) % size
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        """
+        Draws the waveform as one min/max line per pixel column, and the level
+        bar of the last 50 ms (red when the input clipped recently).
+        """
+
+        painter = QPainter(self)
+        width = self.width()
+        height = self.height()
+        bar_height = 6
+        wave_height = height - bar_height - 2
+        mid = wave_height / 2
+
+        color = self.palette().highlight().color()
+
+        # Nothing recorded yet
+        if self._buffer is None:
+            painter.fillRect(
+                QRectF(0, height - bar_height, width, bar_height),
+                self.palette().mid().color(),
+            )
+            painter.end()
+            return
+
+        import numpy as np
+
+        # Chronological copy of the ring buffer, decimated per pixel column
+        samples = np.roll(self._buffer, -self._write)
+        per_column = max(len(samples) // width, 1)
+        columns = samples[-per_column * width :].reshape(-1, per_column)
+        tops = mid - columns.max(axis=1) * mid
+        bottoms = mid - columns.min(axis=1) * mid
+
+        painter.setPen(color)
+        painter.drawLines(
+            [
+                QLineF(x, top, x, bottom)
+                for x, (top, bottom) in enumerate(zip(tops, bottoms))
+            ]
+        )
+
+        # Level of the last 50 ms and clipping over the last half second
+        recent = samples[-max(self._samplerate // 20, 1) :]
+        peak = float(np.abs(recent).max()) if len(recent) else 0.0
+        clipped = bool(
+            np.abs(samples[-max(self._samplerate // 2, 1) :]).max() >= 0.99
+        )
+        level = 0.0
+        if peak > 0:
+            # -60 dBFS to 0 dBFS
+            level = min(max((20 * np.log10(peak) + 60) / 60, 0.0), 1.0)
+
+        painter.fillRect(
+            QRectF(0, height - bar_height, width, bar_height),
+            self.palette().mid().color(),
+        )
+        painter.fillRect(
+            QRectF(0, height - bar_height, width * level, bar_height),
+            QColor("red") if clipped else color,
+        )
+
+        painter.end()
@@ -0,0 +1,215 @@
+import os
+
+from PySide6.QtWidgets import QLabel, QWidget
+from PySide6.QtGui import QColor, QPainter, QPen, QPixmap
+from PySide6.QtCore import QPointF, QTimer
+
+from .AssetRegistry import AssetRegistry
+from .AudioCache import ENVELOPE_FRAME_MS
+
+
+class Portrait(QLabel):
+    """
+    AIna's portrait, with expressions and lip-sync.
+
+    Every sprite is decoded or drawn once and cached. While AIna speaks, a
+    single timer reads the playback position, looks up the precomputed
+    amplitude envelope of the audio and swaps to the mouth sprite of that
+    level, only when it changes. Nothing else runs per frame, so the animation
+    does not compete with audio or the event loop.
+
+    Sprites are looked up in the images folder as "aina-<expression>.png" and
+    "aina-mouth-<level>.png". Missing expressions fall back to the base image
+    and missing mouth frames are drawn over it.
+    """
+
+    # Mouth position and width, relative to the base image, measured on the
+    # mouth line of aina.png so the open mouth covers it
+    MOUTH_CENTER = (0.497, 0.697)
+    MOUTH_WIDTH = 0.08
+
+    # Mouth sprites, from closed (0) to fully open
+    MOUTH_LEVELS = 4
+
+    def __init__(
+        self,
+        assets: AssetRegistry,
+        parent: QWidget | None = None,
+        fps: int = 30,
+    ) -> None:
+        """
+        Initializes the Portrait.
+
+        Args:
+            assets (AssetRegistry): Where the sprites are loaded from.
+            parent (QWidget, optional): The parent widget. Defaults to None.
+            fps (int, optional): Animation frame rate while speaking, 30 to
+                              60. Defaults to 30.
+        """
+
+        super().__init__(parent)
+
+        self.assets = assets
+        self.setScaledContents(True)
+
+        self._expression = "neutral"
+        self._sprites = {}
+        self._level = None
+
+        self._envelope = None
+        self._frame_seconds = ENVELOPE_FRAME_MS / 1000
+        self._position = None
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(1000 // fps)
+        self._timer.timeout.connect(self._tick)
+
+        self.setPixmap(self.sprite(self._expression, 0))
+
+    def sprite(self, expression: str, level: int) -> QPixmap:
+        """
+        Returns the cached sprite of an expression and mouth level, building
+        it on first use.
+
+        Args:
+            expression (str): The expression name, e.g. "neutral".
+            level (int): The mouth level, 0 (closed) to MOUTH_LEVELS - 1.
+
+        Returns:
+            QPixmap: The sprite.
+        """
+
+        key = (expression, level)
+
+        if key not in self._sprites:
+            base = self._expression_pixmap(expression)
+
+            if level == 0:
+                self._sprites[key] = base
+            else:
+                mouth_file = f"aina-mouth-{level}.png"
+                if os.path.exists(self.assets.path(mouth_file, "images")):
+                    self._sprites[key] = self._overlay(
+                        base, self.assets.pixmap(mouth_file)
+                    )
+                else:
+                    self._sprites[key] = self._draw_mouth(base, level)
+
+        return self._sprites[key]
+
+    def _expression_pixmap(self, expression: str) -> QPixmap:
+        """
+        Returns the base image of an expression, or the default portrait.
+        """
+
+        filename = f"aina-{expression}.png"
+        if os.path.exists(self.assets.path(filename, "images")):
+            return self.assets.pixmap(filename)
+
+        return self.assets.pixmap("aina.png")
+
+    def _overlay(self, base: QPixmap, layer: QPixmap) -> QPixmap:
+        """
+        Draws a sprite layer (same size as the base) over a copy of the base.
+        """
+
+        pixmap = base.copy()
+        painter = QPainter(pixmap)
+        painter.drawPixmap(0, 0, layer)
+        painter.end()
+
+        return pixmap
+
+    def _draw_mouth(self, base: QPixmap, level: int) -> QPixmap:
+        """
+        Draws an open mouth of the given level over a copy of the base.
+        """
+
+        pixmap = base.copy()
+        width = pixmap.width() * self.MOUTH_WIDTH
+        height = width * 0.6 * level / (self.MOUTH_LEVELS - 1)
+        center = QPointF(
+            pixmap.width() * self.MOUTH_CENTER[0],
+            pixmap.height() * self.MOUTH_CENTER[1],
+        )
+
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(QPen(QColor("black"), 2))
+        painter.setBrush(QColor(120, 40, 50))
+        painter.drawEllipse(center, width / 2, max(height / 2, 1.5))
+        painter.end()
+
+        return pixmap
+
+    def _show(self, level: int) -> None:
+        """
+        Shows a mouth level, if it is not already shown.
+        """
+
+        if level != self._level:
+            self._level = level
+            self.setPixmap(self.sprite(self._expression, level))
+
+    def set_expression(self, expression: str) -> None:
+        """
+        Changes AIna's expression, e.g. "neutral", "thinking" or "speaking".
+
+        Args:
+            expression (str): The expression name.
+        """
+
+        if expression != self._expression:
+            self._expression = expression
+            self._level = None
+            self._show(0)
+
+    def start_speaking(self, envelope, frame_seconds: float, position) -> None:
+        """
+        Starts the lip-sync animation.
+
+        Args:
+            envelope (numpy.ndarray): Amplitude per frame, from 0 to 1.
+            frame_seconds (float): Duration of each envelope frame.
+            position (Callable[[], float]): Returns the playback position, in
+                                         seconds.
+        """
+
+        self._envelope = envelope
+        self._frame_seconds = frame_seconds
+        self._position = position
+        self.set_expression("speaking")
+        self._timer.start()
+
+    def is_speaking(self) -> bool:
+        """
+        Returns whether the lip-sync animation is running.
+        """
+
+        return self._timer.isActive()
+
+    def stop_speaking(self) -> None:
+        """
+        Stops the lip-sync animation and closes the mouth.
+        """
+
+        self._timer.stop()
+        self._envelope = None
+        self._position = None
+        self.set_expression("neutral")
+
+    def _tick(self) -> None:
+        """
+        Shows the mouth level for the current playback position.
+        """
+
+        if self._envelope is None or len(self._envelope) == 0:
+            return
+
+        index = int(self._position() / self._frame_seconds)
+        if index >= len(self._envelope):
+            self._show(0)
+            return
+
+        level = int(round(self._envelope[index] * (self.MOUTH_LEVELS - 1)))
+        self._show(level)
@@ -0,0 +1,80 @@
+import importlib
+import time
+
+from PySide6.QtCore import QThread, Signal
+
+
+# Modules that are expensive to import, in the order they are usually needed.
+HEAVY_MODULES = [
+    "numpy",
+    "sounddevice",
+    "wavio",
+    "openai",
+    "speech_recognition",
+    "gtts",
+    "pygame",
+    "src.aina.AIna",
+    "src.aina.GPTClient",
+    "src.aina.SpeechThread",
+    "src.aina.SpeakerThread",
+]
+
+
+def import_module_timed(name: str) -> float:
+    """
+    Imports a module and returns how long it took.
+
+    Modules already in `sys.modules` cost (almost) nothing, so the measured
+    time is the incremental cost given everything imported before it.
+
+    Args:
+        name (str): The dotted name of the module to import.
+
+    Returns:
+        float: The import time in seconds.
+    """
+
+    start = time.perf_counter()
+    importlib.import_module(name)
+    return time.perf_counter() - start
+
+
+class PreloadThread(QThread):
+    """
+    Threaded class to import the heavy subsystems in the background.
+
+    The main window only needs Qt to be shown. This thread runs right after it
+    appears and pulls in audio, speech and LLM libraries, so they are already
+    loaded when the user starts the first turn.
+    """
+
+    finished_signal = Signal(dict, int)
+
+    def __init__(self, modules: list[str] | None = None) -> None:
+        """
+        Initializes the PreloadThread.
+
+        Args:
+            modules (list[str], optional): Modules to import. Defaults to
+                                        `HEAVY_MODULES`.
+        """
+
+        super().__init__()
+        self.modules = modules if modules is not None else HEAVY_MODULES
+
+    def run(self) -> None:
+        """
+        Imports every module, recording its cost. A module that fails to import
+        is skipped; the error will surface again, and be reported, on first use.
+        """
+
+        timings = {}
+        failed = {}
+
+        for name in self.modules:
+            try:
+                timings[name] = import_module_timed(name)
+            except Exception as e:
+                failed[name] = e
+
+        self.finished_signal.emit({"timings": timings, "failed": failed}, 0)
@@ -0,0 +1,241 @@
+from functools import lru_cache
+
+import numpy as np
+
+
+@lru_cache(maxsize=8)
+def mel_filterbank(
+    samplerate: int, n_fft: int, n_mels: int = 40, fmax: float = 8000.0
+) -> np.ndarray:
+    """
+    Builds a triangular mel filterbank. Cached, since it only depends on the
+    parameters.
+
+    Args:
+        samplerate (int): Sample rate of the signal.
+        n_fft (int): FFT size.
+        n_mels (int, optional): Number of mel bands. Defaults to 40.
+        fmax (float, optional): Highest frequency, in Hz. Defaults to 8000.
+
+    Returns:
+        np.ndarray: The filters, with shape (n_fft // 2 + 1, n_mels).
+    """
+
+    fmax = min(fmax, samplerate / 2)
+
+    def hz_to_mel(hz):
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+    def mel_to_hz(mel):
+        return 700.0 * (10.0 ** (mel / 2595.0) - 1.0)
+
+    mel_points = np.linspace(hz_to_mel(0.0), hz_to_mel(fmax), n_mels + 2)
+    hz_points = mel_to_hz(mel_points)
+    fft_freqs = np.fft.rfftfreq(n_fft, 1.0 / samplerate)
+
+    lower = hz_points[:-2, None]
+    center = hz_points[1:-1, None]
+    upper = hz_points[2:, None]
+
+    rising = (fft_freqs[None, :] - lower) / (center - lower)
+    falling = (upper - fft_freqs[None, :]) / (upper - center)
+    filters = np.maximum(0.0, np.minimum(rising, falling))
+
+    return filters.T.astype(np.float32)
+
+
+class PronunciationScorer:
+    """
+    Utility class to compare the learner's pronunciation with AIna's audio.
+
+    Both recordings are turned into log-mel features and aligned with banded
+    dynamic time warping. Everything is computed on whole arrays (framing, FFT,
+    filterbank and the DTW anti-diagonals), but the DTW still dominates: a 10
+    second clip takes about 0.1 to 0.2 seconds, depending on the machine, so
+    scoring runs in the ScoreThread.
+    """
+
+    # Average DTW distances mapped to a score of 100 and 0
+    GOOD_DISTANCE = 0.15
+    BAD_DISTANCE = 0.65
+
+    # Recordings quieter than this peak (-40 dBFS) count as silent
+    SILENCE_PEAK = 0.01
+
+    @staticmethod
+    def to_mono(pcm: np.ndarray) -> np.ndarray:
+        """
+        Converts PCM samples to a mono float signal in [-1, 1].
+
+        Args:
+            pcm (np.ndarray): Samples with shape (frames,) or (frames, channels).
+
+        Returns:
+            np.ndarray: The mono float32 signal.
+        """
+
+        signal = np.asarray(pcm)
+
+        if np.issubdtype(signal.dtype, np.integer):
+            signal = signal.astype(np.float32) / np.iinfo(signal.dtype).max
+        else:
+            signal = signal.astype(np.float32)
+
+        if signal.ndim == 2:
+            signal = signal.mean(axis=1)
+
+        return signal
+
+    @staticmethod
+    def features(
+        signal: np.ndarray,
+        samplerate: int,
+        frame_ms: float = 25.0,
+        hop_ms: float = 10.0,
+        n_mels: int = 40,
+        silence_db: float = 35.0,
+    ) -> np.ndarray:
+        """
+        Extracts normalized log-mel features, with leading and trailing silence
+        trimmed.
+
+        Args:
+            signal (np.ndarray): Mono float signal.
+            samplerate (int): Sample rate of the signal.
+            frame_ms (float, optional): Frame length. Defaults to 25 ms.
+            hop_ms (float, optional): Frame step. Defaults to 10 ms.
+            n_mels (int, optional): Number of mel bands. Defaults to 40.
+            silence_db (float, optional): Frames this far below the loudest
+                                       frame count as silence. Defaults to 35.
+
+        Returns:
+            np.ndarray: The features, with shape (frames, n_mels).
+        """
+
+        frame_length = int(samplerate * frame_ms / 1000)
+        hop_length = int(samplerate * hop_ms / 1000)
+        n_fft = 1 << (frame_length - 1).bit_length()
+
+        # Pre-emphasis, and padding so there is at least one frame
+        signal = np.append(signal[:1], signal[1:] - 0.97 * signal[:-1])
+        if len(signal) < frame_length:
+            signal = np.pad(signal, (0, frame_length - len(signal)))
+
+        frames = np.lib.stride_tricks.sliding_window_view(signal, frame_length)
+        frames = frames[::hop_length] * np.hamming(frame_length).astype(np.float32)
+
+        power = np.abs(np.fft.rfft(frames, n=n_fft)) ** 2
+        mel = np.log(power @ mel_filterbank(samplerate, n_fft, n_mels) + 1e-10)
+
+        # Trim silence
+        energy = 10.0 * np.log10(np.sum(frames**2, axis=1) + 1e-10)
+        voiced = np.flatnonzero(energy > energy.max() - silence_db)
+        mel = mel[voiced[0] : voiced[-1] + 1]
+
+        # Mean and variance normalization per band
+        mel = (mel - mel.mean(axis=0)) / (mel.std(axis=0) + 1e-5)
+
+        return mel.astype(np.float32)
+
+    @staticmethod
+    def dtw_distance(a: np.ndarray, b: np.ndarray, band: float = 0.15) -> float:
+        """
+        Aligns two feature sequences with dynamic time warping restricted to a
+        band around the diagonal (Sakoe-Chiba), and returns the average cost of
+        the alignment.
+
+        The recurrence is evaluated one anti-diagonal at a time, since all the
+        cells of an anti-diagonal only depend on the two previous ones.
+
+        Args:
+            a (np.ndarray): First sequence, shape (n, features).
+            b (np.ndarray): Second sequence, shape (m, features).
+            band (float, optional): Band radius as a fraction of the longest
+                                 sequence. Defaults to 0.15.
+
+        Returns:
+            float: The alignment cost divided by n + m. Cosine distances are
+                   used, so 0 means identical.
+        """
+
+        n, m = len(a), len(b)
+
+        # Cosine distance between every pair of frames
+        a_unit = a / (np.linalg.norm(a, axis=1, keepdims=True) + 1e-10)
+        b_unit = b / (np.linalg.norm(b, axis=1, keepdims=True) + 1e-10)
+        cost = 1.0 - a_unit @ b_unit.T
+
+        # Band around the line joining both ends, as a column range per row
+        radius = max(int(band * max(n, m)), 2)
+        center = np.arange(n) * (m - 1) / max(n - 1, 1)
+        j_lo = np.clip(np.floor(center - radius), 0, m - 1).astype(np.int64)
+        j_hi = np.clip(np.ceil(center + radius), 0, m - 1).astype(np.int64)
+        rows = np.arange(n)
+        diag_lo = rows + j_lo
+        diag_hi = rows + j_hi
+
+        # Accumulated cost with a border of infinities; D[i + 1, j + 1]
+        # holds the cost of aligning a[:i + 1] with b[:j + 1]
+        D = np.full((n + 1, m + 1), np.inf, dtype=np.float32)
+        D[0, 0] = 0.0
+
+        for k in range(n + m - 1):
+            # Rows whose band contains the cell (i, k - i)
+            i_start = np.searchsorted(diag_hi, k, side="left")
+            i_end = np.searchsorted(diag_lo, k, side="right")
+            i = rows[i_start:i_end]
+            j = k - i
+
+            D[i + 1, j + 1] = cost[i, j] + np.minimum(
+                np.minimum(D[i, j], D[i, j + 1]), D[i + 1, j]
+            )
+
+        return float(D[n, m] / (n + m))
+
+    @staticmethod
+    def score(
+        learner_pcm: np.ndarray,
+        learner_samplerate: int,
+        reference_pcm: np.ndarray,
+        reference_samplerate: int,
+    ) -> dict:
+        """
+        Scores the learner's recording against AIna's reference audio.
+
+        Args:
+            learner_pcm (np.ndarray): The learner's samples.
+            learner_samplerate (int): Sample rate of the learner's samples.
+            reference_pcm (np.ndarray): AIna's samples.
+            reference_samplerate (int): Sample rate of AIna's samples.
+
+        Returns:
+            dict: The "score" (0 to 100) and the raw DTW "distance".
+
+        Raises:
+            ValueError: If the learner's recording is silent, or too short to
+                        be aligned with AIna's audio.
+        """
+
+        signal = PronunciationScorer.to_mono(learner_pcm)
+
+        if len(signal) == 0 or np.abs(signal).max() < PronunciationScorer.SILENCE_PEAK:
+            raise ValueError("Nothing was recorded. Check the microphone.")
+
+        learner = PronunciationScorer.features(signal, learner_samplerate)
+        reference = PronunciationScorer.features(
+            PronunciationScorer.to_mono(reference_pcm), reference_samplerate
+        )
+
+        distance = PronunciationScorer.dtw_distance(learner, reference)
+
+        # No alignment fits in the band when one side is only a few frames
+        if not np.isfinite(distance):
+            raise ValueError(
+                "The recording is too short to be compared with AIna's sentence."
+            )
+
+        good = PronunciationScorer.GOOD_DISTANCE
+        bad = PronunciationScorer.BAD_DISTANCE
+        score = 100.0 * np.clip((bad - distance) / (bad - good), 0.0, 1.0)
+
+        return {"score": int(round(score)), "distance": distance}
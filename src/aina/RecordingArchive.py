@@ -0,0 +1,270 @@
+import json
+import os
+import queue
+import threading
+import time
+
+
+class ArchiveWriter:
+    """
+    Encodes one recording to FLAC on a background thread, while it is being
+    made.
+
+    The audio callback only queues a copy of each block, so it never waits
+    for the encoder or the disk. The file is written aside and renamed when
+    the recording ends, and then added to the index of the archive.
+    """
+
+    def __init__(
+        self,
+        archive: "RecordingArchive",
+        path: str,
+        record: dict,
+        samplerate: int,
+        channels: int,
+    ) -> None:
+        """
+        Initializes the ArchiveWriter and starts its thread.
+
+        Args:
+            archive (RecordingArchive): The archive, indexing the file.
+            path (str): Path of the FLAC file.
+            record (dict): The index record of the recording.
+            samplerate (int): Sample rate of the recording.
+            channels (int): Number of channels of the recording.
+        """
+
+        self.archive = archive
+        self.path = path
+        self.record = record
+        self.samplerate = samplerate
+        self.channels = channels
+        self.error = None
+
+        self._blocks = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._run, name="ArchiveWriter", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, block) -> None:
+        """
+        Queues a block of samples. Safe to call from the audio callback.
+
+        Args:
+            block (numpy.ndarray): Samples with shape (frames, channels).
+        """
+
+        # The audio stream reuses its buffers
+        self._blocks.put(block.copy())
+
+    def close(self) -> None:
+        """
+        Ends the recording. The queued blocks are still written.
+        """
+
+        self._blocks.put(None)
+
+    def join(self, timeout: float | None = None) -> None:
+        """
+        Waits for the file to be written.
+
+        Args:
+            timeout (float, optional): Maximum wait, in seconds.
+        """
+
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        """
+        Writes the queued blocks until the recording ends.
+        """
+
+        temp_path = f"{self.path}.tmp"
+        frames = 0
+
+        try:
+            import soundfile as sf
+
+            with sf.SoundFile(
+                temp_path,
+                "w",
+                self.samplerate,
+                self.channels,
+                subtype="PCM_16",
+                format="FLAC",
+            ) as file:
+                while (block := self._blocks.get()) is not None:
+                    file.write(block)
+                    frames += len(block)
+
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            # The archive is optional, the conversation goes on without it
+            self.error = e
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+
+        self.archive.add_record(
+            {**self.record, "seconds": round(frames / self.samplerate, 2)}
+        )
+
+
+class RecordingArchive:
+    """
+    Opt-in archive of the recordings of the user, to review their progress.
+
+    Each recording is streamed to a lossless FLAC file while it is made,
+    named after its session and turn (`<session>/turn-<n>.flac`). The index,
+    `index.jsonl`, gets a line per recording and a line per later annotation
+    (its transcript, pronunciation score...); `entries` merges them.
+
+    Needs the optional `soundfile` package.
+    """
+
+    INDEX = "index.jsonl"
+
+    def __init__(self, folder: str) -> None:
+        """
+        Initializes the RecordingArchive.
+
+        Args:
+            folder (str): Folder of the archive.
+        """
+
+        self.folder = folder
+        self._writers = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def available() -> bool:
+        """
+        Checks if the optional FLAC encoder is installed.
+
+        Returns:
+            bool: True if `soundfile` can be imported.
+        """
+
+        try:
+            import soundfile  # noqa: F401
+        except (ImportError, OSError):
+            return False
+
+        return True
+
+    def start(
+        self,
+        session: str,
+        turn: int,
+        samplerate: int,
+        channels: int,
+        **fields,
+    ) -> ArchiveWriter:
+        """
+        Starts archiving a recording.
+
+        Args:
+            session (str): Id of the conversation session.
+            turn (int): Number of the recording in the session, from 1.
+            samplerate (int): Sample rate of the recording.
+            channels (int): Number of channels of the recording.
+            **fields: Other fields of the index record (language...).
+
+        Returns:
+            ArchiveWriter: Where the blocks of the recording are written.
+        """
+
+        os.makedirs(os.path.join(self.folder, session), exist_ok=True)
+        filename = os.path.join(session, f"turn-{turn:04d}.flac")
+
+        record = {
+            "session": session,
+            "turn": turn,
+            "file": filename.replace(os.sep, "/"),
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            **fields,
+        }
+
+        writer = ArchiveWriter(
+            self, os.path.join(self.folder, filename), record, samplerate, channels
+        )
+
+        # Forget the writers already done
+        self._writers = [
+            other for other in self._writers if other._thread.is_alive()
+        ]
+        self._writers.append(writer)
+
+        return writer
+
+    def add_record(self, record: dict) -> None:
+        """
+        Appends a line to the index. Thread safe.
+
+        Args:
+            record (dict): The "session", "turn" and fields of a recording.
+        """
+
+        os.makedirs(self.folder, exist_ok=True)
+
+        with self._lock:
+            with open(
+                os.path.join(self.folder, self.INDEX), "a", encoding="utf-8"
+            ) as file:
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def annotate(self, session: str, turn: int, **fields) -> None:
+        """
+        Adds fields to the index record of a recording.
+
+        Args:
+            session (str): Id of the conversation session.
+            turn (int): Number of the recording in the session.
+            **fields: The fields, e.g. text="..." or score=80.
+        """
+
+        self.add_record({"session": session, "turn": turn, **fields})
+
+    def entries(self) -> list:
+        """
+        Reads the index.
+
+        Returns:
+            list: One dict per recording, with its annotations merged, oldest
+                  first.
+        """
+
+        records = {}
+        path = os.path.join(self.folder, self.INDEX)
+
+        if not os.path.exists(path):
+            return []
+
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A line cut by a crash
+                    continue
+
+                key = (record.get("session"), record.get("turn"))
+                records.setdefault(key, {}).update(record)
+
+        return list(records.values())
+
+    def shutdown(self, timeout: float = 3.0) -> None:
+        """
+        Waits for the recordings being written, e.g. before exiting.
+
+        Args:
+            timeout (float, optional): Maximum wait per recording, in seconds.
+                                    Defaults to 3.
+        """
+
+        for writer in self._writers:
+            writer.close()
+            writer.join(timeout)
+
+        self._writers = []
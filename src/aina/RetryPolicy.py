@@ -0,0 +1,143 @@
+import random
+import time
+
+
+class RetryPolicy:
+    """
+    Utility class to retry the steps of a turn that fail for transient
+    reasons (network blips, a server restarting...).
+
+    Each error code of `ErrorHandler` has its own number of attempts and
+    backoff. The delays grow exponentially and are fully jittered, so clients
+    retrying at the same time do not hit the server together.
+    """
+
+    # Error code: (attempts, first delay, longest delay), in seconds
+    POLICIES = {
+        1: (3, 1.0, 8.0),  # LLM request
+        2: (3, 0.5, 4.0),  # Text-to-speech
+        4: (2, 0.5, 2.0),  # Speech recognition
+    }
+
+    # Errors that would just happen again
+    PERMANENT_ERRORS = (
+        "UnknownValueError",  # Nothing intelligible in the recording
+        "FileNotFoundError",
+        "LookupError",
+        "ValueError",
+        "TypeError",
+        "KeyError",
+        "AttributeError",
+    )
+
+    @staticmethod
+    def attempts(error_status: int) -> int:
+        """
+        Returns how many times a step is tried.
+
+        Args:
+            error_status (int): The error code of the step.
+
+        Returns:
+            int: The number of attempts, 1 if it is not retried.
+        """
+
+        return RetryPolicy.POLICIES.get(error_status, (1, 0.0, 0.0))[0]
+
+    @staticmethod
+    def delay(error_status: int, attempt: int) -> float:
+        """
+        Returns how long to wait before trying a step again.
+
+        Args:
+            error_status (int): The error code of the step.
+            attempt (int): The attempt that failed, starting from 1.
+
+        Returns:
+            float: The delay in seconds, drawn between 0 and the backoff.
+        """
+
+        _, first, longest = RetryPolicy.POLICIES.get(error_status, (1, 0.0, 0.0))
+
+        return random.uniform(0.0, min(longest, first * 2 ** (attempt - 1)))
+
+    @staticmethod
+    def is_transient(error) -> bool:
+        """
+        Checks if an error may go away by trying again.
+
+        Args:
+            error (Exception | str): The error.
+
+        Returns:
+            bool: False for errors in `PERMANENT_ERRORS` (or subclasses).
+        """
+
+        if not isinstance(error, BaseException):
+            return True
+
+        names = {cls.__name__ for cls in type(error).__mro__}
+        return names.isdisjoint(RetryPolicy.PERMANENT_ERRORS)
+
+    @staticmethod
+    def run(error_status: int, function, *args, on_retry=None, should_stop=None):
+        """
+        Calls a function, trying it again on transient errors.
+
+        Args:
+            error_status (int): The error code of the step, which selects the
+                             policy.
+            function (Callable): The step.
+            *args: Its arguments.
+            on_retry (Callable, optional): Called with the error, the attempt
+                                        that failed and the number of
+                                        attempts before each new try.
+            should_stop (Callable, optional): Returns True to give up waiting,
+                                           e.g. when the user cancels.
+
+        Returns:
+            Any: The result of the function.
+
+        Raises:
+            Exception: The last error, once the attempts are exhausted, for
+                       permanent errors, or if stopped while waiting.
+        """
+
+        attempts = RetryPolicy.attempts(error_status)
+
+        for attempt in range(1, attempts + 1):
+            try:
+                return function(*args)
+            except Exception as e:
+                if attempt == attempts or not RetryPolicy.is_transient(e):
+                    raise
+
+                if on_retry is not None:
+                    on_retry(e, attempt, attempts)
+
+                if not RetryPolicy.sleep(
+                    RetryPolicy.delay(error_status, attempt), should_stop
+                ):
+                    raise
+
+    @staticmethod
+    def sleep(seconds: float, should_stop=None) -> bool:
+        """
+        Waits, checking often if the wait should be given up.
+
+        Args:
+            seconds (float): How long to wait.
+            should_stop (Callable, optional): Returns True to give up.
+
+        Returns:
+            bool: False if the wait was given up.
+        """
+
+        deadline = time.monotonic() + seconds
+
+        while time.monotonic() < deadline:
+            if should_stop is not None and should_stop():
+                return False
+            time.sleep(min(0.05, max(deadline - time.monotonic(), 0.0)))
+
+        return True
@@ -0,0 +1,55 @@
+from PySide6.QtCore import QThread, Signal
+
+
+class ScoreThread(QThread):
+    """
+    Threaded class to run the `score` function from `PronunciationScorer`.
+
+    This class runs in a separate thread to compare the learner's recording
+    with AIna's audio, avoiding locking the main thread during this process.
+    """
+
+    finished_signal = Signal(dict, int)
+
+    def __init__(self, pcm, samplerate: int, reference: dict | None) -> None:
+        """
+        Initializes the ScoreThread.
+
+        Args:
+            pcm (numpy.ndarray): The learner's recorded samples.
+            samplerate (int): Sample rate of the recording.
+            reference (dict): The AudioCache entry of AIna's sentence. None if
+                           it is not in the buffer anymore.
+        """
+
+        super().__init__()
+        self.pcm = pcm
+        self.samplerate = samplerate
+        self.reference = reference
+
+    def run(self) -> None:
+        """
+        Call `score` function from `PronunciationScorer` and send back to the
+        main thread the score and the sentence it was compared with.
+        """
+
+        try:
+            from .PronunciationScorer import PronunciationScorer
+
+            if self.reference is None:
+                raise LookupError("This audio is no longer in the replay buffer.")
+
+            result = PronunciationScorer.score(
+                self.pcm,
+                self.samplerate,
+                self.reference["pcm"],
+                self.reference["samplerate"],
+            )
+        except Exception as e:
+            self.finished_signal.emit({"error": e}, 6)
+            return
+
+        result["text"] = self.reference["text"]
+
+        # Emit the finished signal
+        self.finished_signal.emit(result, 0)
@@ -0,0 +1,157 @@
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from PySide6.QtGui import QTextDocument
+
+if TYPE_CHECKING:
+    from .AIna import AIna
+
+
+class SessionManager:
+    """
+    Conversations kept alive side by side, one per language and level.
+
+    Each session has its own id, model (prompt and history), chat log
+    document, pronunciation reference and count of recordings, so switching
+    the language or level swaps sessions instead of starting over. Sessions
+    are kept in least recently used order and the idle ones are evicted when
+    their estimated size goes over the limit, or when there are more sessions
+    than allowed.
+    """
+
+    # Rough memory cost of each character, in bytes: Python strings in the
+    # history, and a laid out QTextDocument in the log
+    HISTORY_CHAR_BYTES = 4
+    DOCUMENT_CHAR_BYTES = 64
+
+    def __init__(
+        self, max_bytes: int = 16 * 1024 * 1024, max_sessions: int = 4
+    ) -> None:
+        """
+        Initializes the SessionManager.
+
+        Args:
+            max_bytes (int, optional): Estimated size allowed for all the
+                                    sessions, in bytes. Defaults to 16 MB.
+            max_sessions (int, optional): Maximum number of sessions kept.
+                                       Defaults to 4.
+        """
+
+        self.max_bytes = max_bytes
+        self.max_sessions = max_sessions
+
+        self._sessions = OrderedDict()
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self._sessions
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, language: str, language_level: str) -> dict | None:
+        """
+        Returns a session and marks it as the most recently used.
+
+        Args:
+            language (str): The language code.
+            language_level (str): The language level.
+
+        Returns:
+            dict | None: The "id", "AIna", "document", "reference_audio_id" and
+                         "recordings" of the session, or None if there is none
+                         (or it was evicted).
+        """
+
+        key = (language, language_level)
+
+        if key not in self._sessions:
+            return None
+
+        self._sessions.move_to_end(key)
+        return self._sessions[key]
+
+    def put(
+        self,
+        AIna: "AIna",
+        document: QTextDocument,
+        reference_audio_id: int | None = None,
+    ) -> dict:
+        """
+        Stores a new session, replacing the one of the same language and
+        level, and evicts idle sessions if needed.
+
+        Args:
+            AIna (AIna): The model of the session.
+            document (QTextDocument): The chat log of the session.
+            reference_audio_id (int, optional): AIna's last sentence, for
+                                             pronunciation practice.
+
+        Returns:
+            dict: The session.
+        """
+
+        self.remove(AIna.language, AIna.language_level)
+
+        session = {
+            "id": time.strftime("%Y%m%d-%H%M%S")
+            + f"-{AIna.language}-{AIna.language_level}",
+            "AIna": AIna,
+            "document": document,
+            "reference_audio_id": reference_audio_id,
+            "recordings": 0,
+        }
+        self._sessions[(AIna.language, AIna.language_level)] = session
+
+        self.evict()
+        return session
+
+    def remove(self, language: str, language_level: str) -> None:
+        """
+        Drops a session and frees its chat log.
+
+        Args:
+            language (str): The language code.
+            language_level (str): The language level.
+        """
+
+        session = self._sessions.pop((language, language_level), None)
+
+        if session is not None:
+            session["document"].deleteLater()
+
+    @classmethod
+    def size(cls, session: dict) -> int:
+        """
+        Estimates the memory used by a session.
+
+        Args:
+            session (dict): The session.
+
+        Returns:
+            int: The estimated size, in bytes.
+        """
+
+        history_chars = sum(
+            len(message["content"]) for message in session["AIna"].history
+        )
+
+        return (
+            history_chars * cls.HISTORY_CHAR_BYTES
+            + session["document"].characterCount() * cls.DOCUMENT_CHAR_BYTES
+        )
+
+    def evict(self) -> None:
+        """
+        Drops the least recently used sessions while over the limits. The
+        most recent session, the one in use, is always kept.
+        """
+
+        total = sum(self.size(session) for session in self._sessions.values())
+
+        while len(self._sessions) > 1 and (
+            total > self.max_bytes or len(self._sessions) > self.max_sessions
+        ):
+            language, language_level = next(iter(self._sessions))
+            total -= self.size(self._sessions[(language, language_level)])
+            self.remove(language, language_level)
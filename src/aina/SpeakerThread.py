@@ -1,55 +1,98 @@
-import os
+import time
 
-import pygame
 from PySide6.QtCore import QThread, Signal, Slot
 
+from .AudioCache import init_mixer, time_stretch
+
 
 class SpeakerThread(QThread):
     """
-    Threaded class for playing audio files on speaker.
+    Threaded class for playing audio on speaker.
+
+    This class runs in a separate thread to play an already decoded audio from
+    the AudioCache on speaker. It supports asynchronous execution and can be
+    gracefully stopped via a connected Slot.
 
-    This class runs in a separate thread to load and play an audio on speaker.
-    It supports asynchronous execution and can be gracefully stopped via a connected Slot.
+    The audio is played at `rate` (0.5 to 1.5) with a pitch-preserving time
+    stretch of the decoded samples. When the rate changes during playback,
+    the rest of the audio is stretched again and continues from the same
+    point.
     """
 
+    MIN_RATE = 0.5
+    MAX_RATE = 1.5
+
     finished_signal = Signal(dict, int)
 
-    def __init__(self) -> None:
+    def __init__(self, audio: dict | None = None, rate: float = 1.0) -> None:
         """
         Initializes the SpeakerThread.
+
+        Args:
+            audio (dict, optional): The AudioCache entry to be played. None if
+                                 it is not in the buffer anymore.
+            rate (float, optional): The playback rate. Defaults to 1.0.
         """
 
         super().__init__()
 
-        self.BASE_DIR = os.environ.get("AINA_BASE_DIR")
+        self.audio = audio
+        self.set_rate(rate)
 
+        # Source frame, rate and start time of the part being played
+        self._segment = None
         self._should_stop = False
 
     def run(self) -> None:
         """
-        Runs the thread logic to load and play an audio on speaker.
+        Runs the thread logic to play an audio on speaker.
 
-        This method load and play an audio file using `pygame.mixer`.
+        This method plays the decoded samples using `pygame.mixer`, so it
+        starts instantly without reading or decoding any file.
         Executed when the thread starts.
         """
 
-        filename = os.path.join(self.BASE_DIR, "temp", "output.mp3")
-
         try:
-            # Initialize the mixer module
-            pygame.mixer.init()
-
-            # Load the MP3 file
-            pygame.mixer.music.load(filename)
-
-            # Play the MP3 file
-            pygame.mixer.music.play()
-
-            # Wait for the music to finish playing
-            while pygame.mixer.music.get_busy() and not self._should_stop:
-                pygame.time.Clock().tick(10)
-
-            pygame.mixer.music.unload()
+            import pygame
+            import pygame.sndarray
+
+            if self.audio is None:
+                raise LookupError("This audio is no longer in the replay buffer.")
+
+            # Initialize the mixer module (only done once)
+            init_mixer()
+
+            pcm = self.audio["pcm"]
+            channel = None
+            rate = None
+
+            # Wait for the sound to finish playing, restarting it from the
+            # current point when the rate changes
+            while not self._should_stop:
+                if self.rate != rate:
+                    rate = self.rate
+                    start = self.source_frame()
+                    samples = time_stretch(pcm[start:], rate)
+
+                    # The old part kept playing while stretching, skip it
+                    offset = int((self.source_frame() - start) / rate)
+                    start = self.source_frame()
+
+                    if channel is not None:
+                        channel.stop()
+                    if start >= len(pcm):
+                        break
+
+                    sound = pygame.sndarray.make_sound(samples[offset:])
+                    channel = sound.play()
+                    self._segment = (start, rate, time.monotonic())
+                elif not channel.get_busy():
+                    break
+
+                pygame.time.wait(20)
+
+            if channel is not None:
+                channel.stop()
         except Exception as e:
             self.finished_signal.emit({"error": e}, 3)
             return
@@ -57,6 +100,51 @@ class SpeakerThread(QThread):
         # Emit the finished signal
         self.finished_signal.emit({}, 0)
 
+    def source_frame(self) -> int:
+        """
+        Returns the frame of the original audio being played.
+
+        Returns:
+            int: The frame, 0 if playback has not started.
+        """
+
+        segment = self._segment
+
+        if segment is None:
+            return 0
+
+        start, rate, started_at = segment
+        played = (time.monotonic() - started_at) * rate
+
+        return start + int(played * self.audio["samplerate"])
+
+    def position(self) -> float:
+        """
+        Returns the playback position in the original audio, in seconds, so
+        the lip-sync follows any rate. Safe to call from the main thread.
+
+        Returns:
+            float: Seconds played so far, 0 if playback has not started.
+        """
+
+        if self._segment is None:
+            return 0.0
+
+        return self.source_frame() / self.audio["samplerate"]
+
+    @Slot(float)
+    def set_rate(self, rate: float) -> None:
+        """
+        Changes the playback rate, also during playback.
+
+        This Slot can be connected to external signals, like `stop`.
+
+        Args:
+            rate (float): The rate, clamped between `MIN_RATE` and `MAX_RATE`.
+        """
+
+        self.rate = min(max(rate, self.MIN_RATE), self.MAX_RATE)
+
     @Slot()
     def stop(self) -> None:
         """
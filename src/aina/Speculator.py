@@ -0,0 +1,249 @@
+import os
+import re
+from typing import TYPE_CHECKING
+
+from PySide6.QtCore import QObject, QTimer
+
+from .AudioCache import AudioCache
+from .AudioProcess import RecordingBuffer
+from .WorkerManager import WorkerManager
+
+# The workers are imported on first use, like in the main window
+if TYPE_CHECKING:
+    from .AIna import AIna
+
+
+class Speculator(QObject):
+    """
+    Starts AIna's answer while the user is still speaking.
+
+    During a recording, the audio so far is transcribed every `interval_ms`.
+    Once the partial transcript stays the same for two transcriptions in a
+    row, a GPTClient is started with it as the user message. When the final
+    message is sent, `take` hands over that answer if the text matches, so
+    the turn only waits for what is left of it; otherwise it is discarded and
+    the message is sent as usual.
+
+    This trades spare CPU/GPU (extra transcriptions and, sometimes, wasted
+    generations) for a lower perceived latency.
+    """
+
+    def __init__(
+        self,
+        workers: WorkerManager,
+        audio_cache: AudioCache,
+        temp_dir: str,
+        interval_ms: int = 800,
+        parent: QObject | None = None,
+    ) -> None:
+        """
+        Initializes the Speculator.
+
+        Args:
+            workers (WorkerManager): Where the threads are started.
+            audio_cache (AudioCache): Where the answer audio is stored.
+            temp_dir (str): Folder of the partial recording and answer files.
+            interval_ms (int, optional): Time between partial transcriptions.
+                                      Defaults to 800.
+            parent (QObject, optional): The parent object. Defaults to None.
+        """
+
+        super().__init__(parent)
+        self.workers = workers
+        self.audio_cache = audio_cache
+        self.partial_path = os.path.join(temp_dir, "partial.wav")
+        self.answer_path = os.path.join(temp_dir, "speculative.mp3")
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self._transcribe)
+
+        self.AIna = None
+        self.profile = None
+        self.recording = None
+        self.partial_thread = None
+        self.last_partial = None
+        self.speculation = None
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """
+        Returns the text without case, spaces or punctuation, which may change
+        between the partial and final transcripts of the same words.
+        """
+
+        return re.sub(r"[\W_]+", "", text.casefold())
+
+    def start(self, AIna: "AIna", profile: dict, recording: RecordingBuffer) -> None:
+        """
+        Starts transcribing a recording as it grows.
+
+        Args:
+            AIna (AIna): The model of the conversation.
+            profile (dict): The latency profile of the turn.
+            recording (RecordingBuffer): The microphone samples.
+        """
+
+        self.discard()
+        self.AIna = AIna
+        self.profile = profile
+        self.recording = recording
+        self.last_partial = None
+        self.timer.start()
+
+    def stop(self) -> None:
+        """
+        Stops transcribing, when the recording ends. A speculation already
+        started keeps running until `take` or `discard`.
+        """
+
+        self.timer.stop()
+        self.recording = None
+
+    def _transcribe(self) -> None:
+        """
+        Starts a SpeechThread on the audio recorded so far, unless the last
+        one is still running.
+        """
+
+        if (
+            self.recording is None
+            or self.workers.is_alive(self.partial_thread)
+            or self.recording.length < self.recording.samplerate // 2
+        ):
+            return
+
+        from .SpeechThread import SpeechThread
+
+        self.partial_thread = SpeechThread(
+            self.AIna.language,
+            self.profile["stt_backend"],
+            self.recording,
+            self.partial_path,
+            retry=False,
+        )
+        self.partial_thread.finished_signal.connect(self._transcribe_finished)
+        self.workers.start(self.partial_thread)
+
+    def _transcribe_finished(self, message: dict, error_status: int) -> None:
+        """
+        Callback function executed when a partial SpeechThread finishes.
+
+        Starts the speculation when the transcript did not change since the
+        previous one. Errors (e.g. silence) are ignored.
+
+        Args:
+            message (dict): The partial transcript.
+            error_status (int): The error number.
+        """
+
+        if error_status != 0 or self.recording is None:
+            return
+
+        text = message["message"]
+        stable = text == self.last_partial
+        self.last_partial = text
+
+        if (
+            stable
+            and text.strip()
+            and (
+                self.speculation is None
+                or self.normalize(self.speculation["text"]) != self.normalize(text)
+            )
+        ):
+            self._speculate(text)
+
+    def _speculate(self, text: str) -> None:
+        """
+        Starts a GPTClient with the partial transcript as the user message.
+
+        Args:
+            text (str): The partial transcript.
+        """
+
+        from .GPTClient import GPTClient
+
+        self.discard()
+
+        worker = GPTClient(
+            self.AIna,
+            self.profile,
+            self.audio_cache,
+            messages=[*self.AIna.history, {"role": "user", "content": text}],
+            filename=self.answer_path,
+        )
+        worker.speculation = {
+            "text": text,
+            "history": self.AIna.history,
+            "history_length": len(self.AIna.history),
+            "worker": worker,
+            "result": None,
+            "slot": None,
+        }
+        worker.finished_signal.connect(self._speculation_finished)
+
+        self.speculation = worker.speculation
+        self.workers.start(worker)
+
+    def _speculation_finished(self, message: dict, error_status: int) -> None:
+        """
+        Keeps the answer until it is taken, or hands it to the turn that took
+        the speculation while it was running.
+        """
+
+        speculation = self.sender().speculation
+
+        if speculation["slot"] is not None:
+            speculation["slot"](message, error_status)
+        else:
+            speculation["result"] = (message, error_status)
+
+    def take(self, text: str, history: list) -> dict | None:
+        """
+        Returns the speculation if it was made with the same text as the
+        message being sent, on the same conversation, and discards it
+        otherwise (e.g. if another message was sent while recording).
+
+        The caller must set the "slot" of a running speculation, which is
+        called with the GPTClient results; a finished one has its "result".
+
+        Args:
+            text (str): The message being sent.
+            history (list): The history of the conversation, with the message
+                         being sent as its last entry.
+
+        Returns:
+            dict | None: The "text", "history", "history_length", "worker",
+                         "result" and "slot" of the speculation, or None if
+                         there is none to use.
+        """
+
+        speculation = self.speculation
+        self.speculation = None
+
+        if speculation is None:
+            return None
+
+        if (
+            self.normalize(speculation["text"]) != self.normalize(text)
+            or speculation["history"] is not history
+            or speculation["history_length"] != len(history) - 1
+        ):
+            speculation["worker"].stop()
+            return None
+
+        # A canceled or failed speculation is just made again
+        if speculation["result"] is not None and speculation["result"][1] != 0:
+            return None
+
+        return speculation
+
+    def discard(self) -> None:
+        """
+        Cancels the current speculation, if any.
+        """
+
+        if self.speculation is not None:
+            self.speculation["worker"].stop()
+            self.speculation = None
@@ -1,7 +1,8 @@
 import os
+import time
 
-from gtts import gTTS
-import speech_recognition as sr
+from .AudioProcess import AudioProcess
+from .Cassette import Cassette
 
 
 class SpeechProcessor:
@@ -9,23 +10,79 @@ class SpeechProcessor:
     Utility class for processing text and audio files.
 
     This class has methods specialized in turn text into audio files and audio file to text.
+    The recognition and synthesis themselves run in the `AudioProcess` worker.
     """
 
+    # Optional packages of the local speech recognition backends, by module
+    # name and pip name
+    STT_PACKAGES = {
+        "whisper": {"whisper": "openai-whisper", "soundfile": "soundfile"},
+        "sphinx": {"pocketsphinx": "pocketsphinx"},
+    }
+
     @staticmethod
-    def speech_to_text(language: str = "en-US") -> None:
+    def check_stt_backend(language: str, backend: str) -> str | None:
         """
-        Converts spoken audio into text using the SpeechRecognition library.
+        Checks if a speech recognition backend can be used for a language.
 
-        Load an audio file and transcribes it into text using a speech recognition
-        engine (e.g., Google Speech Recognition).
+        The local backends need optional packages, and "sphinx" only has the
+        languages whose model is installed (SpeechRecognition bundles en-US).
 
         Args:
-            language (str, optional): The language code for the speech recognition
-                (e.g., "en-US" for English, "ja" for Japanese). Defaults to "en-US".
+            language (str): The language code for the speech recognition.
+            backend (str): The recognition engine, "google", "whisper" or
+                "sphinx".
+
+        Returns:
+            str | None: Why the backend cannot be used, or None if it can.
+        """
+
+        from importlib.util import find_spec
+
+        missing = [
+            package
+            for module, package in SpeechProcessor.STT_PACKAGES.get(
+                backend, {}
+            ).items()
+            if find_spec(module) is None
+        ]
+        if missing:
+            return (
+                f'The "{backend}" speech recognition needs the '
+                f"{' and '.join(missing)} "
+                f"{'packages' if len(missing) > 1 else 'package'} "
+                f"(pip install {' '.join(missing)})."
+            )
+
+        if backend == "sphinx":
+            models = os.path.join(
+                os.path.dirname(find_spec("speech_recognition").origin),
+                "pocketsphinx-data",
+            )
+            if not os.path.isdir(os.path.join(models, language)):
+                return (
+                    f'The "sphinx" speech recognition has no {language} model. '
+                    'Use "google" or "whisper" for this language.'
+                )
+
+        return None
+
+    @staticmethod
+    def recognize(filename: str, language: str, backend: str) -> str:
+        """
+        Transcribes a WAV file. Runs in the audio worker process.
+
+        Args:
+            filename (str): Path of the WAV file.
+            language (str): The language code for the speech recognition.
+            backend (str): The recognition engine, "google", "whisper" or
+                "sphinx".
+
+        Returns:
+            str: The transcribed text.
         """
 
-        BASE_DIR = os.environ.get("AINA_BASE_DIR")
-        filename = os.path.join(BASE_DIR, "temp", "input.wav")
+        import speech_recognition as sr
 
         r = sr.Recognizer()
 
@@ -33,12 +90,94 @@ class SpeechProcessor:
         with input_file as source:
             audio = r.record(source)
 
-        s = r.recognize_google(audio, language=language)
+        if backend == "whisper":
+            return r.recognize_whisper(audio, language=language.split("-")[0])
+        elif backend == "sphinx":
+            return r.recognize_sphinx(audio, language=language)
+        else:
+            return r.recognize_google(audio, language=language)
+
+    @staticmethod
+    def synthesize(text: str, language: str, backend: str, filename: str) -> None:
+        """
+        Synthesizes speech into an MP3 file. Runs in the audio worker process.
+
+        Args:
+            text (str): The text to be spoken.
+            language (str): The language code for the speech synthesis.
+            backend (str): The synthesis engine, "gtts" or "gtts_slow".
+            filename (str): Path of the MP3 file.
+        """
+
+        from gtts import gTTS
+
+        speech = gTTS(text=text, lang=language, slow=backend == "gtts_slow")
+        speech.save(filename)
+
+    @staticmethod
+    def speech_to_text(
+        language: str = "en-US", backend: str = "google", filename: str | None = None
+    ) -> None:
+        """
+        Converts spoken audio into text using the SpeechRecognition library.
+
+        Load an audio file and transcribes it into text using a speech recognition
+        engine (e.g., Google Speech Recognition).
+
+        Args:
+            language (str, optional): The language code for the speech recognition
+                (e.g., "en-US" for English, "ja" for Japanese). Defaults to "en-US".
+            backend (str, optional): The recognition engine, "google" (online),
+                "whisper" or "sphinx" (both local). Defaults to "google".
+            filename (str, optional): Path of the WAV file. Defaults to
+                "temp/input.wav".
+        """
+
+        cassette = Cassette.replaying()
+        if cassette is not None:
+            return cassette.replay_call("stt")["text"]
+
+        if filename is None:
+            BASE_DIR = os.environ.get("AINA_BASE_DIR")
+            filename = os.path.join(BASE_DIR, "temp", "input.wav")
+        start = time.monotonic()
+
+        cassette = Cassette.recording()
+
+        try:
+            problem = SpeechProcessor.check_stt_backend(language, backend)
+            if problem is not None:
+                raise ValueError(problem)
+
+            s = AudioProcess.run(
+                SpeechProcessor.recognize, filename, language, backend
+            )
+        except Exception as e:
+            if cassette is not None:
+                cassette.record(
+                    "stt",
+                    language=language,
+                    backend=backend,
+                    duration=time.monotonic() - start,
+                    error=str(e),
+                )
+            raise
+
+        if cassette is not None:
+            cassette.record(
+                "stt",
+                language=language,
+                backend=backend,
+                duration=time.monotonic() - start,
+                text=s,
+            )
 
         return s
 
     @staticmethod
-    def text_to_speech(text: str, language: str) -> None:
+    def text_to_speech(
+        text: str, language: str, backend: str = "gtts", filename: str | None = None
+    ) -> None:
         """
         Converts text into spoken audio using the gTTS library and saves it as an MP3 file.
 
@@ -49,11 +188,47 @@ class SpeechProcessor:
             text (str): The input text to be converted into speech.
             language (str): The language code for the speech synthesis
                 (e.g., "en" for English, "ja" for Japanese).
+            backend (str, optional): The synthesis engine, "gtts" or
+                "gtts_slow" (slower speech). Defaults to "gtts".
+            filename (str, optional): Path of the MP3 file. Defaults to
+                "temp/output.mp3".
         """
 
-        speech = gTTS(text=text, lang=language, slow=False)
-
-        BASE_DIR = os.environ.get("AINA_BASE_DIR")
-        filename = os.path.join(BASE_DIR, "temp", "output.mp3")
-
-        speech.save(filename)
+        if filename is None:
+            BASE_DIR = os.environ.get("AINA_BASE_DIR")
+            filename = os.path.join(BASE_DIR, "temp", "output.mp3")
+
+        cassette = Cassette.replaying()
+        if cassette is not None:
+            with open(filename, "wb") as file:
+                file.write(cassette.replay_call("tts")["audio"])
+            return
+
+        cassette = Cassette.recording()
+        start = time.monotonic()
+
+        try:
+            AudioProcess.run(
+                SpeechProcessor.synthesize, text, language, backend, filename
+            )
+        except Exception as e:
+            if cassette is not None:
+                cassette.record(
+                    "tts",
+                    text=text,
+                    language=language,
+                    duration=time.monotonic() - start,
+                    error=str(e),
+                )
+            raise
+
+        if cassette is not None:
+            with open(filename, "rb") as file:
+                audio = Cassette.encode_audio(file.read())
+            cassette.record(
+                "tts",
+                text=text,
+                language=language,
+                duration=time.monotonic() - start,
+                audio=audio,
+            )
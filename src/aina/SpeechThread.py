@@ -1,5 +1,7 @@
 from PySide6.QtCore import QThread, Signal
 
+from .AudioProcess import AudioProcess, RecordingBuffer
+from .RetryPolicy import RetryPolicy
 from .SpeechProcessor import SpeechProcessor
 
 
@@ -13,17 +15,39 @@ class SpeechThread(QThread):
 
     finished_signal = Signal(dict, int)
 
-    def __init__(self, language: str) -> None:
+    # Emitted before the transcription is tried again, see `GPTClient`
+    retry_signal = Signal(int, int, int, str)
+
+    def __init__(
+        self,
+        language: str,
+        backend: str = "google",
+        recording: RecordingBuffer | None = None,
+        filename: str | None = None,
+        retry: bool = True,
+    ) -> None:
         """
         Initializes the SpeechThread.
 
         Args:
             language (str): The language code for the speech recognition
                 (e.g., "en-US" for English, "ja" for Japanese).
+            backend (str, optional): The recognition engine. Defaults to
+                "google".
+            recording (RecordingBuffer, optional): The microphone samples, to
+                be written to `filename` first. Defaults to None (the file
+                is already written).
+            filename (str, optional): Path of the WAV file to be transcribed.
+            retry (bool, optional): Whether transient errors are retried, see
+                `RetryPolicy`. Defaults to True.
         """
 
         super().__init__()
         self.language = language
+        self.backend = backend
+        self.recording = recording
+        self.filename = filename
+        self.retry = retry
 
     def run(self) -> None:
         """
@@ -32,9 +56,29 @@ class SpeechThread(QThread):
         """
 
         try:
-            text = SpeechProcessor.speech_to_text(self.language)
+            if self.recording is not None:
+                with self.recording.lease() as descriptor:
+                    AudioProcess.write_wav(
+                        descriptor, self.filename, self.recording.samplerate
+                    )
+
+            if self.retry:
+                text = RetryPolicy.run(
+                    4,
+                    SpeechProcessor.speech_to_text,
+                    self.language,
+                    self.backend,
+                    self.filename,
+                    on_retry=lambda error, attempt, attempts: self.retry_signal.emit(
+                        4, attempt, attempts, str(error)
+                    ),
+                )
+            else:
+                text = SpeechProcessor.speech_to_text(
+                    self.language, self.backend, self.filename
+                )
         except Exception as e:
-            self.finished_signal.emit({"error": text}, 4)
+            self.finished_signal.emit({"error": e}, 4)
             return
 
         # Emit the finished signal
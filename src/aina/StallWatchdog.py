@@ -0,0 +1,171 @@
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from logging.handlers import RotatingFileHandler
+
+from PySide6.QtCore import QObject, QTimer
+
+logger = logging.getLogger(__name__)
+
+
+class StallWatchdog(QObject):
+    """
+    Finds what blocks the Qt event loop, e.g. file writes or heavy work done
+    in a callback of the main thread.
+
+    A heartbeat QTimer runs every `interval_ms` on the main thread. A helper
+    thread checks how late it is and, while it is late by `threshold_ms` or
+    more, samples the stack of the main thread with `sys._current_frames`.
+    When the heartbeat comes back, the stall is logged with its duration and
+    the stacks seen most, which point to the offending code.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: int = 200,
+        interval_ms: int = 50,
+        sample_ms: int = 10,
+        log_path: str | None = None,
+        parent: QObject | None = None,
+    ) -> None:
+        """
+        Initializes the StallWatchdog. Must be created on the main thread.
+
+        Args:
+            threshold_ms (int, optional): Lag of the event loop logged as a
+                                       stall. Defaults to 200.
+            interval_ms (int, optional): Period of the heartbeat. Defaults
+                                      to 50.
+            sample_ms (int, optional): Period of the checks and of the stack
+                                    samples. Defaults to 10.
+            log_path (str, optional): File where the stalls are logged, besides
+                                   the standard error. Defaults to None.
+            parent (QObject, optional): The parent object. Defaults to None.
+        """
+
+        super().__init__(parent)
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self.sample_period = sample_ms / 1000
+        self.stalls = 0
+
+        if log_path is not None:
+            os.makedirs(os.path.dirname(log_path) or ".", exist_ok=True)
+            handler = RotatingFileHandler(
+                log_path, maxBytes=1024 * 1024, backupCount=1, encoding="utf-8"
+            )
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            logger.addHandler(handler)
+
+        # A windowed executable has no standard error
+        if sys.stderr is not None:
+            logger.addHandler(logging.StreamHandler())
+
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+        self._main_thread_id = threading.get_ident()
+        self._beat_at = time.monotonic()
+        self._stop = threading.Event()
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self._beat)
+
+        self._thread = threading.Thread(
+            target=self._watch, name="StallWatchdog", daemon=True
+        )
+
+    def start(self) -> None:
+        """
+        Starts the heartbeat and the helper thread.
+        """
+
+        self._beat_at = time.monotonic()
+        self.timer.start()
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops watching.
+        """
+
+        self.timer.stop()
+        self._stop.set()
+
+        if self._thread.is_alive():
+            self._thread.join(1.0)
+
+    def _beat(self) -> None:
+        """
+        Heartbeat, on the main thread.
+        """
+
+        self._beat_at = time.monotonic()
+
+    def _watch(self) -> None:
+        """
+        Checks the heartbeat and samples the main thread while it is late.
+        Runs in the helper thread.
+        """
+
+        stalled_since = None
+        samples = Counter()
+        stacks = {}
+
+        while not self._stop.wait(self.sample_period):
+            beat_at = self._beat_at
+            lag = time.monotonic() - beat_at - self.interval
+
+            if lag >= self.threshold:
+                if stalled_since is None:
+                    stalled_since = beat_at
+
+                frame = sys._current_frames().get(self._main_thread_id)
+                if frame is not None:
+                    stack = traceback.extract_stack(frame)
+                    key = tuple((entry.filename, entry.lineno) for entry in stack)
+                    samples[key] += 1
+                    stacks.setdefault(key, stack)
+                    del frame
+
+            elif stalled_since is not None and beat_at != stalled_since:
+                self._report(beat_at - stalled_since - self.interval, samples, stacks)
+
+                stalled_since = None
+                samples = Counter()
+                stacks = {}
+
+    def _report(self, duration: float, samples: Counter, stacks: dict) -> None:
+        """
+        Logs a stall and the stacks where the main thread was blocked.
+
+        Args:
+            duration (float): How long the event loop was blocked, in seconds.
+            samples (Counter): Number of samples per stack.
+            stacks (dict): The stack (StackSummary) of each sample key.
+        """
+
+        self.stalls += 1
+        total = sum(samples.values())
+
+        lines = [f"Event loop blocked for {duration * 1000:.0f} ms"]
+
+        for key, count in samples.most_common(3):
+            stack = stacks[key]
+            where = stack[-1]
+            lines.append(
+                f"  ~{duration * 1000 * count / total:.0f} ms "
+                f"({count}/{total} samples) in {where.name} "
+                f"({os.path.basename(where.filename)}:{where.lineno}):"
+            )
+            lines.extend(
+                f"    {line}"
+                for line in "".join(traceback.format_list(stack[-6:])).splitlines()
+            )
+
+        logger.warning("\n".join(lines))
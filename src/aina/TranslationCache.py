@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+
+class TranslationCache:
+    """
+    Translations of AIna's messages, memoized by a hash of the message.
+
+    The key is a hash of the language of the message, the language of the
+    translation and the text, so the same message is only translated once,
+    even in another conversation or after a restart. The cache is kept in
+    memory and appended to a JSON Lines file in the config folder; the file
+    is rewritten with the newest `max_entries` when it grows past twice that.
+    """
+
+    def __init__(self, path: str, max_entries: int = 2000) -> None:
+        """
+        Initializes the TranslationCache, loading the saved translations.
+
+        Args:
+            path (str): Path of the JSON Lines file.
+            max_entries (int, optional): Translations kept. Defaults to 2000.
+        """
+
+        self.path = str(path)
+        self.max_entries = max_entries
+
+        self._entries = OrderedDict()
+        self._lines = 0
+
+        if os.path.exists(self.path):
+            self.load()
+
+    @staticmethod
+    def key(language: str, target_language: str, text: str) -> str:
+        """
+        Returns the key of a message.
+
+        Args:
+            language (str): The language code of the message.
+            target_language (str): The language of the translation.
+            text (str): The message. Differences in whitespace are ignored.
+
+        Returns:
+            str: The hash of the message, in hexadecimal.
+        """
+
+        # The same message as sent by the model and as shown in the log
+        text = " ".join(text.split())
+
+        return hashlib.sha256(
+            f"{language}\n{target_language}\n{text}".encode("utf-8")
+        ).hexdigest()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> str | None:
+        """
+        Returns a translation.
+
+        Args:
+            key (str): The key of the message, see `key`.
+
+        Returns:
+            str | None: The translation, or None if it is not cached.
+        """
+
+        return self._entries.get(key)
+
+    def put(self, key: str, translation: str) -> None:
+        """
+        Stores a translation and appends it to the file.
+
+        Args:
+            key (str): The key of the message, see `key`.
+            translation (str): The translation.
+        """
+
+        self._entries[key] = translation
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        if self._lines >= 2 * self.max_entries:
+            self.compact()
+            return
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(
+                json.dumps({"key": key, "translation": translation}, ensure_ascii=False)
+                + "\n"
+            )
+        self._lines += 1
+
+    def load(self) -> None:
+        """
+        Reads the saved translations. The latest line of a key wins.
+        """
+
+        with open(self.path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A line cut by a crash
+                    continue
+
+                self._entries[entry["key"]] = entry["translation"]
+                self._entries.move_to_end(entry["key"])
+                self._lines += 1
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def compact(self) -> None:
+        """
+        Rewrites the file with only the translations kept in memory.
+        """
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+        # Written aside and renamed, so a crash never loses the file
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            for key, translation in self._entries.items():
+                file.write(
+                    json.dumps(
+                        {"key": key, "translation": translation}, ensure_ascii=False
+                    )
+                    + "\n"
+                )
+        os.replace(temp_path, self.path)
+
+        self._lines = len(self._entries)
@@ -0,0 +1,109 @@
+from PySide6.QtCore import QThread, Signal, Slot
+
+from .EndpointPool import EndpointPool
+from .GPTClient import GPTClient
+
+
+class TranslationThread(QThread):
+    """
+    Threaded class to translate a message of AIna.
+
+    This class runs in a separate thread with its own request to the LLM
+    servers, outside of the conversation, so AIna's history is not changed
+    and her turn is not delayed.
+    """
+
+    finished_signal = Signal(dict, int)
+
+    def __init__(
+        self,
+        pool: EndpointPool,
+        prompt_path: str,
+        language: str,
+        target_language: str,
+        message: str,
+        profile: dict,
+    ) -> None:
+        """
+        Initializes the TranslationThread.
+
+        Args:
+            pool (EndpointPool): The LLM servers, shared with the GPTClient.
+            prompt_path (str): Path of the system prompt of the translation.
+            language (str): The language code of the message.
+            target_language (str): The language of the translation.
+            message (str): The message of AIna.
+            profile (dict): Latency profile with the model id.
+        """
+
+        super().__init__()
+        self.pool = pool
+        self.prompt_path = prompt_path
+        self.language = language
+        self.target_language = target_language
+        self.message = message
+        self.profile = profile
+
+        self._should_stop = False
+
+    def run(self) -> None:
+        """
+        Requests the translation and send it back to the main thread.
+        """
+
+        try:
+            with open(self.prompt_path, "r", encoding="utf-8") as file:
+                prompt = file.read()
+        except Exception as e:
+            self.finished_signal.emit({"error": e}, 5)
+            return
+
+        request = {
+            "model": self.profile.get("model", "model-identifier"),
+            "messages": [
+                {"role": "system", "content": prompt},
+                {
+                    "role": "user",
+                    "content": f"Language: {self.language}\n"
+                    f"Translate into: {self.target_language}\n"
+                    f"Message: {self.message}",
+                },
+            ],
+            "temperature": 0.2,
+            "max_tokens": 400,
+        }
+
+        try:
+            translation = GPTClient.complete(
+                self.pool, request, should_stop=lambda: self._should_stop
+            )
+        except Exception as e:
+            self.finished_signal.emit({"error": e}, 1)
+            return
+
+        if translation is None:
+            # Stopped
+            self.finished_signal.emit({}, -1)
+            return
+
+        translation = translation.strip()
+
+        if not translation:
+            self.finished_signal.emit(
+                {"error": ValueError("The model answer is empty")}, 1
+            )
+            return
+
+        # Emit the finished signal
+        self.finished_signal.emit({"translation": translation}, 0)
+
+    @Slot()
+    def stop(self) -> None:
+        """
+        Stops waiting for the translation, e.g. when the window closes.
+
+        This Slot can be connected to external signals to safely interrupt and stop
+        the thread's execution.
+        """
+
+        self._should_stop = True
@@ -0,0 +1,103 @@
+import re
+from collections import deque
+
+
+class TurnQueue:
+    """
+    Messages of the user sent while AIna is busy, waiting for the next turn.
+
+    The user can keep typing or speaking while AIna generates, synthesizes
+    and plays her answer. When the turn ends, the queued messages are
+    coalesced into the next user turn:
+
+    - Empty messages are ignored.
+    - A message repeating the last queued one (e.g. sent twice, or the same
+      words recorded again) is dropped.
+    - All the queued messages are joined into one turn, so AIna answers them
+      together instead of making the user sit through one round trip each,
+      up to `max_chars`. The messages past it wait for the following turn,
+      but the first one is always taken.
+    """
+
+    def __init__(self, max_chars: int = 500) -> None:
+        """
+        Initializes the TurnQueue.
+
+        Args:
+            max_chars (int, optional): Length up to which queued messages are
+                                    joined into one turn. Defaults to 500.
+        """
+
+        self.max_chars = max_chars
+        self._messages = deque()
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """
+        Returns the text without case, spaces or punctuation, to compare
+        messages that only differ in them.
+        """
+
+        return re.sub(r"[\W_]+", "", text.casefold())
+
+    def put(self, text: str) -> bool:
+        """
+        Queues a message.
+
+        Args:
+            text (str): The message.
+
+        Returns:
+            bool: False if it was dropped, being empty or a repetition.
+        """
+
+        text = text.strip()
+
+        if not text or (
+            self._messages
+            and self.normalize(self._messages[-1]) == self.normalize(text)
+        ):
+            return False
+
+        self._messages.append(text)
+        return True
+
+    def take(self) -> str | None:
+        """
+        Removes the messages of the next turn from the queue.
+
+        Returns:
+            str | None: The messages joined into one, or None if the queue is
+                        empty.
+        """
+
+        if not self._messages:
+            return None
+
+        taken = [self._messages.popleft()]
+        length = len(taken[0])
+
+        while (
+            self._messages
+            and length + 1 + len(self._messages[0]) <= self.max_chars
+        ):
+            taken.append(self._messages.popleft())
+            length += 1 + len(taken[-1])
+
+        return " ".join(taken)
+
+    def clear(self) -> list:
+        """
+        Empties the queue.
+
+        Returns:
+            list: The messages that were queued, oldest first.
+        """
+
+        messages = list(self._messages)
+        self._messages.clear()
+
+        return messages
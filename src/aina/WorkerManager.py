@@ -0,0 +1,92 @@
+from PySide6.QtCore import QObject, QThread, SignalInstance
+
+
+class WorkerManager(QObject):
+    """
+    Owns the worker threads of the application and releases them
+    deterministically.
+
+    Each started worker is referenced until its thread finishes. Then it is
+    dropped and scheduled for deletion with `deleteLater`, which also removes
+    its connection to the stop signal, so finished workers never pile up and a
+    worker is never destroyed while still running.
+    """
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        """
+        Initializes the WorkerManager.
+
+        Args:
+            parent (QObject, optional): The parent object. Defaults to None.
+        """
+
+        super().__init__(parent)
+        self._workers = set()
+
+    def start(
+        self, worker: QThread, stop_signal: SignalInstance | None = None
+    ) -> QThread:
+        """
+        Starts a worker and takes care of its lifecycle.
+
+        Args:
+            worker (QThread): The worker to start.
+            stop_signal (SignalInstance, optional): Signal connected to the
+                worker's `stop` Slot while it runs. Defaults to None.
+
+        Returns:
+            QThread: The started worker.
+        """
+
+        if stop_signal is not None:
+            stop_signal.connect(worker.stop)
+
+        worker.finished.connect(lambda: self._release(worker))
+        self._workers.add(worker)
+        worker.start()
+
+        return worker
+
+    def _release(self, worker: QThread) -> None:
+        """
+        Drops a finished worker.
+        """
+
+        self._workers.discard(worker)
+        worker.deleteLater()
+
+    def is_alive(self, worker: QThread | None) -> bool:
+        """
+        Checks if a worker was started here and has not finished yet.
+
+        Args:
+            worker (QThread | None): The worker to check.
+
+        Returns:
+            bool: True while the worker is running.
+        """
+
+        return worker is not None and worker in self._workers
+
+    def count(self) -> int:
+        """
+        Returns the number of workers still alive.
+        """
+
+        return len(self._workers)
+
+    def shutdown(self, timeout_ms: int = 3000) -> None:
+        """
+        Asks every worker to stop and waits for them to finish.
+
+        Args:
+            timeout_ms (int, optional): Maximum wait per worker, in
+                                     milliseconds. Defaults to 3000.
+        """
+
+        for worker in list(self._workers):
+            if hasattr(worker, "stop"):
+                worker.stop()
+
+        for worker in list(self._workers):
+            worker.wait(timeout_ms)
@@ -0,0 +1,242 @@
+import sys
+import time
+
+from .PreloadThread import HEAVY_MODULES, import_module_timed
+
+
+def report_import_times(modules: list[str] = HEAVY_MODULES) -> dict:
+    """
+    Imports the heavy modules one by one and prints the cost of each.
+
+    Each time is incremental: dependencies shared with a module imported
+    earlier are charged to that earlier module.
+
+    Args:
+        modules (list[str], optional): Modules to measure, in import order.
+                                    Defaults to `HEAVY_MODULES`.
+
+    Returns:
+        dict: Module name to import time in seconds (None if it failed).
+    """
+
+    timings = {}
+
+    for name in modules:
+        try:
+            timings[name] = import_module_timed(name)
+        except Exception as e:
+            timings[name] = None
+            print(f"{name:<28} failed: {e}", file=sys.stderr)
+
+    total = sum(t for t in timings.values() if t is not None)
+
+    for name, seconds in sorted(
+        timings.items(), key=lambda item: item[1] or 0, reverse=True
+    ):
+        if seconds is not None:
+            print(f"{name:<28} {seconds * 1000:9.1f} ms")
+    print(f"{'total':<28} {total * 1000:9.1f} ms")
+
+    return timings
+
+
+def check_startup_budget(app, window, start_time: float, budget: float) -> int:
+    """
+    Measures the cold start, from process start until the main window has been
+    shown and painted, and compares it with a budget.
+
+    Intended to run in CI (e.g. with `QT_QPA_PLATFORM=offscreen`) as a startup
+    time regression check.
+
+    Args:
+        app (QApplication): The running application.
+        window (QMainWindow): The main window, already shown.
+        start_time (float): `time.perf_counter()` taken at process start.
+        budget (float): Maximum allowed startup time in seconds.
+
+    Returns:
+        int: Process exit code, 0 if within budget and 1 otherwise.
+    """
+
+    # Checked before processing events, which also starts the preload
+    heavy_loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+
+    app.processEvents()
+    elapsed = time.perf_counter() - start_time
+
+    print(f"Startup time: {elapsed * 1000:.1f} ms (budget {budget * 1000:.0f} ms)")
+    if heavy_loaded:
+        print("Heavy modules imported before the window showed:")
+        for name in heavy_loaded:
+            print(f"  {name}")
+
+    window.close()
+
+    window.workers.shutdown()
+
+    return 0 if elapsed <= budget else 1
+
+
+def process_usage() -> dict:
+    """
+    Samples the resource usage of the process.
+
+    Returns:
+        dict: Resident memory in MB ("rss_mb"), number of OS threads
+              ("threads") and open file descriptors ("fds", None where it
+              can't be measured).
+    """
+
+    import os
+    import threading
+
+    try:
+        with open("/proc/self/statm") as file:
+            rss_pages = int(file.read().split()[1])
+        rss_mb = rss_pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+        threads = len(os.listdir("/proc/self/task"))
+        fds = len(os.listdir("/proc/self/fd"))
+    except OSError:
+        import resource
+
+        # Peak instead of current memory outside Linux
+        rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        threads = threading.active_count()
+        fds = None
+
+    return {"rss_mb": rss_mb, "threads": threads, "fds": fds}
+
+
+def run_soak(
+    turns: int = 2000,
+    samples: int = 10,
+    max_rss_growth_mb: float = 30.0,
+    max_thread_growth: int = 2,
+    max_fd_growth: int = 5,
+) -> int:
+    """
+    Runs thousands of conversation turns headless and checks that memory,
+    threads and file descriptors stay flat.
+
+    The real window, worker threads and audio playback are used, but the LLM
+    stream, the text to speech and the MP3 decoding are mocked, and the audio
+    output goes to SDL's dummy driver. Usage is sampled along the run and the
+    last sample is compared with the first one taken after a warm-up.
+
+    Args:
+        turns (int, optional): Number of turns. Defaults to 2000.
+        samples (int, optional): Number of usage samples. Defaults to 10.
+        max_rss_growth_mb (float, optional): Allowed memory growth, in MB.
+                                          Defaults to 30.
+        max_thread_growth (int, optional): Allowed extra threads. Defaults
+                                        to 2.
+        max_fd_growth (int, optional): Allowed extra file descriptors.
+                                    Defaults to 5.
+
+    Returns:
+        int: Process exit code, 0 if the usage stayed flat and 1 otherwise.
+    """
+
+    import os
+    from unittest import mock
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    import numpy as np
+    from PySide6.QtCore import QTimer
+    from PySide6.QtWidgets import QApplication
+
+    from .AudioProcess import AudioProcess
+    from .GPTClient import GPTClient
+    from .HealthMonitor import HealthMonitor
+    from .main_window import MainWindow
+    from .startup import DEFAULT_CONFIG
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    # 10 ms of silence in the mixer format
+    silence = np.zeros((441, 2), dtype=np.int16)
+
+    def fake_stream(endpoint, request):
+        yield from ("Sure, ", "let's ", "keep ", "talking.")
+
+    # Plain functions rather than Mocks, which would record every call
+    patches = [
+        mock.patch.object(GPTClient, "stream_completion", staticmethod(fake_stream)),
+        mock.patch(
+            "src.aina.GPTClient.SpeechProcessor.text_to_speech",
+            staticmethod(lambda text, language, backend="gtts", filename=None: None),
+        ),
+        mock.patch.object(
+            AudioProcess, "decode_audio_file", lambda filename: silence
+        ),
+        mock.patch.object(HealthMonitor, "probe", lambda self, url: ["soak"]),
+        mock.patch("src.aina.main_window.save_config", lambda *args: None),
+    ]
+    for patch in patches:
+        patch.start()
+
+    config = {**DEFAULT_CONFIG, "profiles": dict(DEFAULT_CONFIG["profiles"])}
+    window = MainWindow(config)
+    window.show()
+
+    state = {"turn": 0}
+    usage = []
+    sample_every = max(turns // samples, 1)
+
+    def step():
+        if window.is_processing or window.workers.is_alive(window.worker_thread):
+            return
+
+        if state["turn"] % sample_every == 0:
+            usage.append((state["turn"], process_usage()))
+
+        if state["turn"] >= turns:
+            timer.stop()
+            app.quit()
+            return
+
+        state["turn"] += 1
+
+        if window.AIna is None:
+            window.initialize_model()
+        else:
+            window.input_field.setText(f"Turn number {state['turn']}")
+            window.send_message()
+
+    timer = QTimer()
+    timer.timeout.connect(step)
+    timer.start(1)
+    app.exec()
+
+    window.close()
+
+    print(f"{'turn':>8} {'rss (MB)':>10} {'threads':>8} {'fds':>6}")
+    for turn, sample in usage:
+        print(
+            f"{turn:>8} {sample['rss_mb']:>10.1f} {sample['threads']:>8} "
+            f"{sample['fds'] if sample['fds'] is not None else '-':>6}"
+        )
+
+    # Skip the warm-up (imports, caches filling up)
+    baseline = usage[min(1, len(usage) - 1)][1]
+    last = usage[-1][1]
+
+    failures = []
+    if last["rss_mb"] - baseline["rss_mb"] > max_rss_growth_mb:
+        failures.append("memory")
+    if last["threads"] - baseline["threads"] > max_thread_growth:
+        failures.append("threads")
+    if (
+        last["fds"] is not None
+        and last["fds"] - baseline["fds"] > max_fd_growth
+    ):
+        failures.append("file descriptors")
+
+    if failures:
+        print(f"Soak test failed, growing: {', '.join(failures)}")
+        return 1
+
+    print(f"Soak test passed ({turns} turns)")
+    return 0
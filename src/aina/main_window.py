@@ -1,8 +1,6 @@
 import os
-import sys
+from typing import TYPE_CHECKING
 
-import numpy as np
-import sounddevice as sd
 from PySide6.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -12,27 +10,50 @@ from PySide6.QtWidgets import (
     QLabel,
     QHBoxLayout,
     QFormLayout,
-    QTextEdit,
     QFrame,
     QSizePolicy,
-    QTextEdit,
     QComboBox,
+    QDialog,
     QCheckBox,
+    QSlider,
     QStatusBar,
+    QMessageBox,
 )
-from PySide6.QtGui import QPixmap, QTextCursor, QAction, QKeyEvent
-from PySide6.QtCore import Qt, Signal
-import qdarktheme
-import wavio
+from PySide6.QtGui import QTextCursor, QAction, QKeyEvent, QCloseEvent
+from PySide6.QtCore import Qt, Signal, QTimer
 
 from .ErrorHandler import ErrorHandler
-from .AIna import AIna
 from .AnimatedButton import AnimatedButton
-from .GPTClient import GPTClient
-from .SpeakerThread import SpeakerThread
-from .SpeechThread import SpeechThread
-from .startup import get_config_path, save_config, load_config
+from .AssetRegistry import AssetRegistry
+from .AudioCache import (
+    ENVELOPE_FRAME_MS,
+    AudioCache,
+    configure_mixer,
+    release_mixer,
+)
+from .AudioProcess import AudioProcess, RecordingBuffer
+from .Cassette import Cassette
+from .ChatLog import ChatLog
+from .Dictionary import Dictionary
+from .LevelMeter import LevelMeter
+from .EndpointPool import EndpointPool
+from .GreetingPool import GreetingPool
+from .Portrait import Portrait
+from .PreloadThread import PreloadThread
+from .RecordingArchive import RecordingArchive
+from .SessionManager import SessionManager
+from .Speculator import Speculator
+from .startup import get_config_path, get_profile, save_config, load_config
 from .StylishLineEdit import StylishLineEdit
+from .TranslationCache import TranslationCache
+from .TurnQueue import TurnQueue
+from .WorkerManager import WorkerManager
+
+# Heavy subsystems (numpy, sounddevice, openai, pygame, gTTS...) are imported
+# lazily on first use, or preloaded by `PreloadThread` after the window shows.
+if TYPE_CHECKING:
+    from .AIna import AIna
+    from .LearnerStats import LearnerStats
 
 
 # Get the absolute path of the directory where the script is located
@@ -43,6 +64,9 @@ BASE_DIR = os.path.dirname(
 # Path of the config values
 CONFIG_PATH = get_config_path("AIna")
 
+# Cached icons, images and stylesheets
+ASSETS = AssetRegistry(BASE_DIR)
+
 
 class MainWindow(QMainWindow):
     """
@@ -56,6 +80,9 @@ class MainWindow(QMainWindow):
     # Slot to connect to the thread to send signals from this class to the worker thread
     stop_worker_signal = Signal()
 
+    # Changes the speed of the message being played
+    playback_rate_signal = Signal(float)
+
     def __init__(self, config: dict):
         """
         Initialize the UI class
@@ -73,6 +100,105 @@ class MainWindow(QMainWindow):
         if not os.path.isdir(os.path.join(BASE_DIR, "temp")):
             os.makedirs(os.path.join(BASE_DIR, "temp"))
 
+        # Warm up the heavy modules once the event loop is running
+        QTimer.singleShot(0, self.start_preload)
+
+    def start_preload(self) -> None:
+        """
+        Starts the PreloadThread to import the heavy subsystems in the
+        background, so the first turn does not pay for them.
+        """
+
+        from .HealthMonitor import HealthMonitor
+
+        self.preload_thread = self.workers.start(PreloadThread())
+
+        # Spawning the audio worker process takes a while, do it now
+        AudioProcess.start()
+
+        self.health_monitor = HealthMonitor(self.endpoint_pool)
+        self.health_monitor.status_signal.connect(self.update_backend_status)
+        self.health_monitor.start()
+
+    def update_backend_status(self, online: bool, models: list) -> None:
+        """
+        Callback function executed after each probe of the HealthMonitor.
+
+        Args:
+            online (bool): Whether any LLM server answered.
+            models (list): Ids of the models loaded in the first server up.
+        """
+
+        came_online = online and not self.backend_online
+        self.backend_online = online
+        self.backend_status.setToolTip(self.format_endpoint_stats())
+
+        if came_online:
+            self.refill_greetings()
+
+        if online:
+            model_name = models[0] if models else "no model loaded"
+            self.backend_status.setText(
+                f'LLM: <span style="color:green;"><b>Online</b></span> ({model_name})'
+            )
+        else:
+            self.backend_status.setText(
+                'LLM: <span style="color:red;"><b>Offline</b></span>'
+            )
+
+    def check_backend(self) -> bool:
+        """
+        Checks if a turn can be started. When the LLM server is known to be
+        down, the turn is refused right away instead of waiting for the request
+        to time out.
+
+        Returns:
+            bool: True if the server is reachable (or not probed yet).
+        """
+
+        if self.backend_online is False and Cassette.replaying() is None:
+            self.statusBar().showMessage(
+                "No LLM server is reachable. Make sure it is running.", 5000
+            )
+            self.health_monitor.probe_now()
+            return False
+
+        return True
+
+    def format_endpoint_stats(self) -> str:
+        """
+        Formats the statistics of each LLM endpoint as text.
+
+        Returns:
+            str: One line per endpoint.
+        """
+
+        lines = []
+
+        for stats in self.endpoint_pool.stats():
+            latency = (
+                f"{stats['latency'] * 1000:.0f} ms"
+                if stats["latency"] is not None
+                else "n/a"
+            )
+            state = "up" if stats["available"] else "down"
+            lines.append(
+                f"{stats['url']}: {state}, {stats['outstanding']} in flight, "
+                f"{stats['requests']} requests, {stats['errors']} errors, "
+                f"latency {latency}"
+            )
+
+        return "\n".join(lines)
+
+    def show_endpoint_stats(self) -> None:
+        """
+        Shows the statistics of each LLM endpoint in a dialog.
+        """
+
+        QMessageBox.information(
+            self, "LLM Endpoints", self.format_endpoint_stats()
+        )
+
     def init_ui(self) -> None:
         """
         Initializes the user interface and configures initial settings.
@@ -89,11 +215,13 @@ class MainWindow(QMainWindow):
 
         os.environ["AINA_BASE_DIR"] = BASE_DIR
 
-        mic_path = get_asset_path("mic.png", "icons")
-        image_path = get_asset_path("AIna.png", "images")
-        send_path = get_asset_path("send.png", "icons")
-        self.repeat_path = get_asset_path("repeat.png", "icons")
-        self.stop_path = get_asset_path("stop.png", "icons")
+        mic_icon = ASSETS.icon("mic.png")
+        send_icon = ASSETS.icon("send.png")
+        self.repeat_icon = ASSETS.icon("repeat.png")
+        self.stop_icon = ASSETS.icon("stop.png")
+
+        # Both themes are built now, so switching later is instant
+        ASSETS.preload_stylesheets()
 
         # Setting a central widget to the MainWindow
         central_widget = QWidget(self)
@@ -133,6 +261,14 @@ class MainWindow(QMainWindow):
         # Add the QComboBox to the form layout with a label
         config_layout.addRow("Language level:", self.language_level_combo_box)
 
+        # Swap to the conversation of the language and level selected
+        self.language_combo_box.currentTextChanged.connect(
+            lambda _: self.change_session()
+        )
+        self.language_level_combo_box.currentTextChanged.connect(
+            lambda _: self.change_session()
+        )
+
         # Create the Auto-send checkbox
         self.auto_send_checkbox = QCheckBox("Auto-send")
         self.auto_send_checkbox.setToolTip(
@@ -141,6 +277,84 @@ class MainWindow(QMainWindow):
         self.auto_send_checkbox.setChecked(self.config["auto_send"])
         config_layout.addRow(self.auto_send_checkbox)
 
+        # Create the pronunciation practice checkbox
+        self.practice_checkbox = QCheckBox("Pronunciation practice")
+        self.practice_checkbox.setToolTip(
+            "Score your recording against the last sentence AIna said, "
+            "instead of sending it"
+        )
+        self.practice_checkbox.setChecked(self.config["pronunciation_practice"])
+        self.practice_checkbox.toggled.connect(self.save_config)
+        config_layout.addRow(self.practice_checkbox)
+
+        # Create the recording archive checkbox
+        self.archive_checkbox = QCheckBox("Archive recordings")
+        self.archive_checkbox.setToolTip(
+            "Keep your recordings as compressed files, by session and turn, "
+            "to review your progress"
+        )
+        self.archive_checkbox.setChecked(self.config["archive_recordings"])
+        self.archive_checkbox.toggled.connect(self.toggle_archive)
+        config_layout.addRow(self.archive_checkbox)
+
+        # Create the grammar correction checkbox
+        self.correction_checkbox = QCheckBox("Grammar corrections")
+        self.correction_checkbox.setToolTip(
+            "Show a correction under each of your messages. It is checked "
+            "while AIna answers, without delaying her"
+        )
+        self.correction_checkbox.setChecked(self.config["grammar_correction"])
+        self.correction_checkbox.toggled.connect(self.save_config)
+        config_layout.addRow(self.correction_checkbox)
+
+        # Create the speculative answers checkbox
+        self.speculative_checkbox = QCheckBox("Speculative answers")
+        self.speculative_checkbox.setToolTip(
+            "Start AIna's answer while you are still speaking. Faster replies, "
+            "but uses more CPU/GPU"
+        )
+        self.speculative_checkbox.setChecked(self.config["speculative_generation"])
+        self.speculative_checkbox.toggled.connect(self.save_config)
+        config_layout.addRow(self.speculative_checkbox)
+
+        # Create and populate the latency profile QComboBox. It can be changed
+        # at any time and applies from the next turn on.
+        self.profile_combo_box = QComboBox()
+        self.profile_combo_box.addItems(list(self.config["profiles"]))
+        self.profile_combo_box.setToolTip(
+            "Trade AIna's answer length for speed"
+        )
+        index = self.profile_combo_box.findText(
+            self.config["profile"], Qt.MatchFixedString
+        )
+        self.profile_combo_box.setCurrentIndex(max(index, 0))
+        self.profile_combo_box.currentTextChanged.connect(self.change_profile)
+        self.profile = get_profile(
+            self.config, self.profile_combo_box.currentText()
+        )
+        config_layout.addRow("Latency profile:", self.profile_combo_box)
+
+        # Create the playback speed slider, in tenths. It also applies to the
+        # message being played.
+        self.speed_slider = QSlider(Qt.Orientation.Horizontal)
+        self.speed_slider.setRange(5, 15)
+        self.speed_slider.setPageStep(1)
+        self.speed_slider.setValue(round(self.config["playback_rate"] * 10))
+        self.speed_slider.setToolTip(
+            "Make AIna speak slower or faster, without changing her voice"
+        )
+        self.speed_label = QLabel()
+
+        # Saves the speed once the slider stops moving, not on every step
+        self.playback_rate_timer = QTimer(self)
+        self.playback_rate_timer.setSingleShot(True)
+        self.playback_rate_timer.setInterval(500)
+        self.playback_rate_timer.timeout.connect(self.save_config)
+
+        self.speed_slider.valueChanged.connect(self.change_playback_rate)
+        self.change_playback_rate(self.speed_slider.value(), save=False)
+        config_layout.addRow(self.speed_label, self.speed_slider)
+
         # Create the Initialize button
         self.initialize_button = QPushButton("Initialize AIna")
         self.initialize_button.pressed.connect(self.initialize_model)
@@ -158,13 +372,10 @@ class MainWindow(QMainWindow):
         )
 
         # Center Panel: Image and Button
-        image_label = QLabel()
-        pixmap = QPixmap(image_path)  # Replace with your image path
-        image_label.setPixmap(pixmap)
-        image_label.setScaledContents(True)
+        self.portrait = Portrait(ASSETS, fps=self.config["animation_fps"])
 
         # Create the animated microphone button
-        self.record_button = AnimatedButton(mic_path)
+        self.record_button = AnimatedButton(mic_icon)
         self.record_button.pressed.connect(self.start_recording)
         self.record_button.released.connect(self.stop_recording)
         self.record_button.setToolTip(
@@ -172,19 +383,28 @@ class MainWindow(QMainWindow):
         )
         self.record_button.setEnabled(False)
 
+        # Live level meter fed by the recording callback
+        self.level_meter = LevelMeter()
+
+        record_layout = QHBoxLayout()
+        record_layout.addStretch()
+        record_layout.addWidget(self.record_button)
+        record_layout.addWidget(self.level_meter)
+        record_layout.addStretch()
+
         # Input field and send button
         self.input_field = StylishLineEdit("Your message")
         self.input_field.textChanged.connect(self.toggle_button_state)
 
         # Create the animated send button
-        self.send_button = AnimatedButton(send_path)
+        self.send_button = AnimatedButton(send_icon)
         self.send_button.clicked.connect(self.send_message)
         self.send_button.setToolTip("Send message to AIna")
         self.send_button.setEnabled(False)
 
         # Create the animated microphone button
         self.repeat_button = AnimatedButton(
-            icon_path=self.repeat_path, icon_size=16, size=30, colorless=True
+            icon=self.repeat_icon, icon_size=16, size=30, colorless=True
         )
         self.repeat_button.clicked.connect(self.handle_repeat_button)
         self.repeat_button.setToolTip(
@@ -199,10 +419,8 @@ class MainWindow(QMainWindow):
         input_layout.addWidget(self.repeat_button)
 
         center_layout = QVBoxLayout()
-        center_layout.addWidget(image_label)
-        center_layout.addWidget(
-            self.record_button, alignment=Qt.AlignmentFlag.AlignCenter
-        )
+        center_layout.addWidget(self.portrait)
+        center_layout.addLayout(record_layout)
         center_layout.addLayout(input_layout)
         center_frame = QFrame()
         center_frame.setLayout(center_layout)
@@ -213,9 +431,15 @@ class MainWindow(QMainWindow):
         )
 
         # Right Panel: Log
-        self.log_text_edit = QTextEdit()
+        self.log_text_edit = ChatLog()
         self.log_text_edit.setReadOnly(True)
         self.log_text_edit.setFontPointSize(16)
+        self.log_text_edit.setToolTip(
+            "Click on AIna's messages to hear them again, right-click them to "
+            "translate them, hover a word to look it up"
+        )
+        self.log_text_edit.replay_requested.connect(self.replay_message)
+        self.log_text_edit.translation_requested.connect(self.translate_message)
         log_frame = QFrame()
         log_frame.setLayout(QVBoxLayout())
         log_frame.layout().addWidget(self.log_text_edit)
@@ -251,6 +475,21 @@ class MainWindow(QMainWindow):
         view_menu.addAction(light_theme_action)
         view_menu.addAction(dark_theme_action)
 
+        # Per-endpoint latency and error statistics
+        endpoint_stats_action = QAction("LLM Endpoints...", self)
+        endpoint_stats_action.triggered.connect(self.show_endpoint_stats)
+        view_menu.addAction(endpoint_stats_action)
+
+        # Word and mistake statistics of the learner
+        learner_stats_action = QAction("Learning Statistics...", self)
+        learner_stats_action.triggered.connect(self.show_learner_stats)
+        view_menu.addAction(learner_stats_action)
+
+        # Audio devices, buffers and their latency calibration
+        audio_settings_action = QAction("Audio Settings...", self)
+        audio_settings_action.triggered.connect(self.show_audio_settings)
+        view_menu.addAction(audio_settings_action)
+
         # Status bar
         status_bar = QStatusBar()
         self.setStatusBar(status_bar)
@@ -261,6 +500,11 @@ class MainWindow(QMainWindow):
         )
         status_bar.addPermanentWidget(self.status_message)
 
+        # Reachability of the LLM server, updated by the HealthMonitor
+        self.backend_status = QLabel()
+        self.backend_status.setText("LLM: <b>Checking...</b>")
+        status_bar.addPermanentWidget(self.backend_status)
+
         # Link to a external site
         site_link = QLabel(
             'Developed by: <a href="https://mmuramatsu.com">mmuramatsu</a>'
@@ -269,14 +513,93 @@ class MainWindow(QMainWindow):
         status_bar.addPermanentWidget(site_link)
 
         # Recording variables
-        self.samplerate = 44100
+        self.samplerate = self.config["samplerate"]
         self.channels = 1
         self.recording = False
-        self.frames = []
+        self.recording_buffer = None
+
+        # Grows the recording buffer ahead of time, out of the audio callback
+        self.recording_timer = QTimer(self)
+        self.recording_timer.setInterval(1000)
+        self.recording_timer.timeout.connect(self.reserve_recording)
+
+        # AIna's audio used as reference in pronunciation practice
+        self.reference_audio_id = None
 
         self.auto_send = False
         self.AIna = None
 
+        # Output device and buffer of AIna's voice
+        configure_mixer(self.config["output_buffer"], self.config["output_device"])
+
+        # Decoded audio of AIna's last messages, for instant replays
+        self.audio_cache = AudioCache(
+            self.config["replay_buffer_mb"] * 1024 * 1024,
+            self.config["replay_buffer_size"],
+        )
+
+        # Load balancer for the LLM servers
+        self.endpoint_pool = EndpointPool(
+            self.config["llm_endpoints"],
+            self.config["llm_routing"],
+            timeout=self.config["llm_timeout"],
+        )
+
+        # Memory-mapped word lookup dictionaries, opened per language
+        self.dictionaries = {}
+
+        # Word and mistake statistics of the learner, loaded per language
+        self.learner_stats = {}
+
+        # Recordings kept for review, and the one being archived
+        self.archive = RecordingArchive(str(CONFIG_PATH.parent / "recordings"))
+        self.archive_writer = None
+        self.archive_key = None
+
+        # Conversations of the other languages and levels, kept alive
+        self.sessions = SessionManager(
+            self.config["session_memory_mb"] * 1024 * 1024,
+            self.config["max_sessions"],
+        )
+
+        # Greetings made ahead of time, refilled in the background
+        self.greeting_pool = GreetingPool(
+            CONFIG_PATH.parent / "greetings", self.config["greeting_pool_size"]
+        )
+        self.greeting_thread = None
+
+        # Grammar check of the last message of the user
+        self.correction_thread = None
+
+        # Translations of AIna's messages, and the ones being requested
+        self.translations = TranslationCache(
+            CONFIG_PATH.parent / "translations.jsonl"
+        )
+        self.translation_threads = {}
+
+        # Messages sent while AIna is busy, and the transcription of the
+        # recordings, which may run during her turn
+        self.turn_queue = TurnQueue(self.config["turn_queue_max_chars"])
+        self.speech_thread = None
+        self.transcribing = False
+
+        # Worker threads, released as soon as they finish
+        self.workers = WorkerManager(self)
+        self.worker_thread = None
+
+        # Answers started from the partial transcripts of a recording
+        self.speculator = Speculator(
+            self.workers,
+            self.audio_cache,
+            os.path.join(BASE_DIR, "temp"),
+            self.config["speculative_interval_ms"],
+            self,
+        )
+
+        # None until the first probe of the LLM servers finishes
+        self.backend_online = None
+        self.health_monitor = None
+
         # Control variables
         self.is_processing = False
         self.log_add_flag = False
@@ -286,24 +609,16 @@ class MainWindow(QMainWindow):
 
     def apply_theme(self, theme_name: str) -> None:
         """
-        Applies the specified theme by loading and setting the QSS stylesheet.
+        Applies the specified theme by setting its QSS stylesheet.
 
-        Loads the corresponding `.qss` file based on the theme name and updates
-        the application's appearance accordingly.
+        The combined stylesheet (base theme plus the custom `.qss` file) comes
+        from the asset cache, so no file is read here.
 
         Args:
             theme_name (str): The name of the theme to load ('light' or 'dark').
         """
 
-        # Load the base theme stylesheet
-        base_stylesheet = qdarktheme.load_stylesheet(theme_name)
-
-        qss_path = get_asset_path(f"{theme_name}.qss", "styles")
-        with open(qss_path, "r") as file:
-            custom_stylesheet = file.read()
-
-        # Combine and apply the stylesheets
-        self.setStyleSheet(base_stylesheet + custom_stylesheet)
+        self.setStyleSheet(ASSETS.stylesheet(theme_name))
 
     def toggle_theme(self, theme_name: str) -> None:
         """
@@ -345,47 +660,467 @@ class MainWindow(QMainWindow):
 
             self.save_config()
 
+    def change_profile(self, profile_name: str) -> None:
+        """
+        Switches the latency profile. The conversation is kept as is; the new
+        settings are used from the next request on.
+
+        Args:
+            profile_name (str): The name of the selected profile.
+        """
+
+        self.profile = get_profile(self.config, profile_name)
+        self.save_config()
+        self.check_stt_backend()
+
+    def check_stt_backend(self) -> None:
+        """
+        Warns if the speech recognition of the latency profile cannot be used
+        for the language of the conversation. Typing still works.
+        """
+
+        if self.AIna is None:
+            return
+
+        from .SpeechProcessor import SpeechProcessor
+
+        problem = SpeechProcessor.check_stt_backend(
+            self.language, self.profile["stt_backend"]
+        )
+        if problem is not None:
+            self.statusBar().showMessage(problem, 10000)
+
+    def change_playback_rate(self, value: int, save: bool = True) -> None:
+        """
+        Callback function executed when the playback speed slider changes.
+        The message being played changes its speed right away, and the config
+        is saved once the slider is left alone.
+
+        Args:
+            value (int): The rate, in tenths.
+            save (bool, optional): Save it in the config. Defaults to True.
+        """
+
+        self.playback_rate = value / 10
+        self.speed_label.setText(f"Speed: {self.playback_rate:.1f}×")
+
+        self.playback_rate_signal.emit(self.playback_rate)
+
+        if save:
+            self.playback_rate_timer.start()
+
     def initialize_model(self) -> None:
         """
         Initialize the AIna model based on the settings. Any errors that occur
         will be handled and displayed to the user.
         """
 
+        if not self.check_backend():
+            return
+
         self.language = self.language_dict[
             self.language_combo_box.currentText()
         ]
         self.language_level = self.language_level_combo_box.currentText()
         self.auto_send = self.auto_send_checkbox.isChecked()
 
-        self.log_text_edit.setText("")
+        self.speculator.discard()
 
         error = False
 
         try:
-            self.AIna = AIna(
+            from .AIna import AIna
+
+            model = AIna(
                 self.language,
                 self.language_level,
                 get_asset_path(
                     f"AIna-prompt-{self.language}-{self.language_level}.txt",
                     "prompts",
                 ),
+                self.endpoint_pool,
             )
         except Exception as e:
             # Showing the error to the user
             ErrorHandler.handle_exception({"error": e}, 5)
             error = True
 
+        if not error and self.config["stats_in_prompt"]:
+            # Let AIna adapt to the learner
+            summary = self.load_learner_stats(self.language).prompt_summary()
+            if summary:
+                model.history[0]["content"] += f"\n\n{summary}"
+
         if not error:
+            # A new session, replacing the one of this language and level
+            self.AIna = model
+            self.reference_audio_id = None
+            self.show_session(
+                self.sessions.put(
+                    self.AIna, self.log_text_edit.create_document(self)
+                )
+            )
+
             self.save_config()
             self.change_status("Idle")
-            self.process_message(self.AIna)
+            self.check_stt_backend()
+
+            greeting = self.take_greeting()
+            if greeting is not None:
+                self.play_greeting(greeting)
+            else:
+                self.process_message(self.AIna)
+
+            self.refill_greetings()
+
+    def change_session(self) -> None:
+        """
+        Callback function executed when the language or level selected
+        changes. Swaps to their conversation and prepares their greetings.
+        """
+
+        self.switch_session()
+        self.refill_greetings()
+
+    def switch_session(self) -> None:
+        """
+        Swaps to the conversation of the language and level selected, keeping
+        the current one alive in the SessionManager. A new session is
+        initialized if there is none for them yet.
+        """
+
+        # Nothing to swap until AIna is initialized
+        if self.AIna is None:
+            return
+
+        language = self.language_dict[self.language_combo_box.currentText()]
+        language_level = self.language_level_combo_box.currentText()
+
+        if (language, language_level) == (
+            self.AIna.language,
+            self.AIna.language_level,
+        ):
+            return
+
+        self.speculator.discard()
+
+        current = self.sessions.get(self.AIna.language, self.AIna.language_level)
+        if current is not None:
+            current["reference_audio_id"] = self.reference_audio_id
+
+        session = self.sessions.get(language, language_level)
+
+        if session is None:
+            if not self.check_backend():
+                # Stay in the current session
+                self.select_session(self.AIna.language, self.AIna.language_level)
+                return
+
+            self.initialize_model()
+            return
+
+        self.sessions.evict()
+
+        self.language = language
+        self.language_level = language_level
+        self.AIna = session["AIna"]
+        self.reference_audio_id = session["reference_audio_id"]
+        self.show_session(session)
+
+        self.save_config()
+        self.change_status("Idle")
+        self.check_stt_backend()
+
+    def select_session(self, language: str, language_level: str) -> None:
+        """
+        Selects a language and level in the combo boxes, without swapping
+        sessions.
+
+        Args:
+            language (str): The language code.
+            language_level (str): The language level.
+        """
+
+        names = {code: name for name, code in self.language_dict.items()}
+
+        for combo_box, text in (
+            (self.language_combo_box, names[language]),
+            (self.language_level_combo_box, language_level),
+        ):
+            combo_box.blockSignals(True)
+            combo_box.setCurrentIndex(combo_box.findText(text))
+            combo_box.blockSignals(False)
+
+    def show_session(self, session: dict) -> None:
+        """
+        Shows the chat log of a session.
+
+        Args:
+            session (dict): The session, from the SessionManager.
+        """
+
+        self.log_text_edit.setDocument(session["document"])
+        self.log_text_edit.set_dictionary(
+            self.load_dictionary(session["AIna"].language)
+        )
+        self.log_text_edit.moveCursor(QTextCursor.End)
+        self.log_text_edit.setFontPointSize(16)
+
+    def take_greeting(self) -> dict | None:
+        """
+        Takes a ready greeting for the current language and level from the
+        GreetingPool.
+
+        Returns:
+            dict | None: The greeting, or None if there is none ready (or a
+                         cassette is in use, since its calls must stay in
+                         order).
+        """
+
+        if Cassette.active is not None:
+            return None
+
+        from .AudioCache import init_mixer
+
+        return self.greeting_pool.take(
+            self.language, self.language_level, init_mixer()
+        )
+
+    def play_greeting(self, greeting: dict) -> None:
+        """
+        Starts the conversation with a greeting from the GreetingPool, as if
+        the model had just answered it.
+
+        Args:
+            greeting (dict): The "content", "pcm" and "samplerate" of the
+                          greeting.
+        """
+
+        from .AudioCache import amplitude_envelope
+
+        self.disable_all_buttons()
+        self.enable_type_ahead()
+        self.is_processing = True
+
+        audio_id = self.audio_cache.add(
+            greeting["pcm"],
+            greeting["samplerate"],
+            greeting["content"],
+            amplitude_envelope(greeting["pcm"], greeting["samplerate"]),
+        )
+        self.AIna.history.append(
+            {"role": "assistant", "content": greeting["content"]}
+        )
+        self.log_text_edit.append_message(f"AIna: {greeting["content"]}\n", audio_id)
+
+        self.play_sound(audio_id)
+
+    def refill_greetings(self) -> None:
+        """
+        Starts a GreetingThread to generate a greeting for the selected
+        language and level, if their pool is not full. It is started again
+        after each greeting until the pool is full.
+        """
+
+        language = self.language_dict[self.language_combo_box.currentText()]
+        language_level = self.language_level_combo_box.currentText()
+
+        if (
+            Cassette.active is not None
+            or not self.backend_online
+            or self.workers.is_alive(self.greeting_thread)
+            or self.greeting_pool.missing(language, language_level) == 0
+        ):
+            return
+
+        from .AIna import AIna
+        from .GreetingThread import GreetingThread
+
+        try:
+            model = AIna(
+                language,
+                language_level,
+                get_asset_path(
+                    f"AIna-prompt-{language}-{language_level}.txt", "prompts"
+                ),
+                self.endpoint_pool,
+            )
+        except Exception:
+            # Reported when the user initializes AIna
+            return
+
+        self.greeting_thread = GreetingThread(
+            model, self.profile, self.greeting_pool.new_path()
+        )
+        self.greeting_thread.finished_signal.connect(self.refill_greetings_finished)
+        self.workers.start(self.greeting_thread)
+
+    def refill_greetings_finished(self, message: dict, error_status: int) -> None:
+        """
+        Callback function executed when the GreetingThread finishes.
+
+        Errors are not shown, the pool is just refilled again later.
+
+        Args:
+            message (dict): The greeting, as expected by `GreetingPool.add`.
+            error_status (int): The error number.
+        """
+
+        if error_status == 0:
+            self.greeting_pool.add(message)
+            self.refill_greetings()
+
+    def load_dictionary(self, language: str) -> Dictionary | None:
+        """
+        Opens the bundled dictionary of a language, compiling its index into
+        the config folder on first use.
+
+        Args:
+            language (str): The language code (e.g. "ja").
+
+        Returns:
+            Dictionary | None: The dictionary, or None if the language has no
+                               dictionary or it could not be opened.
+        """
+
+        if language not in self.dictionaries:
+            source_path = get_asset_path(f"{language}.tsv", "dictionaries")
+            index_path = CONFIG_PATH.parent / "dictionaries" / f"{language}.idx"
+
+            try:
+                self.dictionaries[language] = Dictionary.open(
+                    source_path, str(index_path), language
+                )
+            except (OSError, ValueError):
+                # Word lookup is optional, the conversation works without it
+                self.dictionaries[language] = None
+
+        return self.dictionaries[language]
+
+    def load_learner_stats(self, language: str) -> "LearnerStats":
+        """
+        Loads the statistics of the learner in a language from their snapshot
+        in the config folder, once.
+
+        Args:
+            language (str): The language code (e.g. "ja").
+
+        Returns:
+            LearnerStats: The statistics.
+        """
+
+        if language not in self.learner_stats:
+            from .LearnerStats import LearnerStats
+
+            self.learner_stats[language] = LearnerStats(
+                str(CONFIG_PATH.parent / "stats" / f"{language}.npz"),
+                self.load_dictionary(language),
+            )
+
+        return self.learner_stats[language]
+
+    def format_learner_stats(self, language: str) -> str:
+        """
+        Formats the statistics of the learner in a language as text.
+
+        Args:
+            language (str): The language code.
+
+        Returns:
+            str: The totals and the most frequent words.
+        """
+
+        summary = self.load_learner_stats(language).summary()
+
+        def words(top: list) -> str:
+            return ", ".join(f"{word} ({count})" for word, count in top) or "n/a"
+
+        rate = (
+            f"{summary['mistake_rate']:.0%}"
+            if summary["mistake_rate"] is not None
+            else "n/a"
+        )
+
+        return "\n".join(
+            [
+                f"Messages sent: {summary['turns']}",
+                f"Words used: {summary['words']} ({summary['distinct']} different)",
+                f"Messages heard: {summary['answers']}",
+                f"Messages with mistakes: {summary['mistakes']} of "
+                f"{summary['corrections']} checked ({rate})",
+                f"Most used words: {words(summary['top_used'])}",
+                f"Most mistaken words: {words(summary['top_mistaken'])}",
+            ]
+        )
+
+    def show_learner_stats(self) -> None:
+        """
+        Shows the statistics of the learner in the selected language in a
+        dialog.
+        """
+
+        language = self.language_combo_box.currentText()
+
+        QMessageBox.information(
+            self,
+            f"Learning Statistics - {language}",
+            self.format_learner_stats(self.language_dict[language]),
+        )
+
+    def show_audio_settings(self) -> None:
+        """
+        Shows the audio settings dialog and applies the settings if they are
+        accepted.
+        """
+
+        if self.recording or self.is_processing:
+            self.statusBar().showMessage(
+                "Wait for AIna to finish before changing the audio settings.",
+                5000,
+            )
+            return
+
+        import pygame
+
+        from .AudioCache import init_mixer
+        from .AudioSettingsDialog import AudioSettingsDialog
+
+        mixer = pygame.mixer.get_init()
+        dialog = AudioSettingsDialog(self.config, self)
+
+        if dialog.exec() == QDialog.Accepted:
+            self.apply_audio_settings(dialog.settings())
+
+        # The calibration and the new settings open the mixer again, maybe in
+        # another format, which the decoded audio of the replay buffer would
+        # not match
+        if mixer and init_mixer() != mixer:
+            self.audio_cache.clear()
+
+    def apply_audio_settings(self, settings: dict) -> None:
+        """
+        Uses and saves new audio settings. The microphone settings apply from
+        the next recording and the mixer is opened again with the new output
+        settings.
+
+        Args:
+            settings (dict): The "input_device", "output_device", "samplerate",
+                          "blocksize", "latency" and "output_buffer".
+        """
+
+        self.config.update(settings)
+        self.samplerate = settings["samplerate"]
+
+        configure_mixer(settings["output_buffer"], settings["output_device"])
+
+        self.save_config()
 
     def _callback(self, indata, frames, time, status):
         """
         Callback function used during audio recording to collect input data.
 
         Called automatically by the audio stream for each audio block.
-        Appends recorded audio data to an internal buffer for later saving.
+        Appends recorded audio data to the shared recording buffer.
 
         Args:
             indata (numpy.ndarray): The recorded audio data.
@@ -395,7 +1130,11 @@ class MainWindow(QMainWindow):
         """
 
         if self.recording:
-            self.frames.append(indata.copy())
+            self.recording_buffer.append(indata)
+            self.level_meter.push(indata[:, 0])
+
+            if self.archive_writer is not None:
+                self.archive_writer.write(indata)
 
     def start_recording(self) -> None:
         """
@@ -405,21 +1144,138 @@ class MainWindow(QMainWindow):
         The audio chunks are collected through the `_callback` function.
         """
 
-        self.frames = []
+        import sounddevice as sd
+
+        # The previous recording is not used anymore
+        if self.recording_buffer is not None:
+            self.recording_buffer.close()
+
+        self.recording_buffer = RecordingBuffer(self.samplerate, self.channels)
         self.recording = True
-        self.stream = sd.InputStream(
+
+        # The recording belongs to the current session
+        self.language_combo_box.setEnabled(False)
+        self.language_level_combo_box.setEnabled(False)
+
+        if (
+            self.speculative_checkbox.isChecked()
+            and not self.practice_checkbox.isChecked()
+            and self.AIna is not None
+            and Cassette.active is None
+            and not self.is_processing
+        ):
+            self.speculator.start(self.AIna, self.profile, self.recording_buffer)
+        self.level_meter.start(self.samplerate)
+        self.recording_timer.start()
+        self.start_archiving()
+
+        try:
+            self.stream = self.open_input_stream(self.config["input_device"])
+        except (ValueError, sd.PortAudioError):
+            # The configured microphone is unplugged
+            self.stream = self.open_input_stream(None)
+            self.statusBar().showMessage(
+                "The microphone in the audio settings was not found, "
+                "using the default one.",
+                5000,
+            )
+        self.stream.start()
+
+    def open_input_stream(self, device: str | None):
+        """
+        Opens the microphone stream with the audio settings of the config.
+
+        Args:
+            device (str | None): The microphone, None for the default one.
+
+        Returns:
+            sounddevice.InputStream: The stream, not started yet.
+        """
+
+        import sounddevice as sd
+
+        return sd.InputStream(
+            device=device,
             samplerate=self.samplerate,
+            blocksize=self.config["blocksize"],
+            latency=self.config["latency"],
             channels=self.channels,
             callback=self._callback,
         )
-        self.stream.start()
+
+    def reserve_recording(self) -> None:
+        """
+        Makes room in the recording buffer, so the audio callback never has
+        to grow it.
+        """
+
+        if self.recording_buffer is not None:
+            self.recording_buffer.reserve()
+
+    def start_archiving(self) -> None:
+        """
+        Starts streaming the recording to the archive, if enabled, as the
+        next turn of the current session.
+        """
+
+        self.archive_key = None
+
+        if not self.archive_checkbox.isChecked() or self.AIna is None:
+            return
+
+        # Enabled in the config without the encoder installed
+        if not RecordingArchive.available():
+            self.archive_checkbox.setChecked(False)
+            return
+
+        session = self.sessions.get(self.AIna.language, self.AIna.language_level)
+        if session is None:
+            return
+
+        session["recordings"] += 1
+        self.archive_key = (session["id"], session["recordings"])
+
+        practice = (
+            self.practice_checkbox.isChecked()
+            and self.reference_audio_id is not None
+        )
+
+        self.archive_writer = self.archive.start(
+            *self.archive_key,
+            self.samplerate,
+            self.channels,
+            language=self.AIna.language,
+            language_level=self.AIna.language_level,
+            mode="practice" if practice else "message",
+        )
+
+    def toggle_archive(self, checked: bool) -> None:
+        """
+        Callback function executed when the archive checkbox is toggled.
+        Archiving is only enabled if its optional encoder is installed.
+
+        Args:
+            checked (bool): The state of the checkbox.
+        """
+
+        if checked and not RecordingArchive.available():
+            self.archive_checkbox.setChecked(False)
+            self.statusBar().showMessage(
+                "Archiving recordings needs the soundfile package "
+                "(pip install soundfile).",
+                5000,
+            )
+            return
+
+        self.save_config()
 
     def stop_recording(self, filename: str = "input.wav") -> None:
         """
         Stops the audio recording and saves the captured data to a WAV file.
 
-        Terminates the audio stream and writes the collected audio data
-        to the specified file.
+        Terminates the audio stream and hands the recording to the
+        SpeechThread, which has the audio worker process write it to the
+        specified file.
 
         Args:
             filename (str, optional): Name of the output WAV file. Defaults to
@@ -431,28 +1287,113 @@ class MainWindow(QMainWindow):
         self.recording = False
         self.stream.stop()
         self.stream.close()
-        audio_data = np.concatenate(self.frames, axis=0)
-        wavio.write(filename, audio_data, self.samplerate, sampwidth=2)
+        self.level_meter.stop()
+        self.recording_timer.stop()
+        self.speculator.stop()
+
+        # The file is finished in the background
+        if self.archive_writer is not None:
+            self.archive_writer.close()
+            self.archive_writer = None
+
+        if (
+            self.practice_checkbox.isChecked()
+            and self.reference_audio_id is not None
+        ):
+            self.process_pronunciation(self.recording_buffer.array())
+            return
+
+        # The WAV file is written by the audio worker process
+        self.process_speech(filename)
+
+    def process_pronunciation(self, audio_data) -> None:
+        """
+        Starts the ScoreThread to compare the recording with the last sentence
+        AIna said.
+
+        Args:
+            audio_data (numpy.ndarray): The recorded samples.
+        """
+
+        from .ScoreThread import ScoreThread
+
+        self.disable_all_buttons()
+
+        self.worker_thread = ScoreThread(
+            audio_data,
+            self.samplerate,
+            self.audio_cache.get(self.reference_audio_id),
+        )
+        self.worker_thread.finished_signal.connect(
+            self.process_pronunciation_finished
+        )
+
+        # Start the worker thread
+        self.workers.start(self.worker_thread)
+
+    def process_pronunciation_finished(
+        self, message: dict, error_status: int
+    ) -> None:
+        """
+        Callback function executed when the ScoreThread finishes.
+
+        Args:
+            message (dict): The "score" and the "text" of AIna's sentence.
+            error_status (int): An error code indicating the status of the
+                             scoring (0 means no error).
+        """
+
+        if error_status != 0:
+            # Showing the error to the user
+            ErrorHandler.handle_exception(message, error_status)
+        else:
+            self.log_text_edit.append(
+                f"Pronunciation score: {message['score']}/100\n"
+            )
+
+            if self.archive_key is not None:
+                self.archive.annotate(
+                    *self.archive_key,
+                    reference=message["text"],
+                    score=message["score"],
+                )
 
-        self.process_speech()
+        self.enable_all_buttons()
 
-    def process_speech(self) -> None:
+    def process_speech(self, filename: str) -> None:
         """
         Starts the SpeechThread to convert audio input into text.
 
         This function initializes and runs a background thread that
         listens for audio, processes it using speech recognition,
         and emits the transcribed text when complete.
+
+        Args:
+            filename (str): Path of the WAV file the recording is saved to.
         """
 
-        self.disable_all_buttons()
+        from .SpeechThread import SpeechThread
+
+        # During AIna's turn only the input is locked, the turn goes on
+        if self.is_processing:
+            self.record_button.setEnabled(False)
+            self.send_button.setEnabled(False)
+        else:
+            self.disable_all_buttons()
         self.input_field.setEnabled(False)
+        self.transcribing = True
 
-        self.worker_thread = SpeechThread(self.language)
-        self.worker_thread.finished_signal.connect(self.process_speech_finished)
+        self.speech_thread = SpeechThread(
+            self.language,
+            self.profile["stt_backend"],
+            self.recording_buffer,
+            filename,
+        )
+        self.speech_thread.finished_signal.connect(self.process_speech_finished)
+        self.speech_thread.retry_signal.connect(self.notify_retry)
 
         # Start the worker thread
-        self.worker_thread.start()
+        self.workers.start(self.speech_thread)
 
     def process_speech_finished(self, message: dict, error_status: int) -> None:
         """
@@ -466,25 +1407,30 @@ class MainWindow(QMainWindow):
             error_status (int): An error code indicating the status of the speech process (0 means no error).
         """
 
+        self.transcribing = False
+
+        if error_status == 0 and self.archive_key is not None:
+            self.archive.annotate(*self.archive_key, text=message["message"])
+
         if error_status != 0:
             # Showing the error to the user
             ErrorHandler.handle_exception(message, error_status)
 
             # Revert GUI changes
-            self.enable_all_buttons()
             self.input_field.setEnabled(True)
+            self.restore_buttons()
         else:
             text = message["message"]
 
             self.input_field.setText(text)
-
-            self.enable_all_buttons()
             self.input_field.setEnabled(True)
+            self.restore_buttons()
 
+            # Queued if AIna is still busy
             if self.auto_send == True:
                 self.send_message()
 
-    def process_message(self, AIna: AIna) -> None:
+    def process_message(self, AIna: "AIna", speculation: dict | None = None) -> None:
         """
         Starts a GPTClient thread to send a message to the GPT model and
         receive its response.
@@ -492,25 +1438,45 @@ class MainWindow(QMainWindow):
         Args:
             AIna (AIna): An instance that manages the GPT model interaction,
                       including sending the prompt and receiving the answer.
+            speculation (dict, optional): A matching answer started by the
+                      Speculator while the user was speaking, used instead of
+                      a new GPTClient. Defaults to None.
         """
 
+        from .GPTClient import GPTClient
+
         self.disable_all_buttons()
+        self.enable_type_ahead()
         self.is_processing = True
         self.change_status("Busy")
 
         self.log_text_edit.append("Thinking...")
 
-        # Connecting the signals to the GPTClient
-        self.worker_thread = GPTClient(AIna)
-        self.worker_thread.finished_signal.connect(self.process_message_finished)
-        self.stop_worker_signal.connect(self.worker_thread.stop)
-
         # Changing the repeat_button icon
-        self.repeat_button.set_icon(self.stop_path, 22)
+        self.repeat_button.set_icon(self.stop_icon, 22)
         self.repeat_button.setEnabled(True)
 
+        if speculation is not None:
+            if speculation["result"] is not None:
+                # Already answered while the user was speaking
+                QTimer.singleShot(
+                    0, lambda: self.process_message_finished(*speculation["result"])
+                )
+            else:
+                # Still running, its result comes here when it finishes
+                self.worker_thread = speculation["worker"]
+                speculation["slot"] = self.process_message_finished
+                self.stop_worker_signal.connect(self.worker_thread.stop)
+                self.worker_thread.retry_signal.connect(self.notify_retry)
+            return
+
+        # Connecting the signals to the GPTClient
+        self.worker_thread = GPTClient(AIna, self.profile, self.audio_cache)
+        self.worker_thread.finished_signal.connect(self.process_message_finished)
+        self.worker_thread.retry_signal.connect(self.notify_retry)
+
         # Start the worker thread
-        self.worker_thread.start()
+        self.workers.start(self.worker_thread, self.stop_worker_signal)
 
     def process_message_finished(self, message: dict, error_status: int) -> None:
         """
@@ -537,49 +1503,125 @@ class MainWindow(QMainWindow):
             del self.AIna.history[-1]
 
             # Reseting the interface
-            self.repeat_button.set_icon(self.repeat_path, 16)
-            self.stop_worker_signal.disconnect()
+            if self.log_add_flag:
+                self.discard_correction()
+            self.repeat_button.set_icon(self.repeat_icon, 16)
             self.erase_log(message_len)
             self.enable_all_buttons()
             self.is_processing = False
 
-        # If some error occur
+            # The queued messages are not sent, but not lost either
+            self.restore_queue()
+
+        # If some error occur, after the retries
         elif error_status != 0:
             # Showing the error to the user
             ErrorHandler.handle_exception(message, error_status)
 
-            # Revert GUI changes
-            self.erase_log()
+            # Revert GUI changes. The user's message goes back to the input
+            # field, so it can be sent again without recording it again.
+            if self.log_add_flag:
+                self.discard_correction()
+                user_message = self.AIna.history.pop()["content"]
+                self.erase_log(len(f"You: {user_message}\n"))
+                self.input_field.setText(user_message)
+            else:
+                self.erase_log()
+            self.repeat_button.set_icon(self.repeat_icon, 16)
             self.enable_all_buttons()
             self.is_processing = False
+
+            self.restore_queue()
         else:
             if message["content"] != "":
+                audio_id = message.pop("audio_id", None)
+
+                # The turn is done, count it in the statistics
+                stats = self.load_learner_stats(self.AIna.language)
+                if self.log_add_flag:
+                    stats.add_message(self.AIna.history[-1]["content"])
+                stats.add_answer(message["content"])
+
                 self.AIna.history.append(message)
 
                 self.erase_log()
-                self.log_text_edit.append(f"AIna: {message["content"]}\n")
+                self.log_text_edit.append_message(
+                    f"AIna: {message["content"]}\n", audio_id
+                )
 
-                self.play_sound()
+                self.play_sound(audio_id)
+            else:
+                # Nothing to say, so nothing to play
+                self.erase_log()
+                self.repeat_button.set_icon(self.repeat_icon, 16)
+                self.enable_all_buttons()
+                self.is_processing = False
 
         self.change_status("Idle")
         self.log_add_flag = False
 
-    def play_sound(self) -> None:
+        # An empty answer ends the turn too
+        if not self.is_processing:
+            self.next_turn()
+
+    def notify_retry(
+        self, error_status: int, attempt: int, attempts: int, error: str
+    ) -> None:
+        """
+        Callback function executed when a worker is going to retry a failed
+        step. Shown in the status bar, the turn goes on.
+
+        Args:
+            error_status (int): The error code of the step.
+            attempt (int): The attempt that failed, starting from 1.
+            attempts (int): The number of attempts.
+            error (str): The error of the attempt.
+        """
+
+        ErrorHandler.notify_retry(
+            self.statusBar(), error_status, attempt, attempts, error
+        )
+
+    def play_sound(self, audio_id: int | None = None) -> None:
         """
         Starts a SpeakerThread thread to play the model's audio response.
+
+        Args:
+            audio_id (int, optional): Id of the audio in the AudioCache.
+                                   Defaults to the latest one.
         """
 
+        from .SpeakerThread import SpeakerThread
+
+        audio = self.audio_cache.get(audio_id)
+
+        # The last sentence heard is the one to repeat in pronunciation practice
+        if audio is not None:
+            self.reference_audio_id = audio["id"]
+
+            # Translated while it plays, to be shown instantly
+            if self.config["translation_prefetch"] and Cassette.active is None:
+                self.request_translation(audio["text"])
+
         # Connecting the signals to the SpeakerThread
-        self.worker_thread = SpeakerThread()
+        self.worker_thread = SpeakerThread(audio, self.playback_rate)
         self.worker_thread.finished_signal.connect(self.play_sound_finished)
-        self.stop_worker_signal.connect(self.worker_thread.stop)
+        self.playback_rate_signal.connect(self.worker_thread.set_rate)
 
         # Changing the repeat_button icon
-        self.repeat_button.set_icon(self.stop_path, 22)
+        self.repeat_button.set_icon(self.stop_icon, 22)
         self.repeat_button.setEnabled(True)
 
         # Start the worker thread
-        self.worker_thread.start()
+        self.workers.start(self.worker_thread, self.stop_worker_signal)
+
+        # Lip-sync, following the playback position
+        if audio is not None and audio["envelope"] is not None:
+            self.portrait.start_speaking(
+                audio["envelope"],
+                ENVELOPE_FRAME_MS / 1000,
+                self.worker_thread.position,
+            )
 
     def play_sound_finished(self, message: dict, error_status: int) -> None:
         """
@@ -598,24 +1640,54 @@ class MainWindow(QMainWindow):
             # Showing the error to the user
             ErrorHandler.handle_exception(message, error_status)
 
+        self.portrait.stop_speaking()
         self.is_processing = False
-        self.repeat_button.set_icon(self.repeat_path, 16)
+        self.repeat_button.set_icon(self.repeat_icon, 16)
         self.enable_all_buttons()
 
+        self.next_turn()
+
     def enable_all_buttons(self) -> None:
         """
         Enables all buttons in the interface.
         """
 
-        self.record_button.setEnabled(True)
+        # A recording made during AIna's turn may still be transcribed
+        self.record_button.setEnabled(not self.transcribing)
         self.initialize_button.setEnabled(True)
+        self.language_combo_box.setEnabled(True)
+        self.language_level_combo_box.setEnabled(True)
 
         # If there is text in the input_field, enable it
-        if self.input_field.text() != "":
+        if self.input_field.isEnabled() and self.input_field.text() != "":
             self.send_button.setEnabled(True)
 
         self.repeat_button.setEnabled(True)
 
+    def enable_type_ahead(self) -> None:
+        """
+        Lets the user record or type the next message while AIna is busy.
+        It is queued until her turn ends.
+        """
+
+        # The recording is not transcribed but scored in pronunciation practice
+        if not self.practice_checkbox.isChecked() and not self.transcribing:
+            self.record_button.setEnabled(True)
+
+        if self.input_field.isEnabled() and self.input_field.text().strip():
+            self.send_button.setEnabled(True)
+
+    def restore_buttons(self) -> None:
+        """
+        Enables the buttons allowed in the current state, after a
+        transcription.
+        """
+
+        if self.is_processing:
+            self.enable_type_ahead()
+        else:
+            self.enable_all_buttons()
+
     def disable_all_buttons(self) -> None:
         """
         Disables all buttons in the interface.
@@ -623,6 +1695,8 @@ class MainWindow(QMainWindow):
 
         self.record_button.setEnabled(False)
         self.initialize_button.setEnabled(False)
+        self.language_combo_box.setEnabled(False)
+        self.language_level_combo_box.setEnabled(False)
         self.send_button.setEnabled(False)
         self.repeat_button.setEnabled(False)
 
@@ -631,14 +1705,265 @@ class MainWindow(QMainWindow):
         Sends a message to the model to be processed.
         """
 
+        if not self.check_backend():
+            return
+
         message = self.input_field.text()
         self.input_field.setText("")
 
+        # AIna is busy, the message waits for her turn to end
+        if self.is_processing:
+            if self.turn_queue.put(message):
+                self.statusBar().showMessage(
+                    f"Message queued ({len(self.turn_queue)} waiting)", 3000
+                )
+            self.send_button.setEnabled(False)
+            return
+
+        self.start_turn(message)
+
+    def start_turn(self, message: str) -> None:
+        """
+        Adds a message of the user to the conversation and asks AIna for the
+        answer.
+
+        Args:
+            message (str): The message.
+        """
+
         self.AIna.history.append({"role": "user", "content": message})
         self.log_text_edit.append(f"You: {message}\n")
         self.log_add_flag = True
+        cursor = self.log_text_edit.message_end()
+
+        # AIna's answer is requested first, the correction never delays it
+        self.process_message(
+            self.AIna, self.speculator.take(message, self.AIna.history)
+        )
+        self.correct_message(message, cursor)
+
+    def next_turn(self) -> None:
+        """
+        Starts the turn of the queued messages, coalesced, when AIna is done
+        with the current one.
+        """
+
+        if self.is_processing or not len(self.turn_queue):
+            return
+
+        if not self.check_backend():
+            self.restore_queue()
+            return
+
+        self.start_turn(self.turn_queue.take())
+
+    def restore_queue(self) -> None:
+        """
+        Puts the queued messages back in the input field, when the turn ends
+        without an answer (canceled, failed).
+        """
+
+        messages = self.turn_queue.clear()
+
+        if messages:
+            text = " ".join([self.input_field.text(), *messages]).strip()
+            self.input_field.setText(text)
+
+    def correct_message(self, message: str, cursor: QTextCursor) -> None:
+        """
+        Starts a CorrectionThread to check the grammar of a message of the
+        user, if enabled. It runs in parallel with AIna's answer.
+
+        Args:
+            message (str): The message.
+            cursor (QTextCursor): The end of the message in the log, where the
+                               correction goes.
+        """
+
+        if not self.correction_checkbox.isChecked() or Cassette.active is not None:
+            return
+
+        from .CorrectionThread import CorrectionThread
 
-        self.process_message(self.AIna)
+        self.correction_thread = CorrectionThread(
+            self.endpoint_pool,
+            get_asset_path("correction-prompt.txt", "prompts"),
+            self.AIna.language,
+            message,
+            self.profile,
+        )
+
+        # The cursor stays under the message, even in another session log
+        self.correction_thread.cursor = cursor
+        self.correction_thread.note = None
+
+        self.correction_thread.finished_signal.connect(
+            self.correct_message_finished
+        )
+        self.workers.start(self.correction_thread)
+
+    def correct_message_finished(self, message: dict, error_status: int) -> None:
+        """
+        Callback function executed when a CorrectionThread finishes.
+
+        Shows the correction under the message. Errors are not shown, the
+        correction is optional.
+
+        Args:
+            message (dict): The correction, see `CorrectionThread.parse`.
+            error_status (int): The error number.
+        """
+
+        thread = self.sender()
+
+        # Discarded with its message
+        if error_status != 0 or thread.cursor is None:
+            return
+
+        self.load_learner_stats(thread.language).add_correction(
+            thread.message, message
+        )
+
+        if message["correct"]:
+            text, color = "✓ No mistakes", "#4caf50"
+        else:
+            text, color = f"✎ {message['corrected']}", "#e08a00"
+            if message["explanation"]:
+                text += f" ({message['explanation']})"
+
+        thread.note = self.log_text_edit.insert_note(thread.cursor, text, color)
+
+    def discard_correction(self) -> None:
+        """
+        Drops the correction of the last message of the user, when the message
+        is removed from the log.
+        """
+
+        thread = self.correction_thread
+        self.correction_thread = None
+
+        if thread is None:
+            return
+
+        thread.cursor = None
+        if thread.note is not None and not thread.note.isNull():
+            thread.note.removeSelectedText()
+
+    def translate_message(self, text: str, cursor: QTextCursor) -> None:
+        """
+        Shows the translation of a message of AIna under it, right away if it
+        is cached, or when its TranslationThread finishes.
+
+        Args:
+            text (str): The message, as shown in the log.
+            cursor (QTextCursor): The end of the message in the log, where the
+                               translation goes.
+        """
+
+        if self.AIna is None:
+            return
+
+        # Its request would take the place of a recorded one
+        if Cassette.active is not None:
+            self.statusBar().showMessage(
+                "Translations are not available while a cassette is in use.",
+                5000,
+            )
+            return
+
+        key = self.request_translation(text.removeprefix("AIna: "))
+        translation = self.translations.get(key)
+
+        if translation is not None:
+            self.show_translation(cursor, translation)
+            return
+
+        # Clicked again before the translation came
+        thread = self.translation_threads[key]
+        if not thread.cursors:
+            thread.cursors.append(cursor)
+        self.statusBar().showMessage("Translating...", 3000)
+
+    def request_translation(self, text: str) -> str:
+        """
+        Starts a TranslationThread for a message of AIna in the current
+        conversation, unless it is cached or already being translated.
+
+        Args:
+            text (str): The message.
+
+        Returns:
+            str: The key of the message in the TranslationCache.
+        """
+
+        language = self.AIna.language
+        target_language = self.config["translation_languages"].get(
+            language, "English"
+        )
+        key = TranslationCache.key(language, target_language, text)
+
+        if key in self.translations or key in self.translation_threads:
+            return key
+
+        from .TranslationThread import TranslationThread
+
+        thread = TranslationThread(
+            self.endpoint_pool,
+            get_asset_path("translation-prompt.txt", "prompts"),
+            language,
+            target_language,
+            text,
+            self.profile,
+        )
+
+        # Where to show it, once the user asks for it
+        thread.key = key
+        thread.cursors = []
+
+        thread.finished_signal.connect(self.translate_message_finished)
+        self.translation_threads[key] = thread
+        self.workers.start(thread)
+
+        return key
+
+    def translate_message_finished(self, message: dict, error_status: int) -> None:
+        """
+        Callback function executed when a TranslationThread finishes.
+
+        Caches the translation and shows it under the messages it was asked
+        for. Errors of prefetched translations are not shown.
+
+        Args:
+            message (dict): The "translation", or the "error".
+            error_status (int): The error number.
+        """
+
+        thread = self.sender()
+        self.translation_threads.pop(thread.key, None)
+
+        if error_status != 0:
+            # Not when it was stopped
+            if thread.cursors and error_status != -1:
+                self.statusBar().showMessage(
+                    "Could not translate the message, try again later.", 5000
+                )
+            return
+
+        self.translations.put(thread.key, message["translation"])
+
+        for cursor in thread.cursors:
+            self.show_translation(cursor, message["translation"])
+
+    def show_translation(self, cursor: QTextCursor, translation: str) -> None:
+        """
+        Shows a translation as a note under its message.
+
+        Args:
+            cursor (QTextCursor): The end of the message in the log.
+            translation (str): The translation.
+        """
+
+        self.log_text_edit.insert_note(cursor, f"⇄ {translation}", "#5b8def")
 
     def erase_log(self, lenght: int = 0) -> None:
         """
@@ -682,8 +2007,9 @@ class MainWindow(QMainWindow):
             text (str): text in the EditLine.
         """
 
-        # Enable the button only if there's a model loaded and is not processing something
-        if self.AIna != None and not self.is_processing:
+        # Enable the button only if there's a model loaded. While AIna is
+        # busy, the message is queued.
+        if self.AIna != None and self.input_field.isEnabled():
             self.send_button.setEnabled(bool(text.strip()))
 
     def handle_repeat_button(self) -> None:
@@ -692,12 +2018,33 @@ class MainWindow(QMainWindow):
         audio and stopping the worker thread from executing.
         """
 
-        if not self.worker_thread.isRunning():
+        if not self.workers.is_alive(self.worker_thread):
             self.disable_all_buttons()
             self.play_sound()
         else:
             self.stop_worker_signal.emit()
 
+    def replay_message(self, audio_id: int) -> None:
+        """
+        Plays again the audio of a message clicked in the log.
+
+        Args:
+            audio_id (int): Id of the audio in the AudioCache.
+        """
+
+        if self.is_processing or self.workers.is_alive(self.worker_thread):
+            self.statusBar().showMessage("Wait for AIna to finish first.", 3000)
+            return
+
+        if audio_id not in self.audio_cache:
+            self.statusBar().showMessage(
+                "This message is no longer in the replay buffer.", 3000
+            )
+            return
+
+        self.disable_all_buttons()
+        self.play_sound(audio_id)
+
     def keyPressEvent(self, event: QKeyEvent) -> None:
         """
         Handles key press events. If the Enter/Return key is pressed
@@ -717,6 +2064,37 @@ class MainWindow(QMainWindow):
         ):
             self.send_button.click()  # Simulate button click
 
+    def closeEvent(self, event: QCloseEvent) -> None:
+        """
+        Stops the background threads before the window closes.
+
+        Args:
+            event (QCloseEvent): The close event.
+        """
+
+        if self.health_monitor is not None:
+            self.health_monitor.stop()
+            self.health_monitor.wait()
+
+        # A speed change not saved yet
+        if self.playback_rate_timer.isActive():
+            self.playback_rate_timer.stop()
+            self.save_config()
+
+        self.workers.shutdown()
+        AudioProcess.shutdown()
+
+        for stats in self.learner_stats.values():
+            stats.save()
+
+        self.archive.shutdown()
+        release_mixer()
+
+        if self.recording_buffer is not None:
+            self.recording_buffer.close()
+
+        super().closeEvent(event)
+
     def change_status(self, status: str) -> None:
         """
         Change the status of the model.
@@ -730,7 +2108,11 @@ class MainWindow(QMainWindow):
             self.status_message.setText(
                 f"Model: <b>AIna-{self.language}-{self.language_level}</b> | Status: <b>Busy</b>"
             )
+            self.portrait.set_expression("thinking")
         else:
+            if not self.portrait.is_speaking():
+                self.portrait.set_expression("neutral")
+
             self.status_message.setText(
                 f"Model: <b>AIna-{self.language}-{self.language_level}</b> | Status: <b>Idle</b>"
             )
@@ -747,6 +2129,16 @@ class MainWindow(QMainWindow):
             self.language_level_combo_box.currentText()
         )
         self.config["auto_send"] = self.auto_send_checkbox.isChecked()
+        self.config["archive_recordings"] = self.archive_checkbox.isChecked()
+        self.config["grammar_correction"] = self.correction_checkbox.isChecked()
+        self.config["speculative_generation"] = (
+            self.speculative_checkbox.isChecked()
+        )
+        self.config["pronunciation_practice"] = (
+            self.practice_checkbox.isChecked()
+        )
+        self.config["profile"] = self.profile_combo_box.currentText()
+        self.config["playback_rate"] = self.playback_rate
 
         save_config(self.config, CONFIG_PATH)
 
@@ -758,15 +2150,10 @@ def get_asset_path(filename: str, type: str) -> str:
     Args:
         filename (str): Name of the file to be loaded.
         type (str): The type of the file, it varies between "icons", "images",
-                 "prompts" and "styles".
+                 "prompts", "styles" and "dictionaries".
 
     Returns:
         str: The corret path for the file.
     """
 
-    if getattr(sys, "frozen", False):  # Running as .exe
-        base_path = os.path.join(sys._MEIPASS, "assets", type)
-    else:
-        base_path = os.path.join(BASE_DIR, "assets", type)
-
-    return os.path.join(base_path, filename)
+    return ASSETS.path(filename, type)
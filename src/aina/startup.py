@@ -6,9 +6,94 @@ import platform
 
 DEFAULT_CONFIG = {
     "theme": "light",
+    # Frame rate of AIna's lip-sync animation (30 to 60)
+    "animation_fps": 30,
     "language": "English",
     "language_level": "Basic",
     "auto_send": False,
+    # Speed of AIna's voice, from 0.5 to 1.5, time-stretched without
+    # synthesizing it again
+    "playback_rate": 1.0,
+    "pronunciation_practice": False,
+    # Audio devices (None for the system default) and stream buffers, set in
+    # View > Audio Settings..., where a loopback calibration picks the
+    # lowest stable latency. "blocksize" (0 lets the driver choose) and
+    # "latency" ("low" or "high") are the ones of the microphone stream, and
+    # "output_buffer" the one of the playback mixer, in frames
+    "input_device": None,
+    "output_device": None,
+    "samplerate": 44100,
+    "blocksize": 0,
+    "latency": "high",
+    "output_buffer": 512,
+    # Keep every recording as a FLAC file (needs the soundfile package)
+    "archive_recordings": False,
+    # Check the grammar of the user messages, in parallel with AIna's answer
+    "grammar_correction": False,
+    # Describe the learner (from their word and mistake statistics) in the
+    # prompt of new conversations
+    "stats_in_prompt": False,
+    # Language AIna's messages are translated into (right-click a message >
+    # Translate), per conversation language. With prefetch, the translation
+    # of each message is requested while it plays, so it shows instantly.
+    "translation_languages": {"en-US": "Japanese", "ja": "English"},
+    "translation_prefetch": False,
+    # Start AIna's answer from the partial transcript while the user speaks
+    "speculative_generation": False,
+    "speculative_interval_ms": 800,
+    # Messages sent while AIna is busy are joined into her next turn, up to
+    # this length
+    "turn_queue_max_chars": 500,
+    # OpenAI compatible servers; requests are balanced between them with the
+    # "least_outstanding" or "latency" routing
+    "llm_endpoints": ["http://localhost:1234/v1"],
+    "llm_routing": "least_outstanding",
+    "llm_timeout": 30.0,
+    # Decoded audio of AIna's last messages, kept for replays
+    "replay_buffer_mb": 32,
+    "replay_buffer_size": 20,
+    # Greetings generated ahead of time per language and level, so starting
+    # a conversation does not wait for the LLM and the TTS (0 disables it)
+    "greeting_pool_size": 2,
+    # Conversations kept alive per language and level, to switch between them
+    "max_sessions": 4,
+    "session_memory_mb": 16,
+    # Log what blocks the interface for longer than this, in stalls.log in
+    # the config folder (0 disables it, see also --watch-stalls)
+    "stall_threshold_ms": 0,
+    "profile": "balanced",
+    # Latency profiles: generation limits, model id and speech backends.
+    # "stt_backend" is one of "google", "whisper" (local, needs the optional
+    # openai-whisper and soundfile packages) or "sphinx" (local, needs the
+    # optional pocketsphinx package, English only out of the box) and
+    # "tts_backend" one of "gtts" or "gtts_slow".
+    "profiles": {
+        "snappy": {
+            "model": "model-identifier",
+            "max_tokens": 80,
+            "temperature": 0.8,
+            "stop": ["\n\n"],
+            "stt_backend": "google",
+            "tts_backend": "gtts",
+        },
+        # The default, generating as AIna always did
+        "balanced": {
+            "model": "model-identifier",
+            "max_tokens": None,
+            "temperature": 1.2,
+            "stop": [],
+            "stt_backend": "google",
+            "tts_backend": "gtts",
+        },
+        "rich": {
+            "model": "model-identifier",
+            "max_tokens": 500,
+            "temperature": 1.2,
+            "stop": [],
+            "stt_backend": "google",
+            "tts_backend": "gtts",
+        },
+    },
 }
 
 
@@ -75,7 +160,44 @@ def load_config(config_path: Path) -> dict:
     else:
         config = {}
 
+    # Configs from before the load balancing had a single server
+    base_url = config.pop("llm_base_url", None)
+    if base_url is not None and "llm_endpoints" not in config:
+        config["llm_endpoints"] = [base_url]
+
     # Merge default settings with loaded config
     merged_config = DEFAULT_CONFIG.copy()
     merged_config.update(config)
+
+    # Profiles are merged one level deeper, so new default keys still show up
+    # in profiles edited by the user
+    profiles = {}
+    for name, profile in DEFAULT_CONFIG["profiles"].items():
+        profiles[name] = {**profile, **config.get("profiles", {}).get(name, {})}
+    for name, profile in config.get("profiles", {}).items():
+        if name not in profiles:
+            profiles[name] = {**DEFAULT_CONFIG["profiles"]["balanced"], **profile}
+    merged_config["profiles"] = profiles
+
     return merged_config
+
+
+def get_profile(config: dict, name: str | None = None) -> dict:
+    """
+    Returns the settings of a latency profile.
+
+    Args:
+        config (dict): The merged configuration dictionary.
+        name (str, optional): The profile name. Defaults to the profile
+                           selected in the config.
+
+    Returns:
+        dict: The profile settings, falling back to "balanced" if the name is
+              unknown.
+    """
+
+    if name is None:
+        name = config["profile"]
+
+    profiles = config["profiles"]
+    return profiles.get(name, profiles["balanced"])